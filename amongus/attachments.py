@@ -0,0 +1,138 @@
+"""Reuse Discord CDN URLs for generated images that were already uploaded"""
+import asyncio
+import hashlib
+import io
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import parse_qs, urlparse
+
+import aiohttp
+import discord
+
+from .encoding import image_filename
+
+
+ATTACHMENT_TTL = 6 * 60 * 60  # Seconds; signed CDN links last ~24h, stay well inside that
+EXPIRY_MARGIN = 10 * 60  # Stop using a link this long before its signed expiry
+MAX_CACHED_ATTACHMENTS = 512
+URL_CHECK_TIMEOUT = 2.0  # Seconds to wait for the CDN before giving up and uploading again
+
+
+def _signed_expiry(url: str) -> Optional[float]:
+    """Unix time a signed CDN URL stops working, from its `ex` query param (hex)"""
+    try:
+        return float(int(parse_qs(urlparse(url).query)['ex'][0], 16))
+    except (KeyError, IndexError, ValueError):
+        return None
+
+
+class AttachmentCache:
+    """Content hash → CDN URL of an attachment we already uploaded.
+
+    Entries expire after ATTACHMENT_TTL or shortly before the URL's signed
+    expiry, whichever comes first.
+    """
+
+    def __init__(self, ttl: float = ATTACHMENT_TTL, max_entries: int = MAX_CACHED_ATTACHMENTS):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._urls = OrderedDict()  # digest -> (url, expires_at), least recently used first
+        self.metrics = {'hits': 0, 'misses': 0, 'expired': 0, 'fallbacks': 0}
+
+    @staticmethod
+    def digest(buffer: io.BytesIO) -> str:
+        return hashlib.sha256(buffer.getbuffer()).hexdigest()
+
+    def get(self, digest: str) -> Optional[str]:
+        entry = self._urls.get(digest)
+        if entry is None:
+            self.metrics['misses'] += 1
+            return None
+
+        url, expires_at = entry
+        if time.time() >= expires_at:
+            del self._urls[digest]
+            self.metrics['expired'] += 1
+            self.metrics['misses'] += 1
+            return None
+
+        self._urls.move_to_end(digest)
+        self.metrics['hits'] += 1
+        return url
+
+    def put(self, digest: str, url: str):
+        expires_at = time.time() + self.ttl
+        signed_expiry = _signed_expiry(url)
+        if signed_expiry is not None:
+            expires_at = min(expires_at, signed_expiry - EXPIRY_MARGIN)
+
+        self._urls[digest] = (url, expires_at)
+        self._urls.move_to_end(digest)
+        while len(self._urls) > self.max_entries:
+            self._urls.popitem(last=False)
+
+    def discard(self, digest: str):
+        self._urls.pop(digest, None)
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+
+attachment_cache = AttachmentCache()
+
+
+async def _still_served(url: str) -> bool:
+    """Whether the CDN still serves `url`.
+
+    Discord accepts any embed image URL, so a link whose message was deleted
+    would otherwise show up as a broken image rather than fail the send.
+    """
+    try:
+        timeout = aiohttp.ClientTimeout(total=URL_CHECK_TIMEOUT)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with session.head(url) as resp:
+                return resp.status == 200
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return False
+
+
+async def send_embed_image(
+    send: Callable[..., Awaitable[Any]],
+    embed: discord.Embed,
+    buffer: io.BytesIO,
+    name: str,
+    **kwargs
+):
+    """Send `embed` with `buffer` as its image, reusing a previous upload of the same bytes.
+
+    `name` is the attachment filename without extension; the extension follows
+    the encoded format.
+
+    `send` is any coroutine that accepts embed=/file= (channel.send,
+    interaction.followup.send, outbound.send bound to a channel). A cached
+    URL the CDN no longer serves is dropped and the image uploaded again.
+    Only uploads to public messages are cached; an ephemeral message's
+    attachment must not turn up in other users' embeds.
+    """
+    digest = attachment_cache.digest(buffer)
+    url = attachment_cache.get(digest)
+
+    if url:
+        if await _still_served(url):
+            embed.set_image(url=url)
+            return await send(embed=embed, **kwargs)
+        attachment_cache.discard(digest)
+        attachment_cache.metrics['fallbacks'] += 1
+
+    buffer.seek(0)
+    filename = image_filename(buffer, name)
+    embed.set_image(url=f"attachment://{filename}")
+    message = await send(embed=embed, file=discord.File(buffer, filename=filename), **kwargs)
+
+    attachments = getattr(message, 'attachments', None)
+    flags = getattr(message, 'flags', None)
+    ephemeral = kwargs.get('ephemeral') or (flags is not None and flags.ephemeral)
+    if attachments and not ephemeral:
+        attachment_cache.put(digest, attachments[0].url)
+    return message
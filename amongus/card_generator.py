@@ -1,8 +1,14 @@
 """Card generation using Pillow for player cards, role reveals, etc."""
 import io
+import logging
+from collections import OrderedDict
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 import aiohttp
-from typing import Optional
+from typing import Optional, Tuple
+from .commandstats import timed
+from .encoding import encode_image, profile_name
+from .fonts import get_font as load_font
 from .constants import (
     CARD_WIDTH, CARD_HEIGHT, AVATAR_SIZE,
     ROLE_CARD_WIDTH, ROLE_CARD_HEIGHT,
@@ -10,6 +16,23 @@ from .constants import (
     PLAYER_COLORS
 )
 
+log = logging.getLogger(__name__)
+
+
+AVATAR_CACHE_SIZE = 256
+
+_avatar_circles = OrderedDict()  # (url, size) -> circular RGBA avatar, least recently used first
+
+
+def clear_caches():
+    """Drop every cached template, tile, avatar and memoized card"""
+    _background_template.cache_clear()
+    _role_card_base.cache_clear()
+    _list_card_frame.cache_clear()
+    _player_tile.cache_clear()
+    _avatar_circles.clear()
+    _list_card_cache.clear()
+
 
 async def download_avatar(url: str) -> Optional[Image.Image]:
     """Download and return avatar image"""
@@ -20,20 +43,80 @@ async def download_avatar(url: str) -> Optional[Image.Image]:
                     data = await resp.read()
                     return Image.open(io.BytesIO(data)).convert('RGBA')
     except Exception as e:
-        print(f"Failed to download avatar: {e}")
+        log.warning("Failed to download avatar: %s", e)
     return None
 
 
+@lru_cache(maxsize=8)
+def _circle_mask(size: int) -> Image.Image:
+    mask = Image.new('L', (size, size), 0)
+    mask_draw = ImageDraw.Draw(mask)
+    mask_draw.ellipse((0, 0, size, size), fill=255)
+    return mask
+
+
+async def get_avatar_circle(url: str, size: int) -> Optional[Image.Image]:
+    """Download an avatar and crop it to a circle, cached per (url, size).
+
+    Discord avatar URLs change when the avatar does, so the URL is a safe key.
+    The returned image is shared; paste it, don't draw on it.
+    """
+    key = (url, size)
+    if key in _avatar_circles:
+        _avatar_circles.move_to_end(key)
+        return _avatar_circles[key]
+    
+    avatar = await download_avatar(url)
+    if not avatar:
+        return None
+    
+    avatar = avatar.resize((size, size), Image.Resampling.LANCZOS)
+    avatar.putalpha(_circle_mask(size))
+    
+    _avatar_circles[key] = avatar
+    if len(_avatar_circles) > AVATAR_CACHE_SIZE:
+        _avatar_circles.popitem(last=False)
+    return avatar
+
+
+def _row_alpha(kind: str, row: int, max_alpha: int) -> int:
+    """Alpha of one background row, matching the old per-row draw loops"""
+    t = row / ROLE_CARD_HEIGHT
+    if kind == 'role':
+        alpha = int(255 * t)
+    elif kind == 'meeting':
+        # Drawn in 20px bands, each band takes the alpha of its first row
+        alpha = int(100 + 155 * abs(((row - row % 20) / ROLE_CARD_HEIGHT) - 0.5))
+    elif kind == 'vote':
+        alpha = int(200 - 100 * t)
+    elif kind == 'death':
+        alpha = int(150 + 105 * t)
+    else:
+        raise ValueError(f"Unknown card background: {kind}")
+    return min(alpha, max_alpha)
+
+
+@lru_cache(maxsize=None)
+def _background_template(kind: str, rgb: Tuple[int, int, int], max_alpha: int = 255) -> Image.Image:
+    """Build a full-card vertical gradient once per (kind, color)"""
+    size = (ROLE_CARD_WIDTH, ROLE_CARD_HEIGHT)
+    alphas = bytes(_row_alpha(kind, row, max_alpha) for row in range(ROLE_CARD_HEIGHT))
+    alpha = Image.frombytes('L', (1, ROLE_CARD_HEIGHT), alphas).resize(size, Image.Resampling.NEAREST)
+    bands = [Image.new('L', size, channel) for channel in rgb]
+    return Image.merge('RGBA', (*bands, alpha))
+
+
+def card_background(kind: str, rgb: Tuple[int, int, int], max_alpha: int = 255) -> Image.Image:
+    """Return a fresh copy of the cached background for a card kind"""
+    return _background_template(kind, rgb, max_alpha).copy()
+
+
 def get_font(size: int, bold: bool = False):
     """Get font, fallback to default if custom not available"""
-    try:
-        if bold:
-            return ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", size)
-        return ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", size)
-    except:
-        return ImageFont.load_default()
+    return load_font("DejaVuSans-Bold.ttf" if bold else "DejaVuSans.ttf", size)
 
 
+@timed('render')
 async def create_player_card(player_name: str, avatar_url: str, color: str, role: str, alive: bool = True) -> io.BytesIO:
     """Create a player card with avatar and info"""
     # Create base image
@@ -88,18 +171,12 @@ async def create_player_card(player_name: str, avatar_url: str, color: str, role
     # Draw decorative elements
     draw.rectangle((50, 50, CARD_WIDTH-50, CARD_HEIGHT-50), outline=color, width=5)
     
-    # Save to BytesIO
-    buffer = io.BytesIO()
-    img.save(buffer, 'PNG')
-    buffer.seek(0)
-    return buffer
+    return encode_image(img, 'card')
 
 
-async def create_role_reveal_card(player_name: str, role: str, task_count: int = 0, avatar_url: str = "") -> io.BytesIO:
-    """Create a dramatic role reveal card"""
-    img = Image.new('RGBA', (ROLE_CARD_WIDTH, ROLE_CARD_HEIGHT), color=(20, 20, 30, 255))
-    draw = ImageDraw.Draw(img)
-    
+@lru_cache(maxsize=32)
+def _role_card_base(role: str, task_count: int) -> Image.Image:
+    """Everything on the role card except the avatar, rendered once per (role, task_count)"""
     if role == 'Impostor':
         bg_color = (100, 20, 20, 200)
         text_color = (255, 100, 100)
@@ -145,10 +222,8 @@ async def create_role_reveal_card(player_name: str, role: str, task_count: int =
             "• Report bodies and vote wisely"
         ]
     
-    for i in range(ROLE_CARD_HEIGHT):
-        alpha = int(255 * (i / ROLE_CARD_HEIGHT))
-        color = (*bg_color[:3], min(alpha, bg_color[3]))
-        draw.rectangle((0, i, ROLE_CARD_WIDTH, i+1), fill=color)
+    img = card_background('role', bg_color[:3], bg_color[3])
+    draw = ImageDraw.Draw(img)
     
     title_font = get_font(70, bold=True)
     title_text = role.upper()
@@ -156,19 +231,6 @@ async def create_role_reveal_card(player_name: str, role: str, task_count: int =
     title_width = title_bbox[2] - title_bbox[0]
     draw.text((ROLE_CARD_WIDTH//2 - title_width//2, 50), title_text, fill=text_color, font=title_font)
     
-    avatar = await download_avatar(avatar_url)
-    if avatar:
-        avatar_size = 150
-        avatar = avatar.resize((avatar_size, avatar_size), Image.Resampling.LANCZOS)
-        
-        mask = Image.new('L', (avatar_size, avatar_size), 0)
-        mask_draw = ImageDraw.Draw(mask)
-        mask_draw.ellipse((0, 0, avatar_size, avatar_size), fill=255)
-        avatar.putalpha(mask)
-        
-        img.paste(avatar, (ROLE_CARD_WIDTH//2 - avatar_size//2, 170), avatar)
-    
-    
     desc_font = get_font(28)
     y = 440
     draw.text((ROLE_CARD_WIDTH//2 - draw.textbbox((0, 0), mission_text, font=desc_font)[2]//2, y), mission_text, fill=(255, 255, 255), font=desc_font)
@@ -180,24 +242,56 @@ async def create_role_reveal_card(player_name: str, role: str, task_count: int =
         draw.text((ROLE_CARD_WIDTH//2 - width//2, y), line, fill=(200, 220, 255), font=desc_font)
         y += 35
     
-    buffer = io.BytesIO()
-    img.save(buffer, 'PNG')
-    buffer.seek(0)
-    return buffer
+    return img
 
 
-async def create_lobby_card(players: list, game_code: str = "ABCDEF") -> io.BytesIO:
-    """Create a lobby overview card"""
-    height = max(LOBBY_CARD_HEIGHT, 200 + len(players) * 80)
-    img = Image.new('RGBA', (LOBBY_CARD_WIDTH, height), color=(25, 30, 45, 255))
+@timed('render')
+async def create_role_reveal_card(player_name: str, role: str, task_count: int = 0, avatar_url: str = "") -> io.BytesIO:
+    """Create a dramatic role reveal card"""
+    img = _role_card_base(role, task_count).copy()
+    
+    avatar_size = 150
+    avatar = await get_avatar_circle(avatar_url, avatar_size)
+    if avatar:
+        img.paste(avatar, (ROLE_CARD_WIDTH//2 - avatar_size//2, 170), avatar)
+    
+    return encode_image(img, 'card')
+
+
+_LIST_CARD_STYLES = {
+    'lobby': {
+        'background': (25, 30, 45, 255),
+        'title': "AMONG US LOBBY",
+        'accent': (100, 200, 255),
+        'count_color': (150, 150, 150),
+    },
+    'alive': {
+        'background': (25, 45, 30, 255),
+        'title': "ALIVE PLAYERS",
+        'accent': (100, 255, 100),
+        'count_color': (100, 255, 100),
+    },
+}
+LIST_CARD_SLOT_HEIGHT = 70
+LIST_CARD_CACHE_SIZE = 64
+
+# (kind, game_code, slots, encoder profile) -> encoded card, least recently used first
+_list_card_cache = OrderedDict()
+
+
+@lru_cache(maxsize=32)
+def _list_card_frame(kind: str, height: int, game_code: str) -> Image.Image:
+    """Background, title and game code of a lobby/alive card"""
+    style = _LIST_CARD_STYLES[kind]
+    img = Image.new('RGBA', (LOBBY_CARD_WIDTH, height), color=style['background'])
     draw = ImageDraw.Draw(img)
     
     # Title
     title_font = get_font(50, bold=True)
-    title_text = "AMONG US LOBBY"
+    title_text = style['title']
     title_bbox = draw.textbbox((0, 0), title_text, font=title_font)
     title_width = title_bbox[2] - title_bbox[0]
-    draw.text((LOBBY_CARD_WIDTH//2 - title_width//2, 30), title_text, fill=(100, 200, 255), font=title_font)
+    draw.text((LOBBY_CARD_WIDTH//2 - title_width//2, 30), title_text, fill=style['accent'], font=title_font)
     
     # Game code
     code_font = get_font(30)
@@ -206,105 +300,98 @@ async def create_lobby_card(players: list, game_code: str = "ABCDEF") -> io.Byte
     code_width = code_bbox[2] - code_bbox[0]
     draw.text((LOBBY_CARD_WIDTH//2 - code_width//2, 120), code_text, fill=(200, 200, 200), font=code_font)
     
-    # Player list
-    player_font = get_font(28)
-    y_offset = 200
-    
-    for i, player in enumerate(players):
-        color = PLAYER_COLORS[i % len(PLAYER_COLORS)]
-        
-        # Draw color indicator
-        draw.ellipse((50, y_offset, 90, y_offset + 40), fill=color)
-        
-        # Draw player name
-        name = player.get('name', 'Unknown')
-        is_bot = player.get('is_bot', False)
-        bot_tag = " [BOT]" if is_bot else ""
-        
-        draw.text((110, y_offset), f"{name}{bot_tag}", fill=(255, 255, 255), font=player_font)
-        
-        y_offset += 70
+    return img
+
+
+@lru_cache(maxsize=512)
+def _player_tile(kind: str, name: str, color: str, is_bot: bool) -> Image.Image:
+    """One player's row: colour indicator and name, pasted at (50, y)"""
+    tile = Image.new('RGBA', (LOBBY_CARD_WIDTH - 50, LIST_CARD_SLOT_HEIGHT), color=_LIST_CARD_STYLES[kind]['background'])
+    draw = ImageDraw.Draw(tile)
     
-    # Player count
-    count_font = get_font(30)
-    count_text = f"Players: {len(players)}/10"
-    draw.text((50, height - 60), count_text, fill=(150, 150, 150), font=count_font)
+    # Draw color indicator
+    draw.ellipse((0, 0, 40, 40), fill=color)
     
-    # Border
-    draw.rectangle((10, 10, LOBBY_CARD_WIDTH-10, height-10), outline=(100, 200, 255), width=5)
+    # Draw player name
+    bot_tag = " [BOT]" if is_bot else ""
+    draw.text((60, 0), f"{name}{bot_tag}", fill=(255, 255, 255), font=get_font(28))
     
-    # Save to BytesIO
-    buffer = io.BytesIO()
-    img.save(buffer, 'PNG')
-    buffer.seek(0)
-    return buffer
+    return tile
 
 
-async def create_alive_players_card(players: list, game_code: str = "ABCDEF") -> io.BytesIO:
-    """Create an alive players overview card (similar to lobby card)"""
-    height = max(LOBBY_CARD_HEIGHT, 200 + len(players) * 80)
-    img = Image.new('RGBA', (LOBBY_CARD_WIDTH, height), color=(25, 45, 30, 255))
-    draw = ImageDraw.Draw(img)
-    
-    # Title
-    title_font = get_font(50, bold=True)
-    title_text = "ALIVE PLAYERS"
-    title_bbox = draw.textbbox((0, 0), title_text, font=title_font)
-    title_width = title_bbox[2] - title_bbox[0]
-    draw.text((LOBBY_CARD_WIDTH//2 - title_width//2, 30), title_text, fill=(100, 255, 100), font=title_font)
-    
-    # Game code
-    code_font = get_font(30)
-    code_text = f"Code: {game_code}"
-    code_bbox = draw.textbbox((0, 0), code_text, font=code_font)
-    code_width = code_bbox[2] - code_bbox[0]
-    draw.text((LOBBY_CARD_WIDTH//2 - code_width//2, 120), code_text, fill=(200, 200, 200), font=code_font)
+def _render_list_card(kind: str, slots: Tuple[Tuple[str, str, bool], ...], game_code: str, count_text: str) -> io.BytesIO:
+    """Compose a lobby/alive card from the cached frame and player tiles.
+
+    The encoded result is memoized on the card's full contents, so repeated
+    /viewlobby calls on an unchanged lobby just copy bytes.
+    """
+    key = (kind, game_code, slots, profile_name('card'))
+    cached = _list_card_cache.get(key)
+    if cached is not None:
+        _list_card_cache.move_to_end(key)
+        return io.BytesIO(cached)
+    
+    style = _LIST_CARD_STYLES[kind]
+    height = max(LOBBY_CARD_HEIGHT, 200 + len(slots) * 80)
+    img = _list_card_frame(kind, height, game_code).copy()
     
     # Player list
-    player_font = get_font(28)
     y_offset = 200
+    for name, color, is_bot in slots:
+        img.paste(_player_tile(kind, name, color, is_bot), (50, y_offset))
+        y_offset += LIST_CARD_SLOT_HEIGHT
     
-    for i, player in enumerate(players):
-        color = player.get('color', PLAYER_COLORS[i % len(PLAYER_COLORS)])
-        
-        # Draw color indicator
-        draw.ellipse((50, y_offset, 90, y_offset + 40), fill=color)
-        
-        # Draw player name
-        name = player.get('name', 'Unknown')
-        is_bot = player.get('is_bot', False)
-        bot_tag = " [BOT]" if is_bot else ""
-        
-        role_tag=""
-        
-        draw.text((110, y_offset), f"{name}{bot_tag}{role_tag}", fill=(255, 255, 255), font=player_font)
-        
-        y_offset += 70
+    draw = ImageDraw.Draw(img)
     
     # Player count
     count_font = get_font(30)
-    count_text = f"Alive: {len(players)}"
-    draw.text((50, height - 60), count_text, fill=(100, 255, 100), font=count_font)
+    draw.text((50, height - 60), count_text, fill=style['count_color'], font=count_font)
     
     # Border
-    draw.rectangle((10, 10, LOBBY_CARD_WIDTH-10, height-10), outline=(100, 255, 100), width=5)
+    draw.rectangle((10, 10, LOBBY_CARD_WIDTH-10, height-10), outline=style['accent'], width=5)
     
-    # Save to BytesIO
-    buffer = io.BytesIO()
-    img.save(buffer, 'PNG')
-    buffer.seek(0)
+    buffer = encode_image(img, 'card')
+    _list_card_cache[key] = buffer.getvalue()
+    if len(_list_card_cache) > LIST_CARD_CACHE_SIZE:
+        _list_card_cache.popitem(last=False)
     return buffer
 
 
+@timed('render')
+async def create_lobby_card(players: list, game_code: str = "ABCDEF") -> io.BytesIO:
+    """Create a lobby overview card"""
+    slots = tuple(
+        (player.get('name', 'Unknown'), PLAYER_COLORS[i % len(PLAYER_COLORS)], player.get('is_bot', False))
+        for i, player in enumerate(players)
+    )
+    return _render_list_card('lobby', slots, game_code, f"Players: {len(players)}/10")
+
+
+@timed('render')
+async def create_alive_players_card(players: list, game_code: str = "ABCDEF") -> io.BytesIO:
+    """Create an alive players overview card (similar to lobby card)"""
+    slots = tuple(
+        (
+            player.get('name', 'Unknown'),
+            player.get('color', PLAYER_COLORS[i % len(PLAYER_COLORS)]),
+            player.get('is_bot', False),
+        )
+        for i, player in enumerate(players)
+    )
+    return _render_list_card('alive', slots, game_code, f"Alive: {len(players)}")
+
+
+@timed('render')
 async def create_emergency_meeting_card(caller_name: Optional[str] = None) -> io.BytesIO:
     """Create emergency meeting card"""
-    img = Image.new('RGBA', (ROLE_CARD_WIDTH, ROLE_CARD_HEIGHT), color=(150, 0, 0, 255))
-    draw = ImageDraw.Draw(img)
-    
+    return render_emergency_meeting_card(caller_name)
+
+
+def render_emergency_meeting_card(caller_name: Optional[str] = None) -> io.BytesIO:
+    """Blocking body of create_emergency_meeting_card, for render_image_sync"""
     # Pulsing red background effect
-    for i in range(0, ROLE_CARD_HEIGHT, 20):
-        alpha = int(100 + 155 * abs((i / ROLE_CARD_HEIGHT) - 0.5))
-        draw.rectangle((0, i, ROLE_CARD_WIDTH, i+20), fill=(200, 0, 0, alpha))
+    img = card_background('meeting', (200, 0, 0))
+    draw = ImageDraw.Draw(img)
     
     # Title
     title_font = get_font(70, bold=True)
@@ -330,23 +417,21 @@ async def create_emergency_meeting_card(caller_name: Optional[str] = None) -> io
         draw.text((ROLE_CARD_WIDTH//2 - caller_width//2, ROLE_CARD_HEIGHT//2 + 50), 
                  caller_text, fill=(255, 200, 200), font=caller_font)
     
-    # Save to BytesIO
-    buffer = io.BytesIO()
-    img.save(buffer, 'PNG')
-    buffer.seek(0)
-    return buffer
+    return encode_image(img, 'card')
 
 
+@timed('render')
 async def create_vote_result_card(voted_player: str, votes: int, was_impostor: bool) -> io.BytesIO:
     """Create vote result/ejection card"""
-    img = Image.new('RGBA', (ROLE_CARD_WIDTH, ROLE_CARD_HEIGHT), color=(10, 10, 20, 255))
-    draw = ImageDraw.Draw(img)
-    
+    return render_vote_result_card(voted_player, votes, was_impostor)
+
+
+def render_vote_result_card(voted_player: str, votes: int, was_impostor: bool) -> io.BytesIO:
+    """Blocking body of create_vote_result_card, for render_image_sync"""
     # Background
     bg_color = (100, 20, 20) if was_impostor else (20, 20, 100)
-    for i in range(ROLE_CARD_HEIGHT):
-        alpha = int(200 - 100 * (i / ROLE_CARD_HEIGHT))
-        draw.rectangle((0, i, ROLE_CARD_WIDTH, i+1), fill=(*bg_color, alpha))
+    img = card_background('vote', bg_color)
+    draw = ImageDraw.Draw(img)
     
     # Ejected text
     title_font = get_font(60, bold=True)
@@ -375,36 +460,21 @@ async def create_vote_result_card(voted_player: str, votes: int, was_impostor: b
     role_width = role_bbox[2] - role_bbox[0]
     draw.text((ROLE_CARD_WIDTH//2 - role_width//2, 400), role_text, fill=role_color, font=role_font)
     
-    # Save to BytesIO
-    buffer = io.BytesIO()
-    img.save(buffer, 'PNG')
-    buffer.seek(0)
-    return buffer
+    return encode_image(img, 'card')
 
 
 
+@timed('render')
 async def create_death_card(player_name: str, avatar_url: str) -> io.BytesIO:
     """Create a death notification card"""
-    img = Image.new('RGBA', (ROLE_CARD_WIDTH, ROLE_CARD_HEIGHT), color=(20, 10, 10, 255))
-    draw = ImageDraw.Draw(img)
-    
     # Dark red background with gradient
-    for i in range(ROLE_CARD_HEIGHT):
-        alpha = int(150 + 105 * (i / ROLE_CARD_HEIGHT))
-        draw.rectangle((0, i, ROLE_CARD_WIDTH, i+1), fill=(80, 0, 0, alpha))
+    img = card_background('death', (80, 0, 0))
+    draw = ImageDraw.Draw(img)
     
     # Download avatar
-    avatar = await download_avatar(avatar_url)
+    avatar_size = 200
+    avatar = await get_avatar_circle(avatar_url, avatar_size)
     if avatar:
-        avatar_size = 200
-        avatar = avatar.resize((avatar_size, avatar_size), Image.Resampling.LANCZOS)
-        
-        mask = Image.new('L', (avatar_size, avatar_size), 0)
-        mask_draw = ImageDraw.Draw(mask)
-        mask_draw.ellipse((0, 0, avatar_size, avatar_size), fill=255)
-        avatar.putalpha(mask)
-        
-        
         img.paste(avatar, (ROLE_CARD_WIDTH//2 - avatar_size//2, 100), avatar)
     
     # Death text
@@ -420,8 +490,4 @@ async def create_death_card(player_name: str, avatar_url: str) -> io.BytesIO:
     killed_width = killed_bbox[2] - killed_bbox[0]
     draw.text((ROLE_CARD_WIDTH//2 - killed_width//2, 440), killed_text, fill=(255, 50, 50), font=killed_font)
     
-    # Save to BytesIO
-    buffer = io.BytesIO()
-    img.save(buffer, 'PNG')
-    buffer.seek(0)
-    return buffer
+    return encode_image(img, 'card')
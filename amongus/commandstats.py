@@ -0,0 +1,243 @@
+"""Per-command latency and outcome instrumentation for app commands.
+
+Commands are timed through public discord.py hooks only. interaction_check
+starts the sample, and on_error or the app_command_completion dispatch
+records it. The public InteractionResponse methods that acknowledge an
+interaction are wrapped to stamp the ack time. The followup sends are
+wrapped too, and both charge their time to 'http'.
+"""
+import asyncio
+import functools
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+import discord
+from discord import app_commands
+
+from .logs import bind
+from .metrics import dump_json
+
+log = logging.getLogger(__name__)
+
+SPAN_KINDS = ('render', 'db', 'http')
+INTERACTION_BUDGET_MS = 3000  # Discord fails the interaction if it isn't acknowledged in time
+
+# Public InteractionResponse methods, any of which acknowledges the interaction
+ACK_METHODS = ('defer', 'send_message', 'edit_message', 'send_modal', 'launch_activity')
+
+
+class CommandSample:
+    """Timing for one command invocation, shared with everything it awaits through a context var"""
+
+    __slots__ = ('command', 'created_at', 'started', 'acked_at', 'spans', '_depth')
+
+    def __init__(self, interaction: discord.Interaction):
+        self.command: Optional[str] = None
+        self.created_at = interaction.created_at.timestamp()
+        self.started = time.perf_counter()
+        self.acked_at: Optional[float] = None
+        self.spans = dict.fromkeys(SPAN_KINDS, 0.0)
+        self._depth = dict.fromkeys(SPAN_KINDS, 0)
+
+
+_active_sample: ContextVar[Optional[CommandSample]] = ContextVar('active_command_sample', default=None)
+
+
+@contextmanager
+def span(kind: str):
+    """Charge the enclosed time to `kind` for the command being handled, if any.
+    Nested spans of the same kind are only counted once."""
+    sample = _active_sample.get()
+    if sample is None:
+        yield
+        return
+
+    sample._depth[kind] += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        sample._depth[kind] -= 1
+        if not sample._depth[kind]:
+            sample.spans[kind] += time.perf_counter() - start
+
+
+def timed(kind: str):
+    """Decorator form of span() for coroutine functions"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(kind):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timed_methods(kind: str):
+    """Class decorator applying timed(kind) to every public coroutine method"""
+    def decorator(cls):
+        for name, attr in list(vars(cls).items()):
+            if not name.startswith('_') and asyncio.iscoroutinefunction(attr):
+                setattr(cls, name, timed(kind)(attr))
+        return cls
+    return decorator
+
+
+def _acking(method):
+    """Wrap an InteractionResponse method to stamp the active sample's ack time"""
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        sample = _active_sample.get()
+        with span('http'):
+            result = await method(*args, **kwargs)
+        if sample is not None and sample.acked_at is None:
+            sample.acked_at = time.time()
+        return result
+    return wrapper
+
+
+def instrument_responses():
+    """Time interaction responses and followups; safe to call more than once"""
+    targets = [(discord.InteractionResponse, name, _acking) for name in ACK_METHODS]
+    targets += [
+        (discord.Webhook, 'send', timed('http')),
+        (discord.Webhook, 'edit_message', timed('http')),
+        (discord.Interaction, 'edit_original_response', timed('http')),
+    ]
+    for cls, name, wrap in targets:
+        method = getattr(cls, name, None)
+        if method is None or getattr(method, '__instrumented__', False):
+            continue
+        wrapped = wrap(method)
+        wrapped.__instrumented__ = True
+        setattr(cls, name, wrapped)
+
+
+class CommandStats:
+    """Rolling window of command samples, summarised per command"""
+
+    def __init__(self, window: float = 900.0, max_samples: int = 5000, export_every: float = 60.0):
+        self.window = window
+        self.export_every = export_every
+        self._samples = deque(maxlen=max_samples)
+        self.totals = {'commands': 0, 'errors': 0, 'over_budget': 0}
+        self._export_task: Optional[asyncio.Task] = None
+
+    def record(self, sample: CommandSample, failed: bool, acked: bool = True):
+        total_ms = (time.perf_counter() - sample.started) * 1000
+        ack_ms = None
+        if sample.acked_at is not None:
+            ack_ms = max(0.0, (sample.acked_at - sample.created_at) * 1000)
+        over_budget = not acked or (ack_ms is not None and ack_ms > INTERACTION_BUDGET_MS)
+
+        self.totals['commands'] += 1
+        self.totals['errors'] += failed
+        self.totals['over_budget'] += over_budget
+        self._samples.append({
+            'at': time.time(),
+            'command': sample.command or 'unknown',
+            'total_ms': total_ms,
+            'ack_ms': ack_ms,
+            'failed': failed,
+            'over_budget': over_budget,
+            **{f"{kind}_ms": seconds * 1000 for kind, seconds in sample.spans.items()},
+        })
+
+    def summary(self) -> Dict[str, dict]:
+        """command -> stats over the rolling window, slowest p95 first"""
+        cutoff = time.time() - self.window
+        grouped: Dict[str, List[dict]] = {}
+        for row in self._samples:
+            if row['at'] >= cutoff:
+                grouped.setdefault(row['command'], []).append(row)
+
+        summary = {}
+        for command, rows in grouped.items():
+            totals = sorted(row['total_ms'] for row in rows)
+            acks = sorted(row['ack_ms'] for row in rows if row['ack_ms'] is not None)
+            handler_ms = sum(totals) or 1.0
+            summary[command] = {
+                'calls': len(rows),
+                'errors': sum(row['failed'] for row in rows),
+                'over_budget': sum(row['over_budget'] for row in rows),
+                'p50_ms': round(_percentile(totals, 0.5), 1),
+                'p95_ms': round(_percentile(totals, 0.95), 1),
+                'max_ms': round(totals[-1], 1),
+                'ack_p95_ms': round(_percentile(acks, 0.95), 1) if acks else None,
+                **{
+                    f"{kind}_share": round(sum(row[f"{kind}_ms"] for row in rows) / handler_ms, 3)
+                    for kind in SPAN_KINDS
+                },
+            }
+        return dict(sorted(summary.items(), key=lambda item: -item[1]['p95_ms']))
+
+    def export(self) -> str:
+        return dump_json('commands.json', {
+            'window_s': self.window,
+            'totals': self.totals,
+            'commands': self.summary(),
+        })
+
+    def start_export(self):
+        if self._export_task is None:
+            self._export_task = asyncio.get_running_loop().create_task(self._export_loop(), name='command_stats_export')
+
+    async def _export_loop(self):
+        while True:
+            await asyncio.sleep(self.export_every)
+            if not self._samples:
+                continue
+            try:
+                self.export()
+            except OSError as e:
+                log.warning("Could not write command metrics: %s", e)
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
+
+
+command_stats = CommandStats()
+
+
+class InstrumentedCommandTree(app_commands.CommandTree):
+    """CommandTree that times every slash command it dispatches.
+
+    Successful commands are recorded by `command_completed`, which the client
+    calls from `dispatch('app_command_completion', ...)` (see MyBot.dispatch).
+    This runs synchronously, before any listener task is scheduled.
+    """
+
+    def __init__(self, client: discord.Client, **kwargs):
+        super().__init__(client, **kwargs)
+        instrument_responses()
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # Runs in the same task as the command, so the context vars reach everything it awaits
+        if interaction.type is discord.InteractionType.application_command:
+            command = interaction.command
+            bind(channel=interaction.channel_id, command=f"/{command.qualified_name}" if command else None)
+
+            sample = CommandSample(interaction)
+            interaction.extras['command_sample'] = sample
+            _active_sample.set(sample)
+        return await super().interaction_check(interaction)
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError) -> None:
+        self._finish(interaction, failed=True)
+        await super().on_error(interaction, error)
+
+    def command_completed(self, interaction: discord.Interaction, command=None):
+        self._finish(interaction, failed=interaction.command_failed)
+
+    def _finish(self, interaction: discord.Interaction, failed: bool):
+        sample = interaction.extras.pop('command_sample', None)
+        if sample is None:
+            return
+        command = interaction.command
+        sample.command = f"/{command.qualified_name}" if command else None
+        command_stats.record(sample, failed, acked=interaction.response.is_done())
@@ -1,9 +1,24 @@
 import random
 import asyncio
+import secrets
+import string
 from typing import List, Dict, Optional, Set
 from .tasks import Task, generate_tasks_for_player
 from .constants import MIN_PLAYERS, MAX_PLAYERS, PLAYER_COLORS
+from .eventlog import GameEventLog, event_logs
 from .map_renderer import MapLayout
+from .supervisor import TaskSupervisor
+from .timers import TimerHandle, timer_wheel
+
+
+def generate_game_code() -> str:
+    """Random 6-letter lobby code, drawn from the OS so it says nothing about any game's seed"""
+    return ''.join(secrets.choice(string.ascii_uppercase) for _ in range(6))
+
+
+def new_game_seed() -> int:
+    # 63 bits so it fits a signed SQLite INTEGER
+    return secrets.randbits(63)
 
 
 class Player:
@@ -16,7 +31,8 @@ class Player:
         self.role = 'Crewmate'
         self.tasks: List[Task] = []
         self.color = '#FFFFFF'
-        self.location = 'Cafeteria'
+        self.events: Optional[GameEventLog] = None  # Set once the game starts recording
+        self._location = 'Cafeteria'
         self.voted_for: Optional[int] = None
         self.kill_cooldown = 0
         self.sabotage_cooldown = 0
@@ -41,6 +57,16 @@ class Player:
         self.shield_cooldown = 0
         self.shields_remaining = 2
         
+    @property
+    def location(self) -> str:
+        return self._location
+
+    @location.setter
+    def location(self, room: str):
+        if room != self._location and self.events is not None:
+            self.events.move(self, room)
+        self._location = room
+
     @property
     def completed_tasks(self) -> int:
         return sum(1 for task in self.tasks if task.completed)
@@ -73,13 +99,15 @@ class Player:
         else:
             self.role_type = 'Crewmate'
 
-    def assign_tasks(self, task_count: Optional[int] = None):
+    def assign_tasks(self, task_count: Optional[int] = None, rng: Optional[random.Random] = None):
         """Assign random tasks to player"""
-        self.tasks = generate_tasks_for_player(task_count)
+        self.tasks = generate_tasks_for_player(task_count, rng)
     
     def complete_task(self, task_index: int) -> bool:
         """Mark a task as complete"""
         if 0 <= task_index < len(self.tasks):
+            if self.events is not None and not self.tasks[task_index].completed:
+                self.events.task(self, task_index)
             self.tasks[task_index].completed = True
             return True
         return False
@@ -104,17 +132,29 @@ class Player:
 
 
 class AmongUsGame:
-    def __init__(self, guild_id: int, channel_id: int, max_players: int = MAX_PLAYERS, impostors: int = 1, scientists: int = 0, engineers: int = 0, guardian_angels: int = 0):
+    def __init__(self, guild_id: int, channel_id: int, max_players: int = MAX_PLAYERS, impostors: int = 1, scientists: int = 0, engineers: int = 0, guardian_angels: int = 0, seed: Optional[int] = None):
+        # Replaced with a fresh event on every transition, so waiters wake exactly once per change
+        self._phase_changed = asyncio.Event()
+        self._sabotage_changed = asyncio.Event()
+        
+        self._votes_changed = asyncio.Event()
+        
         self.guild_id = guild_id
         self.channel_id = channel_id
         self.max_players = max_players
         self.players: Dict[int, Player] = {}
-        self.phase = 'lobby'
+        self._phase = 'lobby'
         self.impostors: List[int] = []
         self.min_players = MIN_PLAYERS
         self.votes: Dict[int, int] = {}
+        self.vote_counts: Dict[int, int] = {}  # target_id -> votes, kept in sync with self.votes
         self.game_code = self._generate_game_code()
-        self.active_sabotage: Optional[str] = None
+        # Every rule and bot decision draws from generators derived from this seed, so a game can be replayed
+        self.seed = seed if seed is not None else new_game_seed()
+        self.rng = random.Random(self.seed)
+        self._bot_rngs: Dict[int, random.Random] = {}
+        self._active_sabotage: Optional[str] = None
+        self.sabotage_deadline: Optional[TimerHandle] = None  # Expiry of the active sabotage
         self.kill_cooldown = 18
         self.meeting_cooldown = 0
         self.last_meeting_time = 0
@@ -126,7 +166,8 @@ class AmongUsGame:
         self.engineer_count = engineers
         self.guardian_angel_count = guardian_angels
         
-        self.background_tasks: Set[asyncio.Task] = set()
+        self.tasks = TaskSupervisor(self.log_context)  # Owns every background task for this game
+        self.events: Optional[GameEventLog] = None  # Append-only record of the game, opened at /start
         
         # Global cooldowns for kill and body reporting
         self.last_kill_time = 0.0  # Timestamp of last kill by any impostor
@@ -134,10 +175,90 @@ class AmongUsGame:
         
         self.map_layout = MapLayout()
 
+    @property
+    def phase(self) -> str:
+        return self._phase
+
+    @phase.setter
+    def phase(self, value: str):
+        if value == self._phase:
+            return
+        self._phase = value
+        changed, self._phase_changed = self._phase_changed, asyncio.Event()
+        changed.set()
+        # A meeting waiting on votes must notice the game ending
+        self._votes_changed.set()
+        if self.events is not None:
+            self.events.phase(value)
+            self.events.snapshot(self)
+            if value == 'ended':
+                self.events.close()
+
+    @property
+    def active_sabotage(self) -> Optional[str]:
+        return self._active_sabotage
+
+    @active_sabotage.setter
+    def active_sabotage(self, value: Optional[str]):
+        if value == self._active_sabotage:
+            return
+        self._active_sabotage = value
+        if self.events is not None:
+            self.events.sabotage(value)
+        # A fixed or replaced sabotage must never expire
+        if self.sabotage_deadline is not None:
+            self.sabotage_deadline.cancel()
+            self.sabotage_deadline = None
+        changed, self._sabotage_changed = self._sabotage_changed, asyncio.Event()
+        changed.set()
+
+    async def wait_for_phase(self, *phases: str, timeout: Optional[float] = None) -> str:
+        """Park until the game enters one of `phases` or ends. Returns the phase reached."""
+        async def _wait():
+            while self._phase not in phases and self._phase != 'ended':
+                await self._phase_changed.wait()
+        
+        try:
+            await asyncio.wait_for(_wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._phase
+
+    async def wait_for_sabotage_change(self, current: Optional[str], timeout: Optional[float] = None) -> Optional[str]:
+        """Park until active_sabotage differs from `current`, the phase changes, or timeout.
+
+        Returns the sabotage active when woken.
+        """
+        if self._active_sabotage != current:
+            return self._active_sabotage
+        
+        sabotage_changed = asyncio.ensure_future(self._sabotage_changed.wait())
+        phase_changed = asyncio.ensure_future(self._phase_changed.wait())
+        try:
+            await asyncio.wait(
+                {sabotage_changed, phase_changed},
+                timeout=timeout,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            sabotage_changed.cancel()
+            phase_changed.cancel()
+        return self._active_sabotage
+
     def _generate_game_code(self) -> str:
         """Generate a random 6-letter game code"""
-        import string
-        return ''.join(random.choices(string.ascii_uppercase, k=6))
+        return generate_game_code()
+
+    def rng_for(self, player: Player) -> random.Random:
+        """The generator a bot's behaviour loop draws from.
+
+        Each bot gets its own stream so concurrent bots can't shift each
+        other's draws by waking up in a different order.
+        """
+        rng = self._bot_rngs.get(player.user_id)
+        if rng is None:
+            rng = self._bot_rngs[player.user_id] = random.Random(f"{self.seed}:{player.user_id}")
+        return rng
 
     async def add_player(self, user_id: int, name: str, avatar_url: str = "", is_bot: bool = False):
         if len(self.players) >= self.max_players:
@@ -163,10 +284,10 @@ class AmongUsGame:
             dummy = await self.add_player(dummy_id, name, "", is_bot=True)
             
             if available_rooms:
-                spawn_room = random.choice(available_rooms)
+                spawn_room = self.rng.choice(available_rooms)
                 available_rooms.remove(spawn_room)
             else:
-                spawn_room = random.choice(all_rooms)
+                spawn_room = self.rng.choice(all_rooms)
             
             dummy.location = spawn_room
             dummy_positions.append(spawn_room)
@@ -183,7 +304,7 @@ class AmongUsGame:
                 dummy_list = [p for p in self.players.values() if p.is_bot]
                 
                 if len(dummy_list) >= 4:
-                    target_rooms = random.sample(all_rooms, 2)
+                    target_rooms = self.rng.sample(all_rooms, 2)
                     
                     for i, target_room in enumerate(target_rooms):
                         if i * 2 + 1 < len(dummy_list):
@@ -192,7 +313,7 @@ class AmongUsGame:
 
     async def assign_roles(self, impostor_count: int = 1, scientists: int = 0, engineers: int = 0, guardian_angels: int = 0):
         ids = list(self.players.keys())
-        random.shuffle(ids)
+        self.rng.shuffle(ids)
         impostor_count = min(impostor_count, max(1, len(ids) // 3))
         self.impostors = ids[:impostor_count]
         
@@ -202,7 +323,7 @@ class AmongUsGame:
         guardian_angels = min(guardian_angels, max_special - scientists - engineers)
         
         remaining_ids = [uid for uid in ids if uid not in self.impostors]
-        random.shuffle(remaining_ids)
+        self.rng.shuffle(remaining_ids)
         
         scientist_ids = remaining_ids[:scientists]
         engineer_ids = remaining_ids[scientists:scientists + engineers]
@@ -211,19 +332,19 @@ class AmongUsGame:
         for uid, player in self.players.items():
             if uid in self.impostors:
                 player.assign_role('Impostor')
-                player.assign_tasks()
+                player.assign_tasks(rng=self.rng)
             elif uid in scientist_ids:
                 player.assign_role('Scientist')
-                player.assign_tasks()
+                player.assign_tasks(rng=self.rng)
             elif uid in engineer_ids:
                 player.assign_role('Engineer')
-                player.assign_tasks()
+                player.assign_tasks(rng=self.rng)
             elif uid in guardian_angel_ids:
                 player.assign_role('Guardian Angel')
-                player.assign_tasks()
+                player.assign_tasks(rng=self.rng)
             else:
                 player.assign_role('Crewmate')
-                player.assign_tasks()
+                player.assign_tasks(rng=self.rng)
 
     def alive_players(self):
         return [p for p in self.players.values() if p.alive]
@@ -253,21 +374,68 @@ class AmongUsGame:
         
         return None
     
+    def _record_vote(self, voter_id: int, target_id: int):
+        """Store a vote, update the running tally and wake anyone waiting on votes"""
+        previous = self.votes.get(voter_id)
+        if previous is not None:
+            remaining = self.vote_counts.get(previous, 0) - 1
+            if remaining > 0:
+                self.vote_counts[previous] = remaining
+            else:
+                self.vote_counts.pop(previous, None)
+        
+        self.votes[voter_id] = target_id
+        self.vote_counts[target_id] = self.vote_counts.get(target_id, 0) + 1
+        self._votes_changed.set()
+        if self.events is not None:
+            self.events.vote(self.players.get(voter_id), self.players.get(target_id))
+    
+    def _rebuild_vote_counts(self):
+        """Recount the tally from self.votes (after loading votes from storage)"""
+        self.vote_counts = {}
+        for target_id in self.votes.values():
+            self.vote_counts[target_id] = self.vote_counts.get(target_id, 0) + 1
+        self._votes_changed.set()
+    
+    def all_votes_in(self) -> bool:
+        return len(self.votes) >= len(self.alive_players())
+    
+    async def wait_for_votes(self, timeout: float) -> bool:
+        """Wait until every alive player has voted.
+
+        Returns True when all votes are in, False on timeout or if the game ended.
+        """
+        expired = False
+
+        def expire():
+            nonlocal expired
+            expired = True
+            self._votes_changed.set()
+
+        deadline = timer_wheel.call_later(timeout, expire)
+        try:
+            while True:
+                if self.phase == 'ended':
+                    return False
+                if self.all_votes_in():
+                    return True
+                if expired:
+                    return False
+                
+                self._votes_changed.clear()
+                await self._votes_changed.wait()
+        finally:
+            deadline.cancel()
+    
     async def cast_vote(self, voter_id: int, target_id: int):
         """Cast a vote during a meeting"""
         if voter_id in self.players and self.players[voter_id].alive:
-            self.votes[voter_id] = target_id
+            self._record_vote(voter_id, target_id)
     
     async def tally_votes(self) -> Optional[int]:
-        """Tally votes and return the player ID with most votes, or None if tie/no votes"""
-        if not self.votes:
-            return None
-        
-        # Count votes, excluding skips (-1)
-        vote_counts = {}
-        for target_id in self.votes.values():
-            if target_id != -1:  # Exclude skips from counting
-                vote_counts[target_id] = vote_counts.get(target_id, 0) + 1
+        """Return the player ID with most votes, or None if tie/no votes"""
+        # Skips (-1) never eject anyone
+        vote_counts = {target_id: count for target_id, count in self.vote_counts.items() if target_id != -1}
         
         # If everyone skipped, no one gets ejected
         if not vote_counts:
@@ -287,15 +455,23 @@ class AmongUsGame:
     async def clear_votes(self):
         """Clear all votes"""
         self.votes = {}
+        self.vote_counts = {}
         for player in self.players.values():
             player.voted_for = None
+        # The meeting snapshot is taken before this runs and still holds the last meeting's votes
+        if self.events is not None:
+            self.events.clear_votes()
     
+    def log_context(self) -> Dict[str, object]:
+        """Fields identifying this game in log records"""
+        return {'game': self.game_code, 'channel': self.channel_id}
+
     def cancel_all_tasks(self):
         """Cancel all background tasks (called when game ends)"""
-        for task in self.background_tasks:
-            if not task.done():
-                task.cancel()
-        self.background_tasks.clear()
+        self.tasks.cancel_all()
+        if self.sabotage_deadline is not None:
+            self.sabotage_deadline.cancel()
+            self.sabotage_deadline = None
 
     def move_player(self, player_id: int, target_room: str) -> bool:
         if player_id not in self.players:
@@ -316,6 +492,26 @@ class AmongUsGame:
     def add_body_to_room(self, room_name: str, player_name: str):
         self.map_layout.add_body_to_room(room_name, player_name)
 
+    def kill_player(self, killer: Player, victim: Player):
+        """Kill `victim`, leaving their body where the killer stands"""
+        victim.alive = False
+        self.add_body_to_room(killer.location, victim.name)
+        if self.events is not None:
+            self.events.kill(killer, victim, killer.location)
+
+    def eject_player(self, player: Player, votes: int):
+        player.alive = False
+        if self.events is not None:
+            self.events.eject(player, votes)
+
+    def open_event_log(self):
+        """Start recording moves, kills, tasks, sabotages and votes, beginning with a snapshot"""
+        if self.events is not None and not self.events.closed:
+            return
+        self.events = event_logs.open(self)
+        for player in self.players.values():
+            player.events = self.events
+
     def get_players_in_room(self, room_name: str) -> List[Player]:
         return [p for p in self.players.values() if p.location == room_name and p.alive]
 
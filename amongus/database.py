@@ -1,11 +1,16 @@
 """SQLite3 database handler for Among Us bot"""
+import logging
 import sqlite3
 import json
 import asyncio
 from typing import Optional, Dict, List, Any
 from datetime import datetime
 import aiosqlite
+from .commandstats import timed_methods
 
+log = logging.getLogger(__name__)
+
+@timed_methods('db')
 class GameDatabase:
     """Async SQLite database for game state and player stats"""
     
@@ -19,13 +24,13 @@ class GameDatabase:
         self.connection.row_factory = aiosqlite.Row
         await self._create_tables()
         await self._clear_temporary_tables()
-        print("✅ Database initialized successfully")
+        log.info("Database initialized successfully")
     
     async def close(self):
         """Close database connection"""
         if self.connection:
             await self.connection.close()
-            print("Database connection closed")
+            log.info("Database connection closed")
     
     async def _create_tables(self):
         """Create all database tables"""
@@ -81,6 +86,7 @@ class GameDatabase:
                 guardian_angel_count INTEGER DEFAULT 0,
                 active_sabotage TEXT,
                 kill_cooldown INTEGER DEFAULT 18,
+                rng_seed INTEGER,
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP
             );
             
@@ -156,15 +162,15 @@ class GameDatabase:
             DELETE FROM games;
         """)
         await self.connection.commit()
-        print("🧹 Temporary game data cleared")
+        log.info("Temporary game data cleared")
  
-    async def create_game(self, channel_id: int, guild_id: int, game_code: str, max_players: int = 10, impostor_count: int = 1, scientist_count: int = 0, engineer_count: int = 0, guardian_angel_count: int = 0):
+    async def create_game(self, channel_id: int, guild_id: int, game_code: str, max_players: int = 10, impostor_count: int = 1, scientist_count: int = 0, engineer_count: int = 0, guardian_angel_count: int = 0, rng_seed: Optional[int] = None):
         if self.connection is None:
             raise ValueError("Database connection not initialized. Call initialize() first.")
         await self.connection.execute("""
-            INSERT INTO games (channel_id, guild_id, game_code, max_players, impostor_count, scientist_count, engineer_count, guardian_angel_count)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (channel_id, guild_id, game_code, max_players, impostor_count, scientist_count, engineer_count, guardian_angel_count))
+            INSERT INTO games (channel_id, guild_id, game_code, max_players, impostor_count, scientist_count, engineer_count, guardian_angel_count, rng_seed)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (channel_id, guild_id, game_code, max_players, impostor_count, scientist_count, engineer_count, guardian_angel_count, rng_seed))
         await self.connection.commit()
     
     async def get_game(self, channel_id: int) -> Optional[Dict[str, Any]]:
@@ -0,0 +1,79 @@
+"""Shared direct-message delivery with bounded concurrency and retry-after backoff"""
+import asyncio
+from typing import Any, Dict, Iterable, List, Tuple
+
+import discord
+
+from .commandstats import timed
+from .outbound import retry_after
+
+
+MAX_CONCURRENT_DMS = 5
+MAX_DM_ATTEMPTS = 4
+BASE_BACKOFF = 1.0  # Seconds; doubled on each retry that has no Retry-After
+
+
+class DMDelivery:
+    """Sends DMs through a shared semaphore so bursts (game start, kills)
+    don't all hit Discord at once.
+
+    Forbidden (DMs closed) is not retried. 429s wait for Retry-After; other
+    HTTP errors back off exponentially.
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_DMS, max_attempts: int = MAX_DM_ATTEMPTS):
+        self.max_attempts = max_attempts
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.metrics = {
+            'delivered': 0,
+            'failed': 0,
+            'forbidden': 0,
+            'retries': 0,
+            'rate_limited': 0,
+            'backoff_seconds': 0.0,
+        }
+
+    @timed('http')
+    async def send(self, user: discord.User | discord.Member, **kwargs) -> bool:
+        """DM a user, returning whether it was delivered"""
+        for attempt in range(self.max_attempts):
+            # Only the send itself holds a slot; waiting out a backoff shouldn't block other recipients
+            async with self._semaphore:
+                try:
+                    await user.send(**kwargs)
+                    self.metrics['delivered'] += 1
+                    return True
+                except discord.Forbidden:
+                    self.metrics['forbidden'] += 1
+                    return False
+                except discord.HTTPException as e:
+                    if attempt == self.max_attempts - 1:
+                        break
+
+                    if e.status == 429:
+                        self.metrics['rate_limited'] += 1
+                        wait = retry_after(e)
+                    else:
+                        wait = BASE_BACKOFF * (2 ** attempt)
+
+            self.metrics['retries'] += 1
+            self.metrics['backoff_seconds'] += wait
+            await asyncio.sleep(wait)
+
+            for file in [kwargs.get('file'), *(kwargs.get('files') or ())]:
+                if file is not None:
+                    file.reset()
+
+        self.metrics['failed'] += 1
+        return False
+
+    async def fan_out(
+        self, deliveries: Iterable[Tuple[discord.User | discord.Member, Dict[str, Any]]]
+    ) -> List[bool]:
+        """Send several DMs in parallel; returns delivery results in input order"""
+        return list(await asyncio.gather(
+            *(self.send(user, **kwargs) for user, kwargs in deliveries)
+        ))
+
+
+dm_service = DMDelivery()
@@ -0,0 +1,60 @@
+"""Encoder profiles for generated images"""
+import logging
+import os
+from io import BytesIO
+from typing import Any, Dict, NamedTuple, Optional
+
+from PIL import Image
+
+log = logging.getLogger(__name__)
+
+
+class EncoderProfile(NamedTuple):
+    format: str
+    params: Dict[str, Any]
+    palette: bool = False  # Quantize to 256 colours before encoding
+
+
+ENCODER_PROFILES: Dict[str, EncoderProfile] = {
+    # Pillow's defaults, same bytes as a plain img.save(buffer, 'PNG')
+    'png': EncoderProfile('PNG', {}),
+    'png-fast': EncoderProfile('PNG', {'compress_level': 1}),
+    'png-small': EncoderProfile('PNG', {'optimize': True}),
+    'png-palette': EncoderProfile('PNG', {'optimize': True}, palette=True),
+    'webp-lossless': EncoderProfile('WEBP', {'lossless': True, 'quality': 80, 'method': 4}),
+    'webp': EncoderProfile('WEBP', {'quality': 85, 'method': 4}),
+}
+DEFAULT_PROFILE = 'png'
+
+EXTENSIONS = {'PNG': 'png', 'WEBP': 'webp'}
+
+
+def profile_name(kind: str) -> str:
+    """Profile for a renderer kind ('map' or 'card'), from MAP_IMAGE_PROFILE /
+    CARD_IMAGE_PROFILE, then IMAGE_PROFILE, then the default."""
+    name = os.getenv(f'{kind.upper()}_IMAGE_PROFILE') or os.getenv('IMAGE_PROFILE') or DEFAULT_PROFILE
+    if name not in ENCODER_PROFILES:
+        log.warning("Unknown image profile '%s', using '%s'", name, DEFAULT_PROFILE)
+        return DEFAULT_PROFILE
+    return name
+
+
+def encode_image(img: Image.Image, kind: str, profile: Optional[str] = None) -> BytesIO:
+    """Encode a rendered image with the deployment's profile for `kind`"""
+    encoder = ENCODER_PROFILES[profile or profile_name(kind)]
+
+    if encoder.palette:
+        method = Image.Quantize.FASTOCTREE if img.mode == 'RGBA' else Image.Quantize.MEDIANCUT
+        img = img.quantize(colors=256, method=method)
+
+    buffer = BytesIO()
+    img.save(buffer, encoder.format, **encoder.params)
+    buffer.seek(0)
+    return buffer
+
+
+def image_filename(buffer: BytesIO, stem: str) -> str:
+    """Attachment filename with the extension matching the encoded bytes"""
+    header = buffer.getbuffer()[:12].tobytes()
+    extension = 'webp' if header[:4] == b'RIFF' and header[8:12] == b'WEBP' else 'png'
+    return f"{stem}.{extension}"
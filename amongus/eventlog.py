@@ -0,0 +1,481 @@
+"""Append-only per-game event log with snapshots at phase boundaries.
+
+A log file is a sequence of segments. Each segment starts with MAGIC and
+is followed by records:
+
+    kind (1 byte) | ms since previous record (varint) | fields
+
+Integer fields are zigzag varints. Strings (rooms, phases, sabotages) and
+players are interned per segment: the first time one is referenced a NAME
+or PLAYER record defines it, and later records refer to it by a small index,
+so a move costs about four bytes. Snapshots are zlib-compressed JSON of the
+whole game state and are written whenever the phase changes.
+
+Recording only appends to an in-memory buffer. The `event_logs` writer
+flushes the buffers from a background loop, doing the file I/O in a thread.
+"""
+import asyncio
+import copy
+import csv
+import json
+import logging
+import os
+import sys
+import time
+import zlib
+from enum import IntEnum
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+log = logging.getLogger(__name__)
+
+MAGIC = b'AUEV1\n'
+DEFAULT_KEEP = 500  # Most recent game logs kept on disk (GAME_LOG_KEEP)
+
+
+class EventKind(IntEnum):
+    NAME = 0
+    PLAYER = 1
+    PHASE = 2
+    SNAPSHOT = 3
+    MOVE = 4
+    KILL = 5
+    TASK = 6
+    SABOTAGE = 7
+    VOTE = 8
+    EJECT = 9
+    CLEAR_VOTES = 10
+
+
+# Field layout per kind. 'player' and 'name' fields hold interned indexes; 'bytes' is length-prefixed.
+_FIELDS: Dict[EventKind, Tuple[Tuple[str, str], ...]] = {
+    EventKind.NAME: (('id', 'int'), ('text', 'bytes')),
+    EventKind.PLAYER: (('id', 'int'), ('user_id', 'int'), ('name', 'bytes')),
+    EventKind.PHASE: (('phase', 'name'),),
+    EventKind.SNAPSHOT: (('state', 'bytes'),),
+    EventKind.MOVE: (('player', 'player'), ('room', 'name')),
+    EventKind.KILL: (('killer', 'player'), ('victim', 'player'), ('room', 'name')),
+    EventKind.TASK: (('player', 'player'), ('task', 'int')),
+    EventKind.SABOTAGE: (('sabotage', 'name'),),
+    EventKind.VOTE: (('voter', 'player'), ('target', 'player')),
+    EventKind.EJECT: (('player', 'player'), ('votes', 'int')),
+    EventKind.CLEAR_VOTES: (),
+}
+
+_NO_NAME = 0      # Name index 0 is reserved for None (e.g. a fixed sabotage)
+_SKIP_VOTE = -1   # Player index used for a skip vote
+
+
+def log_dir() -> str:
+    """Directory for game event logs (GAME_LOG_DIR, default ./game_logs)"""
+    path = os.getenv('GAME_LOG_DIR') or 'game_logs'
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _varint(buffer: bytearray, value: int):
+    value = (value << 1) ^ (value >> 63)  # Zigzag so small negative ids stay short
+    while value > 0x7F:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    shift = 0
+    value = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            break
+        shift += 7
+    return (value >> 1) ^ -(value & 1), pos
+
+
+def game_state(game) -> Dict[str, Any]:
+    """Everything needed to restore `game`, in the shape replay() maintains"""
+    return {
+        'wall_time': time.time(),
+        'game_code': game.game_code,
+        'channel_id': game.channel_id,
+        'seed': game.seed,
+        'phase': game.phase,
+        'sabotage': game.active_sabotage,
+        'impostors': list(game.impostors),
+        'votes': {str(voter): target for voter, target in game.votes.items()},
+        'players': {
+            str(player.user_id): {
+                'name': player.name,
+                'role': player.role,
+                'color': player.color,
+                'alive': player.alive,
+                'location': player.location,
+                'is_bot': player.is_bot,
+                'tasks': [[task.task_type, task.location, task.completed] for task in player.tasks],
+            }
+            for player in game.players.values()
+        },
+        'bodies': {name: list(room.bodies) for name, room in game.map_layout.rooms.items() if room.bodies},
+    }
+
+
+class GameEventLog:
+    """Records one game's events into a buffer; never does I/O itself"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.closed = False
+        self._buffer = bytearray(MAGIC)
+        self._last = time.monotonic()
+        self._names: Dict[str, int] = {}
+        self._players: Dict[int, int] = {}
+        self.metrics = {'events': 0, 'bytes': 0}
+
+    def _record(self, kind: EventKind, *values: int, blob: Optional[bytes] = None):
+        if self.closed:
+            return
+        now = time.monotonic()
+        start = len(self._buffer)
+        self._buffer.append(kind)
+        _varint(self._buffer, int((now - self._last) * 1000))
+        self._last = now
+        for value in values:
+            _varint(self._buffer, value)
+        if blob is not None:
+            _varint(self._buffer, len(blob))
+            self._buffer += blob
+        self.metrics['events'] += 1
+        self.metrics['bytes'] += len(self._buffer) - start
+
+    def _name(self, text: Optional[str]) -> int:
+        if text is None:
+            return _NO_NAME
+        index = self._names.get(text)
+        if index is None:
+            index = self._names[text] = len(self._names) + 1
+            self._record(EventKind.NAME, index, blob=text.encode())
+        return index
+
+    def _player(self, player) -> int:
+        if player is None:
+            return _SKIP_VOTE
+        index = self._players.get(player.user_id)
+        if index is None:
+            index = self._players[player.user_id] = len(self._players)
+            self._record(EventKind.PLAYER, index, player.user_id, blob=player.name.encode())
+        return index
+
+    def move(self, player, room: str):
+        self._record(EventKind.MOVE, self._player(player), self._name(room))
+
+    def kill(self, killer, victim, room: str):
+        self._record(EventKind.KILL, self._player(killer), self._player(victim), self._name(room))
+
+    def task(self, player, task_index: int):
+        self._record(EventKind.TASK, self._player(player), task_index)
+
+    def sabotage(self, sabotage: Optional[str]):
+        self._record(EventKind.SABOTAGE, self._name(sabotage))
+
+    def vote(self, voter, target):
+        self._record(EventKind.VOTE, self._player(voter), self._player(target))
+
+    def eject(self, player, votes: int):
+        self._record(EventKind.EJECT, self._player(player), votes)
+
+    def clear_votes(self):
+        self._record(EventKind.CLEAR_VOTES)
+
+    def phase(self, phase: str):
+        self._record(EventKind.PHASE, self._name(phase))
+
+    def snapshot(self, game):
+        state = json.dumps(game_state(game), separators=(',', ':')).encode()
+        self._record(EventKind.SNAPSHOT, blob=zlib.compress(state))
+
+    def take(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+    def close(self):
+        self.closed = True
+
+
+def _append(path: str, data: bytes):
+    with open(path, 'ab') as f:
+        f.write(data)
+
+
+def _prune(directory: str, keep: int, in_use: Set[str]) -> int:
+    """Delete all but the `keep` most recently written logs; returns how many went"""
+    paths = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.evlog')]
+    paths.sort(key=os.path.getmtime, reverse=True)
+    removed = 0
+    for path in paths[keep:]:
+        if path in in_use:
+            continue
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+class EventLogWriter:
+    """Owns every open game log and flushes them to disk in the background"""
+
+    def __init__(self, flush_every: float = 2.0):
+        self.flush_every = flush_every
+        self._logs: Dict[str, GameEventLog] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self.metrics = {'opened': 0, 'flushes': 0, 'bytes_written': 0, 'write_errors': 0, 'pruned': 0}
+
+    @staticmethod
+    def path_for(game) -> str:
+        return os.path.join(log_dir(), f"{game.channel_id}-{game.game_code}.evlog")
+
+    def open(self, game) -> GameEventLog:
+        """Start a new segment in the game's log, beginning with a snapshot of its current state"""
+        path = self.path_for(game)
+        events = GameEventLog(path)
+        # A game reloaded mid-run continues its file; flush the old segment first
+        previous = self._logs.get(path)
+        if previous is not None:
+            previous.close()
+            events._buffer[:0] = previous.take()
+        self._logs[path] = events
+        self.metrics['opened'] += 1
+        events.snapshot(game)
+        return events
+
+    def start(self):
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop(), name='event_log_flush')
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_every)
+            await self.flush()
+
+    async def flush(self):
+        """Write every pending buffer; closed logs are dropped once written"""
+        async with self._lock:
+            closed = False
+            for path, events in list(self._logs.items()):
+                if events.closed:
+                    del self._logs[path]
+                    closed = True
+                data = events.take()
+                if not data:
+                    continue
+                try:
+                    await asyncio.to_thread(_append, path, data)
+                except OSError as e:
+                    self.metrics['write_errors'] += 1
+                    log.warning("Could not write event log %s: %s", path, e)
+                    continue
+                self.metrics['flushes'] += 1
+                self.metrics['bytes_written'] += len(data)
+
+            # Finished games are the only thing that adds files, so that's when to trim
+            if closed:
+                keep = int(os.getenv('GAME_LOG_KEEP') or DEFAULT_KEEP)
+                try:
+                    self.metrics['pruned'] += await asyncio.to_thread(_prune, log_dir(), keep, set(self._logs))
+                except OSError as e:
+                    log.warning("Could not prune event logs: %s", e)
+
+    async def recover(self, game) -> bool:
+        """Bring a game reloaded mid-run up to date from its log, if it has one.
+
+        The log is written every couple of seconds, while the database is only
+        saved at a few points and never holds bodies, so the latest snapshot plus
+        the events after it is the fresher record. Returns whether it was applied.
+        """
+        path = self.path_for(game)
+        await self.flush()  # The tail may still be buffered if the game was only evicted from a cache
+        if not os.path.exists(path):
+            return False
+        try:
+            state = await asyncio.to_thread(restore, path)
+        except OSError as e:
+            log.warning("Could not read event log %s: %s", path, e)
+            return False
+        if state is None or state.get('game_code') != game.game_code:
+            return False
+        apply_state(game, state)
+        return True
+
+    def open_count(self) -> int:
+        return sum(not events.closed for events in self._logs.values())
+
+
+event_logs = EventLogWriter()
+
+
+class Event(NamedTuple):
+    kind: EventKind
+    t_ms: int      # Milliseconds since the segment started
+    fields: Dict[str, Any]
+
+
+def _decode_record(data: bytes, pos: int, names: Dict[int, Optional[str]], players: Dict[int, Optional[int]]):
+    """(kind, ms delta, fields, next pos) for the record at `pos`; raises ValueError if it's cut short"""
+    kind = EventKind(data[pos])
+    delta, pos = _read_varint(data, pos + 1)
+    fields: Dict[str, Any] = {}
+    for name, kind_of in _FIELDS[kind]:
+        if kind_of == 'bytes':
+            length, pos = _read_varint(data, pos)
+            fields[name] = data[pos:pos + length]
+            pos += length
+            continue
+        value, pos = _read_varint(data, pos)
+        if kind_of == 'name':
+            value = names[value]
+        elif kind_of == 'player':
+            value = players[value]
+        fields[name] = value
+    if pos > len(data):
+        raise ValueError("truncated record")
+
+    if kind is EventKind.NAME:
+        names[fields['id']] = fields['text'].decode()
+    elif kind is EventKind.PLAYER:
+        players[fields['id']] = fields['user_id']
+    elif kind is EventKind.SNAPSHOT:
+        fields['state'] = json.loads(zlib.decompress(fields['state']))
+    return kind, delta, fields, pos
+
+
+def read_events(path: str) -> Iterator[Event]:
+    """Decode a log, resolving interned names and players. Snapshots come back as dicts.
+
+    A segment cut short by a crash mid-write is skipped up to the next segment.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    pos = 0
+    elapsed = 0
+    names: Dict[int, Optional[str]] = {}
+    players: Dict[int, Optional[int]] = {}
+    while pos < len(data):
+        if data.startswith(MAGIC, pos):
+            pos += len(MAGIC)
+            elapsed = 0
+            names = {_NO_NAME: None}
+            players = {_SKIP_VOTE: None}
+            continue
+
+        try:
+            kind, delta, fields, end = _decode_record(data, pos, names, players)
+        except (ValueError, IndexError, KeyError, zlib.error):
+            log.warning("Skipping damaged segment in %s at byte %d", path, pos)
+            pos = data.find(MAGIC, pos + 1)
+            if pos < 0:
+                return
+            continue
+
+        pos = end
+        elapsed += delta
+        yield Event(kind, elapsed, fields)
+
+
+def apply_event(state: Dict[str, Any], event: Event):
+    """Advance a snapshot-shaped state by one event"""
+    kind, fields = event.kind, event.fields
+    players = state['players']
+    if kind is EventKind.MOVE:
+        players[str(fields['player'])]['location'] = fields['room']
+    elif kind is EventKind.KILL:
+        players[str(fields['victim'])]['alive'] = False
+        name = players[str(fields['victim'])]['name']
+        state['bodies'].setdefault(fields['room'], []).append(name)
+    elif kind is EventKind.TASK:
+        players[str(fields['player'])]['tasks'][fields['task']][2] = True
+    elif kind is EventKind.SABOTAGE:
+        state['sabotage'] = fields['sabotage']
+    elif kind is EventKind.VOTE:
+        target = fields['target']
+        state['votes'][str(fields['voter'])] = -1 if target is None else target
+    elif kind is EventKind.EJECT:
+        players[str(fields['player'])]['alive'] = False
+    elif kind is EventKind.CLEAR_VOTES:
+        state['votes'] = {}
+    elif kind is EventKind.PHASE:
+        state['phase'] = fields['phase']
+
+
+def replay(path: str, from_latest_snapshot: bool = False) -> Iterator[Tuple[Event, Dict[str, Any]]]:
+    """Yield each event with the game state just after it.
+
+    The state is a single dict mutated in place, so copy it to keep one.
+    """
+    events: List[Event] = list(read_events(path))
+    start = 0
+    if from_latest_snapshot:
+        for index, event in enumerate(events):
+            if event.kind is EventKind.SNAPSHOT:
+                start = index
+
+    state: Optional[Dict[str, Any]] = None
+    for event in events[start:]:
+        if event.kind is EventKind.SNAPSHOT:
+            state = event.fields['state']
+        elif state is not None:
+            apply_event(state, event)
+        if state is not None:
+            yield event, state
+
+
+def restore(path: str) -> Optional[Dict[str, Any]]:
+    """Latest game state recorded in a log: the last snapshot plus everything after it"""
+    state = None
+    for _, state in replay(path, from_latest_snapshot=True):
+        pass
+    return copy.deepcopy(state)
+
+
+def apply_state(game, state: Dict[str, Any]):
+    """Overwrite a game's players, bodies, sabotage and votes with a state from restore().
+
+    The phase is left as loaded, since the caller decides how the game resumes from it.
+    """
+    for user_id, player in game.players.items():
+        recorded = state['players'].get(str(user_id))
+        if recorded is None:
+            continue
+        player.alive = recorded['alive']
+        player.location = recorded['location']
+        for task, (task_type, location, completed) in zip(player.tasks, recorded['tasks']):
+            if (task.task_type, task.location) == (task_type, location):
+                task.completed = completed
+
+    game.map_layout.clear_all_bodies()
+    for room, names in state['bodies'].items():
+        for name in names:
+            game.map_layout.add_body_to_room(room, name)
+
+    game.active_sabotage = state['sabotage']
+    game.votes = {int(voter): target for voter, target in state['votes'].items()}
+    game._rebuild_vote_counts()
+
+
+def _export_csv(path: str, out=sys.stdout):
+    writer = csv.writer(out)
+    writer.writerow(('t_ms', 'event', 'fields'))
+    for event in read_events(path):
+        if event.kind in (EventKind.NAME, EventKind.PLAYER):
+            continue
+        fields = {'phase': event.fields['state']['phase']} if event.kind is EventKind.SNAPSHOT else event.fields
+        writer.writerow((event.t_ms, event.kind.name.lower(), json.dumps(fields)))
+
+
+if __name__ == '__main__':
+    # python -m amongus.eventlog game_logs/<channel>-<code>.evlog > events.csv
+    _export_csv(sys.argv[1])
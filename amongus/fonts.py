@@ -0,0 +1,71 @@
+"""Font registry shared by the card and map renderers"""
+import logging
+import os
+import threading
+from typing import Dict, List, Sequence, Tuple, Union
+
+from PIL import ImageFont
+
+log = logging.getLogger(__name__)
+
+
+FONTS_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'fonts'))
+SYSTEM_FONT_DIRS = [
+    '/usr/share/fonts/truetype/dejavu',
+]
+DEFAULT_FONT = 'default'
+
+Font = Union[ImageFont.FreeTypeFont, ImageFont.ImageFont]
+
+# FreeType font objects aren't safe to use from two threads at once, so each
+# thread (event loop, render and replay workers) keeps its own instances
+_local = threading.local()
+_sources: Dict[Tuple[Tuple[str, ...], int], str] = {}
+
+
+def _candidate_paths(face: str) -> List[str]:
+    return [os.path.join(directory, face) for directory in [FONTS_DIR, *SYSTEM_FONT_DIRS]]
+
+
+def get_font(faces: Union[str, Sequence[str]], size: int) -> Font:
+    """Load the first available face at `size`, cached per thread for the life of the process.
+
+    Faces are looked up in the repo's fonts/ directory first, then the system
+    font directories. Falls back to Pillow's built-in font if none load.
+    """
+    if isinstance(faces, str):
+        faces = (faces,)
+    key = (tuple(faces), size)
+
+    fonts = getattr(_local, 'fonts', None)
+    if fonts is None:
+        fonts = _local.fonts = {}
+    font = fonts.get(key)
+    if font is not None:
+        return font
+
+    for face in key[0]:
+        for path in _candidate_paths(face):
+            if not os.path.isfile(path):
+                continue
+            try:
+                font = ImageFont.truetype(path, size)
+            except OSError:
+                continue
+            fonts[key] = font
+            if face != key[0][0] and key not in _sources:
+                log.warning("Font %s unavailable, using fallback %s", key[0][0], path)
+            _sources[key] = path
+            return font
+
+    if key not in _sources:
+        log.warning("No font found for %s, using Pillow's default font", ', '.join(key[0]))
+    font = ImageFont.load_default()
+    fonts[key] = font
+    _sources[key] = DEFAULT_FONT
+    return font
+
+
+def font_sources() -> Dict[str, str]:
+    """Which file (or the default font) each requested face/size resolved to"""
+    return {f"{faces[0]}@{size}": source for (faces, size), source in _sources.items()}
@@ -1,9 +1,9 @@
 """Database-aware game manager that wraps core classes"""
 from typing import Optional, Dict, List, cast
-from .core import Player, AmongUsGame
+from .core import Player, AmongUsGame, generate_game_code
 from .database import GameDatabase
+from .eventlog import event_logs
 from .tasks import Task, generate_tasks_for_player
-import random
 
 
 class DatabasePlayer(Player):
@@ -58,8 +58,8 @@ class DatabasePlayer(Player):
 
 class DatabaseGame(AmongUsGame):
     
-    def __init__(self, db: GameDatabase, guild_id: int, channel_id: int, max_players: int = 10, impostors: int = 1, scientists: int = 0, engineers: int = 0, guardian_angels: int = 0):
-        super().__init__(guild_id, channel_id, max_players, impostors, scientists, engineers, guardian_angels)
+    def __init__(self, db: GameDatabase, guild_id: int, channel_id: int, max_players: int = 10, impostors: int = 1, scientists: int = 0, engineers: int = 0, guardian_angels: int = 0, seed: Optional[int] = None):
+        super().__init__(guild_id, channel_id, max_players, impostors, scientists, engineers, guardian_angels, seed)
         self.db = db
     
     async def save(self):
@@ -173,9 +173,9 @@ class DatabaseGame(AmongUsGame):
             if not available_roles:
                 available_roles = ['Crewmate']
 
-            assigned_role = random.choice(available_roles)
+            assigned_role = self.rng.choice(available_roles)
             dummy.assign_role(assigned_role)
-            dummy.assign_tasks()
+            dummy.assign_tasks(rng=self.rng)
 
             if assigned_role == 'Impostor':
                 if dummy_id not in self.impostors:
@@ -190,7 +190,7 @@ class DatabaseGame(AmongUsGame):
     
     async def assign_roles(self, impostor_count: int = 1, scientists: int = 0, engineers: int = 0, guardian_angels: int = 0):
         ids = list(self.players.keys())
-        random.shuffle(ids)
+        self.rng.shuffle(ids)
         impostor_count = min(impostor_count, max(1, len(ids) // 3))
         self.impostors = ids[:impostor_count]
         
@@ -200,7 +200,7 @@ class DatabaseGame(AmongUsGame):
         guardian_angels = min(guardian_angels, max_special - scientists - engineers)
         
         remaining_ids = [uid for uid in ids if uid not in self.impostors]
-        random.shuffle(remaining_ids)
+        self.rng.shuffle(remaining_ids)
         
         scientist_ids = remaining_ids[:scientists]
         engineer_ids = remaining_ids[scientists:scientists + engineers]
@@ -210,19 +210,19 @@ class DatabaseGame(AmongUsGame):
             db_player = cast(DatabasePlayer, player)
             if uid in self.impostors:
                 db_player.assign_role('Impostor')
-                db_player.assign_tasks()
+                db_player.assign_tasks(rng=self.rng)
             elif uid in scientist_ids:
                 db_player.assign_role('Scientist')
-                db_player.assign_tasks()
+                db_player.assign_tasks(rng=self.rng)
             elif uid in engineer_ids:
                 db_player.assign_role('Engineer')
-                db_player.assign_tasks()
+                db_player.assign_tasks(rng=self.rng)
             elif uid in guardian_angel_ids:
                 db_player.assign_role('Guardian Angel')
-                db_player.assign_tasks()
+                db_player.assign_tasks(rng=self.rng)
             else:
                 db_player.assign_role('Crewmate')
-                db_player.assign_tasks()
+                db_player.assign_tasks(rng=self.rng)
             
             await db_player.save()
             
@@ -234,14 +234,12 @@ class DatabaseGame(AmongUsGame):
     async def cast_vote(self, voter_id: int, target_id: int):  # type: ignore[override]
         """Cast a vote and save to database"""
         if voter_id in self.players and self.players[voter_id].alive:
-            self.votes[voter_id] = target_id
+            self._record_vote(voter_id, target_id)
             await self.db.cast_vote(self.channel_id, voter_id, target_id)
     
     async def clear_votes(self):  # type: ignore[override]
         """Clear all votes from game and database"""
-        self.votes = {}
-        for player in self.players.values():
-            player.voted_for = None
+        await super().clear_votes()
         await self.db.clear_votes(self.channel_id)
     
     @classmethod
@@ -256,7 +254,7 @@ class DatabaseGame(AmongUsGame):
         engineer_count = game_data.get('engineer_count', 0)
         guardian_angel_count = game_data.get('guardian_angel_count', 0)
         
-        game = cls(db, game_data['guild_id'], channel_id, game_data['max_players'], impostor_count, scientist_count, engineer_count, guardian_angel_count)
+        game = cls(db, game_data['guild_id'], channel_id, game_data['max_players'], impostor_count, scientist_count, engineer_count, guardian_angel_count, game_data.get('rng_seed'))
         game.phase = game_data['phase']
         game.game_code = game_data['game_code']
         game.min_players = game_data['min_players']
@@ -310,6 +308,12 @@ class DatabaseGame(AmongUsGame):
         
         # Load votes
         game.votes = await db.get_votes(channel_id)
+        game._rebuild_vote_counts()
+        
+        # A game reloaded mid-run catches up from its event log, then carries it on from a fresh snapshot
+        if game.phase not in ('lobby', 'ended'):
+            await event_logs.recover(game)
+            game.open_event_log()
         
         return game
 
@@ -321,11 +325,11 @@ class GameManager:
         self.db = db
         self._cache: Dict[int, DatabaseGame] = {}
     
-    async def create_game(self, guild_id: int, channel_id: int, game_code: str, max_players: int = 10, impostors: int = 1, scientists: int = 0, engineers: int = 0, guardian_angels: int = 0) -> DatabaseGame:
-        await self.db.create_game(channel_id, guild_id, game_code, max_players, impostors, scientists, engineers, guardian_angels)
+    async def create_game(self, guild_id: int, channel_id: int, game_code: Optional[str] = None, max_players: int = 10, impostors: int = 1, scientists: int = 0, engineers: int = 0, guardian_angels: int = 0, seed: Optional[int] = None) -> DatabaseGame:
+        game = DatabaseGame(self.db, guild_id, channel_id, max_players, impostors, scientists, engineers, guardian_angels, seed)
+        game.game_code = game_code or generate_game_code()
         
-        game = DatabaseGame(self.db, guild_id, channel_id, max_players, impostors, scientists, engineers, guardian_angels)
-        game.game_code = game_code
+        await self.db.create_game(channel_id, guild_id, game.game_code, max_players, impostors, scientists, engineers, guardian_angels, game.seed)
         
         self._cache[channel_id] = game
         
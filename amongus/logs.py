@@ -0,0 +1,128 @@
+"""Structured, queue-backed logging with per-game context"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+# Fields attached to every record logged from the current task (game code, channel, command)
+_log_context: ContextVar[Dict[str, Any]] = ContextVar('log_context', default={})
+
+CONTEXT_FIELDS = ('game', 'channel', 'command')
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_overrides: Dict[str, str] = {}
+
+
+def bind(**fields):
+    """Attach context fields to everything the current task logs from now on"""
+    _log_context.set({**_log_context.get(), **{k: v for k, v in fields.items() if v is not None}})
+
+
+def bind_game(game):
+    bind(**game.log_context())
+
+
+class _ContextFilter(logging.Filter):
+    """Runs in the emitting task before the record is queued, while its context var is still visible"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _log_context.get()
+        for field in CONTEXT_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, context.get(field))
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Like the stock prepare(), but the traceback stays out of the message so JSON output can keep it separate
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class StructuredFormatter(logging.Formatter):
+    """`time level logger [game=… channel=…] message`, or one JSON object per line"""
+
+    def __init__(self, as_json: bool = False):
+        super().__init__(datefmt='%Y-%m-%d %H:%M:%S')
+        self.as_json = as_json
+
+    def format(self, record: logging.LogRecord) -> str:
+        context = {field: getattr(record, field) for field in CONTEXT_FIELDS if getattr(record, field, None) is not None}
+        message = record.getMessage()
+
+        if self.as_json:
+            entry = {
+                'time': self.formatTime(record, self.datefmt),
+                'level': record.levelname,
+                'logger': record.name,
+                'message': message,
+                **context,
+            }
+            if record.exc_text:
+                entry['exception'] = record.exc_text
+            return json.dumps(entry, default=str)
+
+        line = f"{self.formatTime(record, self.datefmt)} {record.levelname:<7} {record.name}"
+        if context:
+            line += " [" + " ".join(f"{key}={value}" for key, value in context.items()) + "]"
+        line += f" {message}"
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+
+def setup_logging():
+    """Route all logging through a queue so callers never block on the terminal.
+
+    LOG_LEVEL sets the default level (INFO), LOG_LEVELS overrides modules
+    (`cogs.commands.game_loops=DEBUG,amongus.outbound=WARNING`) and
+    LOG_FORMAT=json switches to one JSON object per line.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(StructuredFormatter(as_json=os.getenv('LOG_FORMAT', '').lower() == 'json'))
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _QueueHandler(records)
+    handler.addFilter(_ContextFilter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+
+    for override in filter(None, (os.getenv('LOG_LEVELS') or '').split(',')):
+        module, _, level = override.partition('=')
+        set_level(module.strip(), level.strip())
+
+    _listener = logging.handlers.QueueListener(records, stream)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def set_level(module: str, level: str) -> str:
+    """Change a module's verbosity at runtime; returns the level name applied"""
+    level = level.upper()
+    if not isinstance(logging.getLevelName(level), int):
+        raise ValueError(f"Unknown log level '{level}'")
+    logging.getLogger(module or None).setLevel(level)
+    _overrides[module or 'root'] = level
+    return level
+
+
+def level_overrides() -> Dict[str, str]:
+    return dict(_overrides)
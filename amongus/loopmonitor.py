@@ -0,0 +1,194 @@
+"""Event-loop lag probe with stall attribution"""
+import asyncio
+import inspect
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from .metrics import dump_json
+
+log = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds; the last bucket catches everything slower
+LAG_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Installed packages can live inside the checkout (the README's .venv); they aren't repo code
+_THIRD_PARTY = tuple(os.sep + name + os.sep for name in ('.venv', 'venv', 'site-packages', 'dist-packages'))
+
+
+def _in_repo(path: str) -> bool:
+    return path.startswith(_REPO_ROOT) and not any(marker in path for marker in _THIRD_PARTY)
+
+
+def _attribute(frame) -> Tuple[str, str]:
+    """(cog, location) for a stack: the innermost repo frame, blamed on the nearest cog"""
+    cog = None
+    location = None
+    innermost = frame
+    while frame is not None:
+        path = frame.f_code.co_filename
+        if _in_repo(path):
+            relative = os.path.relpath(path, _REPO_ROOT)
+            if location is None:
+                location = f"{relative}:{frame.f_lineno} in {frame.f_code.co_name}"
+                if relative.startswith('amongus' + os.sep):
+                    cog = f"amongus.{os.path.splitext(os.path.basename(relative))[0]}"
+            if relative.startswith('cogs' + os.sep):
+                cog = os.path.splitext(os.path.basename(relative))[0]
+                break
+        frame = frame.f_back
+
+    if location is None:
+        location = f"{innermost.f_code.co_filename}:{innermost.f_lineno} in {innermost.f_code.co_name}"
+    return cog or 'other', location
+
+
+def _running_coroutine(frame) -> Optional[str]:
+    """Qualified name of the outermost coroutine on a stack, i.e. the one its task is running.
+
+    Read from the sampled frames rather than asyncio.current_task(), which
+    isn't safe to call from outside the loop's thread.
+    """
+    name = None
+    while frame is not None:
+        if frame.f_code.co_flags & inspect.CO_COROUTINE:
+            name = getattr(frame.f_code, 'co_qualname', frame.f_code.co_name)  # co_qualname is 3.11+
+        frame = frame.f_back
+    return name
+
+
+class LoopMonitor:
+    """Measures how late the event loop runs a periodic sleep, continuously.
+
+    A watchdog thread notices when the loop stops responding for longer than
+    `threshold` and snapshots the loop thread's stack while it's still stuck,
+    so each stall is blamed on the code that caused it rather than on
+    whatever happened to run next.
+    """
+
+    def __init__(self, interval: float = 0.25, threshold: float = 0.1, dump_every: float = 60.0):
+        self.interval = interval
+        self.threshold = threshold
+        self.dump_every = dump_every
+
+        self.histogram = [0] * (len(LAG_BUCKETS_MS) + 1)
+        self.metrics = {'probes': 0, 'stalls': 0, 'max_lag_ms': 0.0, 'total_lag_ms': 0.0}
+        self.stalls_by_cog: Dict[str, Dict[str, float]] = {}
+        self.recent_stalls = deque(maxlen=20)
+
+        self._heartbeat = time.monotonic()
+        self._capture: Optional[dict] = None  # Stack taken by the watchdog during the current stall
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._probe_task: Optional[asyncio.Task] = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        if self._probe_task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._probe_task = self._loop.create_task(self._probe(), name='loop_monitor')
+        threading.Thread(target=self._watch, name='loop-watchdog', daemon=True).start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
+
+    async def _probe(self):
+        last_dump = time.monotonic()
+        while True:
+            started = time.monotonic()
+            self._heartbeat = started
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            self._record(max(0.0, now - started - self.interval))
+
+            if now - last_dump >= self.dump_every:
+                last_dump = now
+                try:
+                    dump_json('loop_lag.json', self.snapshot())
+                except OSError as e:
+                    log.warning("Could not write loop lag metrics: %s", e)
+
+    def _watch(self):
+        while not self._stopped.wait(min(self.interval, self.threshold) / 2):
+            if time.monotonic() - self._heartbeat - self.interval < self.threshold:
+                continue
+            with self._lock:
+                if self._capture is not None:
+                    continue
+
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+
+            cog, location = _attribute(frame)
+            capture = {
+                'cog': cog,
+                'where': location,
+                'task': _running_coroutine(frame),
+                'stack': traceback.format_stack(frame)[-8:],
+            }
+            del frame
+            with self._lock:
+                self._capture = capture
+
+    def _record(self, lag: float):
+        lag_ms = lag * 1000
+        self.histogram[bisect_left(LAG_BUCKETS_MS, lag_ms)] += 1
+        self.metrics['probes'] += 1
+        self.metrics['total_lag_ms'] += lag_ms
+        self.metrics['max_lag_ms'] = max(self.metrics['max_lag_ms'], lag_ms)
+
+        with self._lock:
+            capture, self._capture = self._capture, None
+        if lag < self.threshold:
+            return
+
+        # The watchdog polls, so a stall just over the threshold can end before it looks
+        capture = capture or {'cog': 'unattributed', 'where': None, 'task': None, 'stack': []}
+        self.metrics['stalls'] += 1
+        stats = self.stalls_by_cog.setdefault(capture['cog'], {'count': 0, 'seconds': 0.0})
+        stats['count'] += 1
+        stats['seconds'] += lag
+        self.recent_stalls.append({'at': time.time(), 'lag_ms': round(lag_ms, 1), **capture})
+
+    def lag_percentile(self, fraction: float) -> float:
+        """Upper bound (ms) of the bucket holding the given percentile; inf if past the last bucket"""
+        total = sum(self.histogram)
+        if not total:
+            return 0.0
+        seen = 0
+        for bound, count in zip(LAG_BUCKETS_MS + (float('inf'),), self.histogram):
+            seen += count
+            if seen >= fraction * total:
+                return bound
+        return float('inf')
+
+    def snapshot(self) -> dict:
+        labels = [f"<={bound}ms" for bound in LAG_BUCKETS_MS] + [f">{LAG_BUCKETS_MS[-1]}ms"]
+        return {
+            'interval_s': self.interval,
+            'threshold_ms': self.threshold * 1000,
+            'metrics': dict(self.metrics),
+            'histogram': dict(zip(labels, self.histogram)),
+            'stalls_by_cog': self.stalls_by_cog,
+            'recent_stalls': list(self.recent_stalls),
+        }
+
+
+loop_monitor = LoopMonitor()
@@ -1,8 +1,44 @@
 from PIL import Image, ImageDraw, ImageFont
 from io import BytesIO
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+import copy
 import random
 
+from .encoding import encode_image, profile_name
+from .fonts import get_font
+
+
+NEIGHBORHOOD_HOPS = 2
+
+# Renderers draw the starfield from their own generator so they never touch a game's RNG
+STAR_SEED = 42
+
+# Vent connections network (rooms that can be connected via vents)
+VENT_CONNECTIONS = {
+    "Cafeteria": ["Admin", "MedBay"],
+    "Upper Engine": ["Reactor", "Security"],
+    "Reactor": ["Upper Engine", "Security", "Electrical"],
+    "Security": ["Upper Engine", "Reactor", "Electrical", "Lower Engine", "Storage"],
+    "Lower Engine": ["Security", "Electrical"],
+    "Electrical": ["Security", "MedBay", "Reactor", "Lower Engine"],
+    "MedBay": ["Electrical", "Cafeteria"],
+    "Admin": ["Cafeteria", "O2"],
+    "O2": ["Admin", "Nav", "Shields"],
+    "Nav": ["O2", "Shields"],
+    "Shields": ["O2", "Nav", "Communications"],
+    "Storage": ["Admin", "Communications", "Security"],
+    "Communications": ["Shields", "Storage"],
+}
+
+# Encoded vent maps keyed by (layout geometry, highlighted vent, encoder profile)
+_vent_map_cache: Dict[Tuple, bytes] = {}
+
+
+def clear_caches():
+    """Drop the encoded vent map variants"""
+    _vent_map_cache.clear()
+
 
 class Room:
     def __init__(
@@ -57,7 +93,12 @@ class Room:
 class MapLayout:
     def __init__(self):
         self.rooms: Dict[str, Room] = {}
+        self.neighborhoods: Dict[str, Tuple[FrozenSet[str], ...]] = {}
+        self.vent_connections: Dict[str, List[str]] = {
+            room: list(destinations) for room, destinations in VENT_CONNECTIONS.items()
+        }
         self._initialize_skeld_map()
+        self.build_neighborhoods()
 
     def _initialize_skeld_map(self):
         room_definitions = [
@@ -83,6 +124,77 @@ class MapLayout:
             room = Room(name, x, y, w, h, connections, has_tasks, tasks, can_vent)
             self.rooms[name] = room
 
+    def build_neighborhoods(self, max_hops: int = NEIGHBORHOOD_HOPS):
+        """Precompute the rooms within 0..max_hops moves of every room.
+
+        Call again after changing room connections.
+        """
+        self.neighborhoods = {}
+        for name in self.rooms:
+            reached = {name}
+            frontier = [name]
+            layers = [frozenset(reached)]
+            for _ in range(max_hops):
+                next_frontier = []
+                for current in frontier:
+                    room = self.rooms.get(current)
+                    if not room:
+                        continue
+                    for neighbor in room.connected_rooms:
+                        if neighbor not in reached:
+                            reached.add(neighbor)
+                            next_frontier.append(neighbor)
+                frontier = next_frontier
+                layers.append(frozenset(reached))
+            self.neighborhoods[name] = tuple(layers)
+
+    def get_neighborhood(self, room_name: str, hops: int = NEIGHBORHOOD_HOPS) -> FrozenSet[str]:
+        """Rooms reachable from room_name in at most `hops` moves (including itself)"""
+        layers = self.neighborhoods.get(room_name)
+        if not layers:
+            return frozenset()
+        return layers[min(hops, len(layers) - 1)]
+
+    def get_vent_destinations(self, room_name: str) -> List[str]:
+        """Rooms reachable through the vent in `room_name` that have vents themselves"""
+        destinations = []
+        for destination in self.vent_connections.get(room_name, []):
+            room = self.rooms.get(destination)
+            if room and room.can_vent:
+                destinations.append(destination)
+        return destinations
+
+    def geometry_key(self) -> Tuple:
+        """Hashable summary of everything the map images depend on (not bodies)"""
+        rooms = tuple(
+            (r.name, r.x, r.y, r.width, r.height, r.can_vent, tuple(r.connected_rooms))
+            for r in self.rooms.values()
+        )
+        vents = tuple((room, tuple(dests)) for room, dests in self.vent_connections.items())
+        return (rooms, vents)
+
+    def snapshot(self) -> 'MapLayout':
+        """Read-only copy for renderers running off the event loop.
+
+        The game keeps moving bodies and rewiring rooms while a render is
+        queued, so the render pool draws from this copy instead of the live
+        layout. Room lists become tuples and the dicts become read-only views.
+        """
+        frozen = copy.copy(self)
+        rooms = {}
+        for name, room in self.rooms.items():
+            room = copy.copy(room)
+            room.connected_rooms = tuple(room.connected_rooms)
+            room.task_list = tuple(room.task_list)
+            room.bodies = tuple(room.bodies)
+            rooms[name] = room
+        frozen.rooms = MappingProxyType(rooms)
+        frozen.neighborhoods = MappingProxyType(dict(self.neighborhoods))
+        frozen.vent_connections = MappingProxyType(
+            {room: tuple(destinations) for room, destinations in self.vent_connections.items()}
+        )
+        return frozen
+
     def get_room(self, room_name: str) -> Optional[Room]:
         return self.rooms.get(room_name)
 
@@ -119,14 +231,15 @@ class MapRenderer:
         self.sabotage_color = (220, 50, 50)
         self.text_color = (255, 255, 255)
         self.connection_color = (80, 80, 100)
+        self.font = get_font(("DejaVuSans-Bold.ttf", "Helvetica-Bold.ttf"), 19)
 
     def _draw_stars(self, draw: ImageDraw.ImageDraw):
-        random.seed(42)
+        rng = random.Random(STAR_SEED)
         for _ in range(120):
-            x = random.randint(0, self.width)
-            y = random.randint(0, self.height)
-            size = random.choice([1, 1, 1, 2, 3])
-            brightness = random.randint(180, 255)
+            x = rng.randint(0, self.width)
+            y = rng.randint(0, self.height)
+            size = rng.choice([1, 1, 1, 2, 3])
+            brightness = rng.randint(180, 255)
             color = (brightness, brightness, brightness)
             if size == 1:
                 draw.point((x, y), fill=color)
@@ -248,13 +361,8 @@ class MapRenderer:
         
         draw.line([(center_x - 3, center_y + 3), (center_x + 3, center_y + 3)], fill=(0, 0, 0), width=2)
 
-    def render(
-        self,
-        player_room: Optional[str] = None,
-        sabotaged_rooms: Optional[List[str]] = None,
-    ) -> BytesIO:
-        sabotaged_rooms = sabotaged_rooms or []
-        
+    def _render_base(self, sabotaged_rooms: Sequence[str]) -> Image.Image:
+        """Everything except the player's room highlight"""
         img = Image.new('RGB', (self.width, self.height), self.bg_color)
         draw = ImageDraw.Draw(img)
         
@@ -262,26 +370,48 @@ class MapRenderer:
         
         self._draw_connections(draw)
         
-        try:
-            font = ImageFont.truetype("../fonts/DejaVuSans-Bold.ttf", 19)
-        except:
-            try:
-                font = ImageFont.truetype("../fonts/Helvetica-Bold.ttf", 19)
-            except:
-                font = ImageFont.load_default()
-        
         for room in self.map_layout.rooms.values():
-            is_player = room.name == player_room
             is_sabotaged = room.name in sabotaged_rooms
-            self._draw_room(draw, room, is_player, is_sabotaged)
+            self._draw_room(draw, room, False, is_sabotaged)
         
         for room in self.map_layout.rooms.values():
-            self._draw_room_label(draw, room, font)
+            self._draw_room_label(draw, room, self.font)
         
-        buffer = BytesIO()
-        img.save(buffer, format='PNG')
-        buffer.seek(0)
-        return buffer
+        return img
+
+    def _render_variant(self, base: Image.Image, player_room: Optional[str]) -> BytesIO:
+        room = self.map_layout.get_room(player_room) if player_room else None
+        if room is None:
+            return encode_image(base, 'map')
+        
+        # Rooms don't overlap, so repainting one room and its label over the base
+        # gives the same pixels as drawing it highlighted in the first place
+        img = base.copy()
+        draw = ImageDraw.Draw(img)
+        self._draw_room(draw, room, True, False)
+        self._draw_room_label(draw, room, self.font)
+        return encode_image(img, 'map')
+
+    def render(
+        self,
+        player_room: Optional[str] = None,
+        sabotaged_rooms: Optional[Sequence[str]] = None,
+    ) -> BytesIO:
+        base = self._render_base(sabotaged_rooms or ())
+        return self._render_variant(base, player_room)
+
+    def render_many(
+        self,
+        player_rooms: Iterable[Optional[str]],
+        sabotaged_rooms: Optional[Sequence[str]] = None,
+    ) -> Dict[Optional[str], BytesIO]:
+        """Render one map per distinct player room, sharing a single base pass.
+
+        Returns {room: buffer}; players in the same room share a buffer, so
+        read it with getvalue() rather than consuming it.
+        """
+        base = self._render_base(sabotaged_rooms or ())
+        return {room: self._render_variant(base, room) for room in dict.fromkeys(player_rooms)}
 
 
 class VentMapRenderer:
@@ -296,30 +426,16 @@ class VentMapRenderer:
         self.vent_border = (100, 100, 120)
         self.connection_color = (80, 255, 80)
         
-        # Vent connections network (rooms that can be connected via vents)
-        self.vent_connections = {
-            "Cafeteria": ["Admin", "MedBay"],
-            "Upper Engine": ["Reactor", "Security"],
-            "Reactor": ["Upper Engine", "Security", "Electrical"],
-            "Security": ["Upper Engine", "Reactor", "Electrical", "Lower Engine", "Storage"],
-            "Lower Engine": ["Security", "Electrical"],
-            "Electrical": ["Security", "MedBay", "Reactor", "Lower Engine"],
-            "MedBay": ["Electrical", "Cafeteria"],
-            "Admin": ["Cafeteria", "O2"],
-            "O2": ["Admin", "Nav", "Shields"],
-            "Nav": ["O2", "Shields"],
-            "Shields": ["O2", "Nav", "Communications"],
-            "Storage": ["Admin", "Communications", "Security"],
-            "Communications": ["Shields", "Storage"],
-        }
+        self.vent_connections = map_layout.vent_connections
+        self.font = get_font(("DejaVuSans-Bold.ttf", "Helvetica-Bold.ttf"), 18)
 
     def _draw_stars(self, draw: ImageDraw.ImageDraw):
         """Draw background stars"""
-        random.seed(42)
+        rng = random.Random(STAR_SEED)
         for _ in range(100):
-            x = random.randint(0, self.width)
-            y = random.randint(0, self.height)
-            size = random.randint(1, 2)
+            x = rng.randint(0, self.width)
+            y = rng.randint(0, self.height)
+            size = rng.randint(1, 2)
             draw.ellipse([x, y, x + size, y + size], fill=(200, 200, 220))
 
     def _draw_vent_connections(self, draw: ImageDraw.ImageDraw):
@@ -390,42 +506,53 @@ class VentMapRenderer:
         # Draw main text
         draw.text((text_x, text_y), text, font=font, fill=(255, 255, 255))
 
-    def render(self, player_vent: Optional[str] = None) -> BytesIO:
-        """Render the vent map"""
+    def _render_base(self) -> Image.Image:
+        """The vent map with no vent highlighted"""
         img = Image.new('RGB', (self.width, self.height), self.bg_color)
         draw = ImageDraw.Draw(img)
         
         self._draw_stars(draw)
         self._draw_vent_connections(draw)
         
-        try:
-            font = ImageFont.truetype("fonts/DejaVuSans-Bold.ttf", 18)
-        except:
-            try:
-                font = ImageFont.truetype("fonts/Helvetica-Bold.ttf", 18)
-            except:
-                font = ImageFont.load_default()
-        
         # Draw all vents
         for room in self.map_layout.rooms.values():
             if room.can_vent:
-                is_player = room.name == player_vent
-                self._draw_vent(draw, room, is_player)
+                self._draw_vent(draw, room, False)
         
         # Draw vent labels
         for room in self.map_layout.rooms.values():
             if room.can_vent:
-                self._draw_vent_label(draw, room, font)
+                self._draw_vent_label(draw, room, self.font)
         
-        buffer = BytesIO()
-        img.save(buffer, format='PNG')
-        buffer.seek(0)
-        return buffer
+        return img
+
+    def render(self, player_vent: Optional[str] = None) -> BytesIO:
+        """Render the vent map, reusing encoded variants rendered earlier"""
+        room = self.map_layout.get_room(player_vent) if player_vent else None
+        if not room or not room.can_vent:
+            player_vent = None
+        
+        key = (self.map_layout.geometry_key(), player_vent, profile_name('map'))
+        cached = _vent_map_cache.get(key)
+        if cached is None:
+            cached = self._render_variant(player_vent).getvalue()
+            _vent_map_cache[key] = cached
+        return BytesIO(cached)
+
+    def _render_variant(self, player_vent: Optional[str]) -> BytesIO:
+        img = self._render_base()
+        if player_vent:
+            # Repaint the highlighted vent and its label over the plain one
+            room = self.map_layout.rooms[player_vent]
+            draw = ImageDraw.Draw(img)
+            self._draw_vent(draw, room, True)
+            self._draw_vent_label(draw, room, self.font)
+        return encode_image(img, 'map')
 
 
 def create_map_image(
     player_room: Optional[str] = None,
-    sabotaged_rooms: Optional[List[str]] = None,
+    sabotaged_rooms: Optional[Sequence[str]] = None,
     map_layout: Optional[MapLayout] = None,
 ) -> BytesIO:
     if map_layout is None:
@@ -435,6 +562,19 @@ def create_map_image(
     return renderer.render(player_room, sabotaged_rooms)
 
 
+def create_map_images(
+    player_rooms: Iterable[Optional[str]],
+    sabotaged_rooms: Optional[Sequence[str]] = None,
+    map_layout: Optional[MapLayout] = None,
+) -> Dict[Optional[str], BytesIO]:
+    """Render a map for each distinct room in `player_rooms` in one batch"""
+    if map_layout is None:
+        map_layout = MapLayout()
+    
+    renderer = MapRenderer(map_layout)
+    return renderer.render_many(player_rooms, sabotaged_rooms)
+
+
 def create_vent_map_image(
     player_vent: Optional[str] = None,
     map_layout: Optional[MapLayout] = None,
@@ -0,0 +1,121 @@
+"""tracemalloc-based heap inspection for long-running processes"""
+import asyncio
+import gc
+import os
+import time
+import tracemalloc
+from typing import Dict, Optional
+
+from discord import ui
+
+from .metrics import metrics_path
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Allocations made by the inspector itself would otherwise top every diff
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+class MemoryInspector:
+    """Diffs tracemalloc snapshots between calls and counts live game objects.
+
+    Tracing only runs between start() and stop(); it slows allocation
+    noticeably, so it's off by default.
+    """
+
+    def __init__(self, frames: int = 1):
+        self.frames = frames
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._previous_at = 0.0
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self._previous = self._take()
+
+    def stop(self):
+        tracemalloc.stop()
+        self._previous = None
+
+    def _take(self) -> tracemalloc.Snapshot:
+        self._previous_at = time.monotonic()
+        return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+    async def diff(self, group_by: str = 'lineno', top: int = 10) -> dict:
+        """Growth since the previous diff (or start), grouped by 'lineno' or 'filename'"""
+        if self._previous is None:
+            self.start()
+        elapsed = time.monotonic() - self._previous_at
+        previous, current = self._previous, self._take()
+        self._previous = current
+
+        # Comparing large snapshots takes a while; keep it off the event loop
+        stats = await asyncio.to_thread(current.compare_to, previous, group_by)
+        traced, peak = tracemalloc.get_traced_memory()
+        return {
+            'elapsed': elapsed,
+            'traced': traced,
+            'peak': peak,
+            'top': [stat for stat in stats if stat.size_diff][:top],
+        }
+
+    async def dump(self) -> str:
+        """Write a snapshot for offline analysis with tracemalloc.Snapshot.load()"""
+        if not tracemalloc.is_tracing():
+            self.start()
+        snapshot = self._take()
+        path = metrics_path(f"heap-{time.strftime('%Y%m%d-%H%M%S')}.tracemalloc")
+        await asyncio.to_thread(snapshot.dump, path)
+        return path
+
+
+async def live_instances(active_games=()) -> Dict[str, int]:
+    """Count game objects still on the heap. Ended or unregistered games that
+    survive a collection are being kept alive by something."""
+    active = set(map(id, active_games))  # Read the registry here; the game dict changes under the loop
+    # A full collection and heap walk can take a while on a big heap; keep it off the event loop.
+    # gc.collect() itself still holds the GIL while it runs.
+    return await asyncio.to_thread(_count_instances, active)
+
+
+def _count_instances(active) -> Dict[str, int]:
+    from .card_generator import _avatar_circles
+    from .core import AmongUsGame, Player
+    from .tasks import Task
+
+    gc.collect()
+    counts = {'AmongUsGame': 0, 'ended or orphaned games': 0, 'Player': 0, 'Task': 0, 'View': 0}
+    for obj in gc.get_objects():
+        if isinstance(obj, AmongUsGame):
+            counts['AmongUsGame'] += 1
+            if obj.phase == 'ended' or id(obj) not in active:
+                counts['ended or orphaned games'] += 1
+        elif isinstance(obj, Player):
+            counts['Player'] += 1
+        elif isinstance(obj, Task):
+            counts['Task'] += 1
+        elif isinstance(obj, ui.View):
+            counts['View'] += 1
+    counts['cached avatars'] = len(_avatar_circles)
+    return counts
+
+
+def describe_stat(stat: tracemalloc.StatisticDiff) -> str:
+    frame = stat.traceback[0]
+    filename = frame.filename
+    if filename.startswith(_REPO_ROOT):
+        filename = os.path.relpath(filename, _REPO_ROOT)
+    location = f"{filename}:{frame.lineno}" if frame.lineno else filename  # No line when grouped by file
+    return f"{stat.size_diff / 1024:+.1f} KiB ({stat.count_diff:+} blocks) {location}"
+
+
+memory_inspector = MemoryInspector()
@@ -0,0 +1,25 @@
+"""Local metrics dumps"""
+import json
+import os
+from typing import Any
+
+
+def metrics_dir() -> str:
+    """Directory for metrics dumps and captures (METRICS_DIR, default ./metrics)"""
+    path = os.getenv('METRICS_DIR') or 'metrics'
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def metrics_path(filename: str) -> str:
+    return os.path.join(metrics_dir(), filename)
+
+
+def dump_json(filename: str, data: Any) -> str:
+    """Write `data` atomically so readers never see a half-written file"""
+    path = metrics_path(filename)
+    partial = f"{path}.tmp"
+    with open(partial, 'w') as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(partial, path)
+    return path
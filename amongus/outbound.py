@@ -0,0 +1,180 @@
+"""Rate-limit-aware outbound message queue for game channels"""
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, Dict, Optional
+
+import discord
+
+from .commandstats import timed
+
+log = logging.getLogger(__name__)
+
+MAX_MESSAGE_LENGTH = 2000
+COALESCE_WINDOW = 1.5  # Seconds to collect chatter lines before sending them as one message
+BUCKET_CAPACITY = 5  # Discord allows roughly 5 messages per 5 seconds per channel
+BUCKET_PERIOD = 5.0
+MAX_PENDING_LINES = 40
+MAX_SEND_ATTEMPTS = 3
+RESERVED_TOKENS = 1  # Bucket tokens low-priority flushes leave for important messages
+
+
+def retry_after(error: discord.HTTPException) -> float:
+    """Seconds to wait before retrying a 429, read from the response headers"""
+    headers = getattr(error.response, 'headers', None) or {}
+    try:
+        return max(float(headers.get('Retry-After', 1.0)), 0.0)
+    except (TypeError, ValueError):
+        return 1.0
+
+
+class _ChannelQueue:
+    def __init__(self, channel: discord.abc.Messageable, capacity: int):
+        self.channel = channel
+        self.pending: Deque[str] = deque()
+        self.lock = asyncio.Lock()
+        self.tokens = float(capacity)
+        self.updated: Optional[float] = None
+        self.flush_task: Optional[asyncio.Task] = None
+
+
+class OutboundMessenger:
+    """Per-channel outbound queue.
+
+    Low-priority lines (task completions, bot votes) are posted with `post()` and
+    coalesced into a single message per window. Important messages go through
+    `send()`, which skips the window: pending lines are flushed first so the
+    channel still reads in order, then the message is sent. Both paths share a
+    per-channel token bucket, but flushes leave `RESERVED_TOKENS` in it so
+    chatter can never use up the budget an important message needs. Both back
+    off on 429s using Retry-After.
+    """
+
+    def __init__(
+        self,
+        coalesce_window: float = COALESCE_WINDOW,
+        bucket_capacity: int = BUCKET_CAPACITY,
+        bucket_period: float = BUCKET_PERIOD,
+        max_pending: int = MAX_PENDING_LINES,
+    ):
+        self.coalesce_window = coalesce_window
+        self.bucket_capacity = bucket_capacity
+        self.refill_rate = bucket_capacity / bucket_period
+        self.max_pending = max_pending
+        self._queues: Dict[int, _ChannelQueue] = {}
+        self.metrics = {
+            'messages_sent': 0,
+            'lines_posted': 0,
+            'lines_coalesced': 0,
+            'lines_dropped': 0,
+            'sends_delayed': 0,
+            'delay_seconds': 0.0,
+            'rate_limited': 0,
+            'send_failures': 0,
+        }
+
+    def _queue(self, channel: discord.abc.Messageable) -> _ChannelQueue:
+        channel_id = getattr(channel, 'id', id(channel))
+        queue = self._queues.get(channel_id)
+        if queue is None:
+            queue = _ChannelQueue(channel, self.bucket_capacity)
+            self._queues[channel_id] = queue
+        return queue
+
+    def post(self, channel: discord.abc.Messageable, line: str):
+        """Queue a low-priority line; it is sent with other lines after the coalesce window"""
+        queue = self._queue(channel)
+        if len(queue.pending) >= self.max_pending:
+            queue.pending.popleft()
+            self.metrics['lines_dropped'] += 1
+        queue.pending.append(line)
+        self.metrics['lines_posted'] += 1
+
+        if queue.flush_task is None or queue.flush_task.done():
+            queue.flush_task = asyncio.create_task(self._flush_later(queue))
+
+    @timed('http')
+    async def send(self, channel: discord.abc.Messageable, content: Optional[str] = None, **kwargs):
+        """Send an important message now, ahead of the coalesce window. Raises like channel.send."""
+        queue = self._queue(channel)
+        async with queue.lock:
+            await self._flush(queue)
+            return await self._deliver(queue, content, **kwargs)
+
+    def forget(self, channel_id: int):
+        """Drop queue state for a channel whose game has ended"""
+        queue = self._queues.pop(channel_id, None)
+        if queue and queue.flush_task and not queue.flush_task.done() and not queue.pending:
+            queue.flush_task.cancel()
+
+    def pending_lines(self) -> int:
+        return sum(len(queue.pending) for queue in self._queues.values())
+
+    async def _flush_later(self, queue: _ChannelQueue):
+        await asyncio.sleep(self.coalesce_window)
+        async with queue.lock:
+            await self._flush(queue)
+
+    async def _flush(self, queue: _ChannelQueue):
+        """Send all pending lines, packed into as few messages as possible (lock held)"""
+        while queue.pending:
+            lines = [queue.pending.popleft()[:MAX_MESSAGE_LENGTH]]
+            size = len(lines[0])
+            while queue.pending and size + 1 + len(queue.pending[0]) <= MAX_MESSAGE_LENGTH:
+                line = queue.pending.popleft()
+                lines.append(line)
+                size += 1 + len(line)
+
+            self.metrics['lines_coalesced'] += len(lines) - 1
+            try:
+                await self._deliver(queue, "\n".join(lines), reserve=min(RESERVED_TOKENS, self.bucket_capacity - 1))
+            except discord.HTTPException as e:
+                self.metrics['lines_dropped'] += len(lines)
+                log.warning("Dropped %d queued lines for channel %s: %s",
+                            len(lines), getattr(queue.channel, 'id', '?'), e)
+
+    async def _take_token(self, queue: _ChannelQueue, reserve: int = 0):
+        """Take one token, waiting until `reserve` more would still be left afterwards"""
+        loop = asyncio.get_running_loop()
+        delayed = False
+        while True:
+            now = loop.time()
+            if queue.updated is not None:
+                queue.tokens = min(self.bucket_capacity, queue.tokens + (now - queue.updated) * self.refill_rate)
+            queue.updated = now
+
+            if queue.tokens >= 1 + reserve:
+                queue.tokens -= 1
+                return
+
+            wait = (1 + reserve - queue.tokens) / self.refill_rate
+            if not delayed:
+                self.metrics['sends_delayed'] += 1
+                delayed = True
+            self.metrics['delay_seconds'] += wait
+            await asyncio.sleep(wait)
+
+    async def _deliver(self, queue: _ChannelQueue, content: Optional[str] = None, reserve: int = 0, **kwargs):
+        await self._take_token(queue, reserve)
+
+        for attempt in range(MAX_SEND_ATTEMPTS):
+            try:
+                message = await queue.channel.send(content, **kwargs)
+                self.metrics['messages_sent'] += 1
+                return message
+            except discord.HTTPException as e:
+                if e.status != 429 or attempt == MAX_SEND_ATTEMPTS - 1:
+                    self.metrics['send_failures'] += 1
+                    raise
+
+                self.metrics['rate_limited'] += 1
+                wait = retry_after(e)
+                self.metrics['delay_seconds'] += wait
+                await asyncio.sleep(wait)
+
+                for file in [kwargs.get('file'), *(kwargs.get('files') or ())]:
+                    if file is not None:
+                        file.reset()
+
+
+outbound = OutboundMessenger()
@@ -0,0 +1,81 @@
+"""On-demand cProfile captures of the running bot"""
+import asyncio
+import cProfile
+import os
+import pstats
+import time
+from typing import List, NamedTuple, Tuple
+
+from .metrics import metrics_path
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_ASYNCIO_DIR = os.path.dirname(asyncio.__file__)
+
+
+class ProfileRow(NamedTuple):
+    cumulative: float
+    own: float
+    calls: int
+    where: str
+
+
+class ProfilerBusy(RuntimeError):
+    """Only one capture can run at a time"""
+
+
+_capturing = False
+
+
+def _describe(key: Tuple[str, int, str]) -> str:
+    filename, line, function = key
+    if filename == '~':  # Built-ins have no file
+        return function
+    if filename.startswith(_REPO_ROOT):
+        filename = os.path.relpath(filename, _REPO_ROOT)
+    else:
+        filename = os.path.basename(filename)
+    return f"{filename}:{line} {function}"
+
+
+async def capture_profile(seconds: float, top: int = 15) -> Tuple[str, List[ProfileRow]]:
+    """Profile the event loop thread for `seconds`, covering every task that runs meanwhile.
+
+    Returns the .prof path (open it with pstats or snakeviz) and the top
+    functions by cumulative time. Renders in the executor thread aren't seen.
+    """
+    global _capturing
+    if _capturing:
+        raise ProfilerBusy("A profile capture is already running")
+
+    _capturing = True
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.disable()
+    finally:
+        _capturing = False
+
+    path = metrics_path(f"profile-{time.strftime('%Y%m%d-%H%M%S')}.prof")
+    profiler.dump_stats(path)
+
+    stats = pstats.Stats(profiler).stats
+    ordered = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+    rows = [
+        ProfileRow(cumulative, own, calls, _describe(key))
+        for key, (_, calls, own, cumulative, _) in ordered
+        if not _is_loop_plumbing(key)
+    ]
+    return path, rows[:top]
+
+
+def _is_loop_plumbing(key: Tuple[str, int, str]) -> bool:
+    """Event loop internals top every cumulative listing without saying anything useful"""
+    filename, _, function = key
+    return (
+        filename.startswith(_ASYNCIO_DIR)
+        or function == "<method 'run' of '_contextvars.Context' objects>"
+        or function == 'capture_profile'
+    )
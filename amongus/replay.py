@@ -0,0 +1,371 @@
+"""Animated replays of finished games, rendered from their event logs.
+
+The static map is drawn once and quantized to a fixed palette. Each frame
+repaints only the rooms whose occupants, bodies or sabotage changed, and
+only the pixels that actually changed are encoded: the frame is cropped
+to them and everything unchanged inside the crop is transparent.
+"""
+import asyncio
+import logging
+import os
+import struct
+import sys
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+import discord
+from PIL import Image, ImageChops, ImageDraw
+from PIL.GifImagePlugin import getdata, getheader
+
+from .constants import PLAYER_COLORS
+from .encoding import encode_image
+from .eventlog import EventKind, event_logs, replay
+from .fonts import get_font
+from .map_renderer import MapLayout, MapRenderer
+from .outbound import outbound
+from .singleflight import render_image_sync
+
+log = logging.getLogger(__name__)
+
+# Sabotage names map onto the room that has to be fixed
+SABOTAGE_ROOMS = {'o2': 'O2', 'electrical': 'Electrical', 'reactor': 'Reactor', 'communications': 'Communications'}
+
+FRAME_MS = 250
+HOLD_MS = {EventKind.KILL: 1200, EventKind.EJECT: 1500, EventKind.PHASE: 1000, EventKind.SABOTAGE: 800}
+MARKER_RADIUS = 7
+CAPTION_BOX = (700, 540, 915, 592)  # Empty space below Shields, clear of every room
+BASE_COLORS = 224  # Palette entries for the static map; the rest are reserved for overlays
+TRANSPARENT = 255  # Never drawn; marks pixels a frame leaves unchanged
+
+
+class ReplayFrame(NamedTuple):
+    t: float                                   # Seconds since the recording started
+    kind: EventKind                            # Event that produced the frame, for its hold time
+    phase: str
+    sabotage: Optional[str]
+    players: Tuple[Tuple[int, str, str], ...]  # (user_id, color, room) for every living player
+    bodies: Tuple[Tuple[str, str], ...]        # (room, victim color)
+
+
+def timeline(log_path: str, step: float = 1.0) -> List[ReplayFrame]:
+    """Visible states of a recorded game, one per change.
+
+    Moves closer together than `step` seconds are merged into one frame;
+    kills, ejections, sabotages and phase changes always get their own.
+    """
+    frames: List[ReplayFrame] = []
+    segment_start = 0.0
+    first: Optional[float] = None
+    merge = False
+    for event, state in replay(log_path):
+        if event.kind is EventKind.SNAPSHOT:
+            segment_start = state['wall_time'] - event.t_ms / 1000
+        now = segment_start + event.t_ms / 1000
+        if first is None:
+            first = now
+
+        players = state['players']
+        colors = {player['name']: player['color'] for player in players.values()}
+        frame = ReplayFrame(
+            now - first,
+            event.kind,
+            state['phase'],
+            state['sabotage'],
+            tuple(
+                (int(user_id), player['color'], player['location'])
+                for user_id, player in sorted(players.items(), key=lambda item: int(item[0]))
+                if player['alive']
+            ),
+            tuple((room, colors.get(name, '#FFFFFF')) for room, names in sorted(state['bodies'].items()) for name in names),
+        )
+        if frames and frame[2:] == frames[-1][2:]:
+            continue
+        if merge and frame.kind is EventKind.MOVE and frame.t - frames[-1].t < step:
+            frames[-1] = frame._replace(t=frames[-1].t)
+            continue
+        frames.append(frame)
+        merge = frame.kind is EventKind.MOVE
+    return frames
+
+
+def _hex(color: str) -> Tuple[int, int, int]:
+    color = color.lstrip('#')
+    return int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16)
+
+
+def _union(boxes: List[Tuple[int, int, int, int]]) -> Tuple[int, int, int, int]:
+    return (
+        min(box[0] for box in boxes), min(box[1] for box in boxes),
+        max(box[2] for box in boxes), max(box[3] for box in boxes),
+    )
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+
+
+def _png_data(img: Image.Image) -> bytes:
+    """Unfiltered scanlines of a palette image, deflated"""
+    raw = img.tobytes()
+    width = img.width
+    return zlib.compress(b''.join(b'\0' + raw[y:y + width] for y in range(0, len(raw), width)), 6)
+
+
+class ReplayRenderer:
+    """Draws replay frames over a cached, pre-quantized copy of the map"""
+
+    def __init__(self, base: Optional[Image.Image] = None, map_layout: Optional[MapLayout] = None):
+        self.map_layout = map_layout or MapLayout()
+        if base is None:
+            base = MapRenderer(self.map_layout)._render_base([])
+
+        # Quantize once; every frame then draws straight into palette indexes
+        self.base = base.convert('RGB').quantize(BASE_COLORS, method=Image.Quantize.MEDIANCUT)
+        palette = self.base.getpalette()[:BASE_COLORS * 3]
+        overlay = [_hex(color) for color in PLAYER_COLORS] + [
+            (255, 255, 255), (0, 0, 0), (220, 50, 50), (20, 20, 40),
+        ]
+        self.ink: Dict[Tuple[int, int, int], int] = {}
+        for color in overlay:
+            self.ink.setdefault(color, BASE_COLORS + len(self.ink))
+            palette.extend(color)
+        self.base.putpalette(palette)
+
+        self.font = get_font(("DejaVuSans-Bold.ttf", "Helvetica-Bold.ttf"), 14)
+
+    def _color(self, color: str) -> int:
+        rgb = _hex(color)
+        if rgb not in self.ink:
+            self.ink[rgb] = self.ink[(255, 255, 255)]  # Unknown colours fall back to white
+        return self.ink[rgb]
+
+    def _room_box(self, room) -> Tuple[int, int, int, int]:
+        return (room.x - 2, room.y - 2, room.x + room.width + 3, room.y + room.height + 3)
+
+    def _draw_room(self, canvas: Image.Image, draw: ImageDraw.ImageDraw, name: str, frame: ReplayFrame):
+        room = self.map_layout.get_room(name)
+        if room is None:
+            return
+        box = self._room_box(room)
+        canvas.paste(self.base.crop(box), box[:2])
+
+        if SABOTAGE_ROOMS.get(frame.sabotage or '') == name:
+            draw.rounded_rectangle(
+                [room.x, room.y, room.x + room.width, room.y + room.height],
+                radius=12, outline=self.ink[(220, 50, 50)], width=3,
+            )
+
+        markers = [(color, False) for _, color, where in frame.players if where == name]
+        markers += [(color, True) for where, color in frame.bodies if where == name]
+        step = MARKER_RADIUS * 2 + 3
+        per_row = max(1, (room.width - 10) // step)
+        for index, (color, dead) in enumerate(markers):
+            cx = room.x + 6 + MARKER_RADIUS + (index % per_row) * step
+            cy = room.y + room.height - 6 - MARKER_RADIUS - (index // per_row) * step
+            draw.ellipse(
+                [cx - MARKER_RADIUS, cy - MARKER_RADIUS, cx + MARKER_RADIUS, cy + MARKER_RADIUS],
+                fill=self._color(color), outline=self.ink[(0, 0, 0)], width=2,
+            )
+            if dead:
+                r = MARKER_RADIUS - 2
+                draw.line([(cx - r, cy - r), (cx + r, cy + r)], fill=self.ink[(0, 0, 0)], width=2)
+                draw.line([(cx - r, cy + r), (cx + r, cy - r)], fill=self.ink[(0, 0, 0)], width=2)
+
+    def _draw_caption(self, canvas: Image.Image, draw: ImageDraw.ImageDraw, frame: ReplayFrame):
+        canvas.paste(self.base.crop(CAPTION_BOX), CAPTION_BOX[:2])
+        # No running clock: redrawing the caption every frame would stretch every frame's crop down to it
+        lines = [frame.phase.title()]
+        if frame.sabotage:
+            lines.append(f"Sabotage: {frame.sabotage}")
+        draw.rounded_rectangle(CAPTION_BOX, radius=8, fill=self.ink[(20, 20, 40)])
+        draw.multiline_text(
+            (CAPTION_BOX[0] + 8, CAPTION_BOX[1] + 6), "\n".join(lines),
+            fill=self.ink[(255, 255, 255)], font=self.font, spacing=4,
+        )
+
+    def _room_states(self, frame: ReplayFrame) -> Dict[str, tuple]:
+        states: Dict[str, list] = {}
+        for _, color, room in frame.players:
+            states.setdefault(room, []).append(color)
+        for room, color in frame.bodies:
+            states.setdefault(room, []).append(('body', color))
+        sabotaged = SABOTAGE_ROOMS.get(frame.sabotage or '')
+        if sabotaged:
+            states.setdefault(sabotaged, []).append('sabotage')
+        return {room: tuple(state) for room, state in states.items()}
+
+    def frames(self, frames: List[ReplayFrame], frame_ms: int = FRAME_MS):
+        """Yield (box, duration_ms, image) per frame. The first image is the whole canvas;
+        later ones cover only the changed pixels, with unchanged ones set to TRANSPARENT."""
+        canvas = self.base.copy()
+        draw = ImageDraw.Draw(canvas)
+        previous: Dict[str, tuple] = {}
+        previous_caption = None
+        for index, frame in enumerate(frames):
+            states = self._room_states(frame)
+            dirty: Set[str] = {room for room in states.keys() | previous.keys() if states.get(room) != previous.get(room)}
+            rooms = [self.map_layout.get_room(name) for name in dirty]
+            boxes = [self._room_box(room) for room in rooms if room is not None]
+            previous = states
+            caption = (frame.phase, frame.sabotage)
+            if caption != previous_caption:
+                boxes.append(CAPTION_BOX)
+            if not boxes:
+                continue
+
+            area = _union(boxes)
+            before = canvas.crop(area)
+            for name in dirty:
+                self._draw_room(canvas, draw, name, frame)
+            if caption != previous_caption:
+                self._draw_caption(canvas, draw, frame)
+                previous_caption = caption
+
+            duration = HOLD_MS.get(frame.kind, frame_ms)
+            if index == 0:
+                yield (0, 0, canvas.width, canvas.height), duration, canvas.copy()
+                continue
+
+            after = canvas.crop(area)
+            changed = ImageChops.difference(before.convert('L'), after.convert('L')).point(lambda v: 255 if v else 0)
+            tight = changed.getbbox()
+            if tight is None:
+                continue
+            region = after.crop(tight)
+            region.paste(TRANSPARENT, mask=ImageChops.invert(changed.crop(tight)))
+            yield (area[0] + tight[0], area[1] + tight[1], area[0] + tight[2], area[1] + tight[3]), duration, region
+
+    def encode_gif(self, frames: List[ReplayFrame], frame_ms: int = FRAME_MS) -> BytesIO:
+        out = BytesIO()
+        header, _ = getheader(self.base.copy(), info={'loop': 0})
+        out.write(b''.join(header))
+        for box, duration, region in self.frames(frames, frame_ms):
+            # Disposal 1 keeps the previous frame, so each region is drawn over everything before it
+            out.write(b''.join(getdata(region, offset=box[:2], duration=duration, disposal=1, transparency=TRANSPARENT)))
+        out.write(b';')
+        out.seek(0)
+        return out
+
+    def encode_apng(self, frames: List[ReplayFrame], frame_ms: int = FRAME_MS) -> BytesIO:
+        width, height = self.base.size
+        chunks = []
+        sequence = 0
+        count = 0
+        for box, duration, region in self.frames(frames, frame_ms):
+            # Blend OVER so TRANSPARENT pixels keep what's already there
+            chunks.append(_png_chunk(b'fcTL', struct.pack(
+                '>IIIIIHHBB', sequence, region.width, region.height, box[0], box[1], duration, 1000, 0, 1,
+            )))
+            sequence += 1
+            data = _png_data(region)
+            if count == 0:
+                chunks.append(_png_chunk(b'IDAT', data))
+            else:
+                chunks.append(_png_chunk(b'fdAT', struct.pack('>I', sequence) + data))
+                sequence += 1
+            count += 1
+
+        out = BytesIO()
+        out.write(b'\x89PNG\r\n\x1a\n')
+        out.write(_png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 3, 0, 0, 0)))
+        palette = self.base.getpalette()[:256 * 3]
+        palette += [0] * (256 * 3 - len(palette))
+        out.write(_png_chunk(b'PLTE', bytes(palette)))
+        out.write(_png_chunk(b'tRNS', b'\xff' * TRANSPARENT + b'\x00'))
+        out.write(_png_chunk(b'acTL', struct.pack('>II', count, 0)))
+        out.writelines(chunks)
+        out.write(_png_chunk(b'IEND', b''))
+        out.seek(0)
+        return out
+
+    def render(self, log_path: str, format: str = 'gif', step: float = 1.0, frame_ms: int = FRAME_MS) -> BytesIO:
+        frames = timeline(log_path, step)
+        if not frames:
+            raise ValueError(f"No recorded game state in {log_path}")
+        encode = self.encode_apng if format == 'apng' else self.encode_gif
+        return encode(frames, frame_ms)
+
+
+def _base_png() -> BytesIO:
+    return encode_image(MapRenderer(MapLayout())._render_base([]), 'map', profile='png')
+
+
+class ReplayJobs:
+    """Renders replays of finished games on a small worker pool, off the event loop.
+
+    Runs on its own threads so a long replay never queues behind the
+    interactive map and card renders.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._base: Optional[Image.Image] = None
+        self._jobs: Set[asyncio.Task] = set()
+        self.metrics = {'rendered': 0, 'failed': 0, 'bytes': 0, 'seconds': 0.0}
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            workers = int(os.getenv('REPLAY_WORKERS') or 1)
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='replay')
+        return self._executor
+
+    async def render(self, log_path: str) -> Tuple[str, BytesIO]:
+        """Render a replay for a closed log; returns (filename, buffer)"""
+        await event_logs.flush()  # The log's tail may still be buffered
+        if self._base is None:
+            # Drawn once on the render pool and shared, read-only, by every job
+            self._base = Image.open(await render_image_sync(('replay_base',), _base_png)).convert('RGB')
+
+        format = 'apng' if (os.getenv('REPLAY_FORMAT') or 'gif').lower() == 'apng' else 'gif'
+        base = self._base
+
+        def work() -> BytesIO:
+            return ReplayRenderer(base).render(log_path, format)
+
+        started = time.perf_counter()
+        buffer = await asyncio.get_running_loop().run_in_executor(self._pool(), work)
+        self.metrics['rendered'] += 1
+        self.metrics['bytes'] += buffer.getbuffer().nbytes
+        self.metrics['seconds'] += time.perf_counter() - started
+        extension = 'png' if format == 'apng' else 'gif'
+        return f"replay.{extension}", buffer
+
+    def submit(self, log_path: str, channel: discord.abc.Messageable, release: Optional[Callable[[], None]] = None):
+        """Render a finished game's replay in the background and post it to `channel`.
+
+        `release` runs once the replay has been posted (or has failed); the
+        caller uses it to drop the channel's outbound queue after the job's
+        own send rather than before it.
+        """
+        task = asyncio.create_task(self._post(log_path, channel, release), name='replay')
+        self._jobs.add(task)
+        task.add_done_callback(self._jobs.discard)
+
+    async def _post(self, log_path: str, channel: discord.abc.Messageable, release: Optional[Callable[[], None]]):
+        try:
+            filename, buffer = await self.render(log_path)
+            await outbound.send(channel, "🎬 **Replay** — who went where", file=discord.File(buffer, filename=filename))
+        except Exception:
+            self.metrics['failed'] += 1
+            log.exception("Could not render replay for %s", log_path)
+        finally:
+            if release is not None:
+                release()
+
+    def pending(self) -> int:
+        return len(self._jobs)
+
+
+replays = ReplayJobs()
+
+
+if __name__ == '__main__':
+    # python -m amongus.replay game_logs/<channel>-<code>.evlog [out.gif|out.png]
+    source = sys.argv[1]
+    target = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(source)[0] + '.gif'
+    buffer = ReplayRenderer().render(source, 'apng' if target.endswith('.png') else 'gif')
+    with open(target, 'wb') as f:
+        f.write(buffer.getvalue())
@@ -0,0 +1,78 @@
+"""Coalesce concurrent identical image renders into one"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from .commandstats import span
+
+# Sync renderers share a small pool (RENDER_WORKERS, default up to 4). Each
+# worker gets its own font instances from the per-thread registry, and callers
+# hand it snapshots rather than live game state
+_render_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _render_executor
+    if _render_executor is None:
+        workers = int(os.getenv('RENDER_WORKERS') or min(4, os.cpu_count() or 1))
+        _render_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='render')
+    return _render_executor
+
+
+class SingleFlight:
+    """At most one in-flight call per key; concurrent callers await the same result.
+
+    The work runs in its own task, so a caller being cancelled doesn't cancel
+    it for everyone else waiting on the same key.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.metrics = {'requests': 0, 'executions': 0, 'coalesced': 0}
+        self.coalesced_by_kind: Dict[str, int] = {}
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        self.metrics['requests'] += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.metrics['executions'] += 1
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.metrics['coalesced'] += 1
+            kind = key[0] if isinstance(key, tuple) and key else str(key)
+            self.coalesced_by_kind[kind] = self.coalesced_by_kind.get(kind, 0) + 1
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+
+renders = SingleFlight()
+
+
+async def _as_bytes(render: Callable[[], Awaitable[BytesIO]]) -> bytes:
+    buffer = await render()
+    return buffer.getvalue()
+
+
+async def render_image(key: Hashable, render: Callable[[], Awaitable[BytesIO]]) -> BytesIO:
+    """Run an async renderer through the single-flight layer; every caller gets its own buffer"""
+    with span('render'):
+        return BytesIO(await renders.run(key, lambda: _as_bytes(render)))
+
+
+async def render_image_sync(key: Hashable, render: Callable[..., BytesIO], *args) -> BytesIO:
+    """Run a blocking renderer off the event loop through the single-flight layer.
+
+    `args` are read on the render thread after this returns control to the
+    loop, so pass immutable copies (e.g. `MapLayout.snapshot()`), never live state.
+    """
+    async def run_in_executor() -> BytesIO:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor(), render, *args)
+
+    return await render_image(key, run_in_executor)
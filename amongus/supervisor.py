@@ -0,0 +1,79 @@
+"""Per-game ownership of background tasks"""
+import asyncio
+import logging
+from typing import Any, Callable, Coroutine, Dict, Optional, Set
+
+from .logs import bind
+
+log = logging.getLogger(__name__)
+
+
+class TaskSupervisor:
+    """Tracks every task spawned for one game so ending the game tears them all down.
+
+    Once closed, newly spawned coroutines are cancelled before they start, so
+    a task that is still unwinding can't leave work behind for a finished game.
+    """
+
+    def __init__(self, log_context: Optional[Callable[[], Dict[str, Any]]] = None):
+        self._tasks: Set[asyncio.Task] = set()
+        self._log_context = log_context  # Fields bound into every task's log records
+        self.closed = False
+        self.metrics = {'spawned': 0, 'cancelled': 0, 'failed': 0}
+
+    def spawn(self, coro: Coroutine, name: Optional[str] = None) -> asyncio.Task:
+        name = name or coro.__qualname__
+        if self._log_context is not None:
+            coro = _with_log_context(coro, self._log_context())
+        task = asyncio.create_task(coro, name=name)
+        if self.closed:
+            task.cancel()
+            return task
+
+        self.metrics['spawned'] += 1
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self.metrics['failed'] += 1
+            # Done callbacks run in the spawner's context, so the task's bound fields aren't visible here
+            extra = self._log_context() if self._log_context is not None else None
+            log.error("Game task %s failed", task.get_name(), exc_info=error, extra=extra)
+
+    def cancel_all(self):
+        """Cancel every live task. The calling task, if supervised, is left to finish on its own."""
+        self.closed = True
+        current = asyncio.current_task() if _loop_running() else None
+        for task in list(self._tasks):
+            if task is not current and not task.done():
+                task.cancel()
+                self.metrics['cancelled'] += 1
+
+    def live_count(self) -> int:
+        return len(self._tasks)
+
+    def live_by_name(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for task in self._tasks:
+            name = task.get_name()
+            counts[name] = counts.get(name, 0) + 1
+        return counts
+
+
+async def _with_log_context(coro: Coroutine, fields: Dict[str, Any]):
+    bind(**fields)
+    return await coro
+
+
+def _loop_running() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
@@ -4,6 +4,7 @@ import random
 import asyncio
 from typing import Optional, Callable
 from .constants import TASK_TYPES, TASK_COMPLETION_TIME
+from .timers import timer_wheel
 
 
 class Task:
@@ -572,7 +573,7 @@ class InspectSampleTaskView(ui.View):
                 view=self,
             )
             
-            await asyncio.sleep(60)
+            await timer_wheel.sleep(60)
             
             await interaction.edit_original_response(
                 content="🧪 Sample analysis complete! No anomalies detected.",
@@ -910,17 +911,18 @@ class CheckOxygenTaskView(ui.View):
         await self.on_complete()
 
 
-def generate_tasks_for_player(count: Optional[int] = None) -> list[Task]:
+def generate_tasks_for_player(count: Optional[int] = None, rng: Optional[random.Random] = None) -> list[Task]:
+    rng = rng or random.Random()
 
     if count is None:
-        count = random.randint(7, 8)  # 7-8 tasks per player
+        count = rng.randint(7, 8)  # 7-8 tasks per player
 
     tasks = []
     available_types = list(TASK_TYPES.keys())
 
     for _ in range(count):
-        task_type = random.choice(available_types)
-        location = random.choice(TASK_TYPES[task_type]["locations"])
+        task_type = rng.choice(available_types)
+        location = rng.choice(TASK_TYPES[task_type]["locations"])
         tasks.append(Task(task_type, location))
 
     return tasks
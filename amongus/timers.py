@@ -0,0 +1,169 @@
+"""Shared hierarchical timer wheel for game deadlines"""
+import asyncio
+import logging
+import math
+from typing import Any, Callable, List, Optional, Set
+
+log = logging.getLogger(__name__)
+
+
+class TimerHandle:
+    """A scheduled deadline; cancel() frees it immediately"""
+
+    __slots__ = ('tick', 'callback', 'args', '_bucket', '_wheel')
+
+    def __init__(self, wheel: 'TimerWheel', tick: int, callback: Callable, args: tuple):
+        self.tick = tick
+        self.callback = callback
+        self.args = args
+        self._bucket: Optional[Set['TimerHandle']] = None
+        self._wheel = wheel
+
+    @property
+    def active(self) -> bool:
+        return self._bucket is not None
+
+    def remaining(self) -> float:
+        """Seconds until the deadline fires (0 once fired or cancelled)"""
+        if not self.active:
+            return 0.0
+        return max(0.0, self._wheel.time_of(self.tick) - asyncio.get_running_loop().time())
+
+    def cancel(self):
+        if self._bucket is None:
+            return
+        self._bucket.discard(self)
+        self._bucket = None
+        self._wheel._pending -= 1
+        self._wheel.metrics['cancelled'] += 1
+
+
+class TimerWheel:
+    """Hashed hierarchical wheel: `levels` rings of `slots` buckets, `tick` seconds apart.
+
+    Scheduling and cancelling are O(1). One driver task wakes once per tick
+    while anything is pending and exits when the wheel is empty, so thousands
+    of sabotage, vote and task deadlines share a single sleep. Deadlines never
+    fire early; they fire up to one tick late.
+    """
+
+    def __init__(self, tick: float = 0.5, slots: int = 64, levels: int = 3):
+        self.tick = tick
+        self.slots = slots
+        self._levels: List[List[Set[TimerHandle]]] = [
+            [set() for _ in range(slots)] for _ in range(levels)
+        ]
+        self._span = slots ** levels  # Furthest deadline placeable without re-cascading
+        self._origin: Optional[float] = None
+        self._current = 0
+        self._pending = 0
+        self._driver: Optional[asyncio.Task] = None
+        self._callbacks: Set[asyncio.Task] = set()  # Coroutine callbacks still running
+        self.metrics = {'scheduled': 0, 'fired': 0, 'cancelled': 0, 'ticks': 0}
+
+    def time_of(self, tick: int) -> float:
+        return self._origin + tick * self.tick
+
+    def pending(self) -> int:
+        return self._pending
+
+    def call_later(self, delay: float, callback: Callable[..., Any], *args) -> TimerHandle:
+        """Run callback(*args) after `delay` seconds. Coroutine callbacks are spawned as tasks."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self._origin is None:
+            self._origin = now
+        if self._driver is None:
+            # The wheel was idle, so skip straight to the present
+            self._current = int((now - self._origin) // self.tick)
+
+        tick = max(self._current + 1, math.ceil((now + delay - self._origin) / self.tick))
+        handle = TimerHandle(self, tick, callback, args)
+        self._place(handle)
+        self._pending += 1
+        self.metrics['scheduled'] += 1
+
+        if self._driver is None:
+            self._driver = loop.create_task(self._run())
+        return handle
+
+    async def sleep(self, delay: float):
+        """asyncio.sleep on the wheel; cancelling the sleeper frees the timer"""
+        waiter = asyncio.get_running_loop().create_future()
+        handle = self.call_later(delay, _wake, waiter)
+        try:
+            await waiter
+        finally:
+            handle.cancel()
+
+    def _place(self, handle: TimerHandle):
+        delta = min(handle.tick - self._current, self._span - 1)
+        level, width = 0, 1
+        while delta >= width * self.slots:
+            level += 1
+            width *= self.slots
+        # Deadlines past the top ring park at its furthest slot and re-cascade from there
+        slot = ((self._current + delta) // width) % self.slots
+        bucket = self._levels[level][slot]
+        bucket.add(handle)
+        handle._bucket = bucket
+
+    def _advance(self):
+        self._current += 1
+        self.metrics['ticks'] += 1
+
+        width = 1
+        for level in range(1, len(self._levels)):
+            width *= self.slots
+            if self._current % width:
+                break
+            bucket = self._levels[level][(self._current // width) % self.slots]
+            cascading = list(bucket)
+            bucket.clear()
+            for handle in cascading:
+                self._place(handle)
+
+        bucket = self._levels[0][self._current % self.slots]
+        due = [handle for handle in bucket if handle.tick <= self._current]
+        for handle in due:
+            bucket.discard(handle)
+            handle._bucket = None
+            self._pending -= 1
+            self.metrics['fired'] += 1
+            self._fire(handle)
+
+    def _fire(self, handle: TimerHandle):
+        try:
+            result = handle.callback(*handle.args)
+        except Exception:
+            log.exception("Timer callback %r failed", handle.callback)
+            return
+        if asyncio.iscoroutine(result):
+            task = asyncio.ensure_future(result)
+            self._callbacks.add(task)
+            task.add_done_callback(self._callback_done)
+
+    def _callback_done(self, task: asyncio.Task):
+        self._callbacks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            log.error("Timer callback task %s failed", task.get_name(), exc_info=task.exception())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while self._pending:
+                await asyncio.sleep(max(0.0, self.time_of(self._current + 1) - loop.time()))
+                # Catch up on every tick that elapsed if the loop was busy
+                target = int((loop.time() - self._origin) // self.tick)
+                while self._current < target and self._pending:
+                    self._advance()
+        finally:
+            self._driver = None
+
+
+def _wake(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+timer_wheel = TimerWheel()
@@ -0,0 +1,86 @@
+"""Compare encoder profiles (encode time vs bytes uploaded) for every renderer.
+
+Usage: python benchmark_encoders.py [--repeat N] [--json results.json]
+"""
+import argparse
+import asyncio
+import json
+import time
+from io import BytesIO
+
+from PIL import Image
+
+from amongus import card_generator
+from amongus.encoding import ENCODER_PROFILES, encode_image
+from amongus.map_renderer import MapLayout, create_map_image, create_vent_map_image
+
+
+async def _stub_avatar(url: str):
+    avatar = Image.new('RGBA', (256, 256), (90, 140, 220, 255))
+    return avatar
+
+
+async def render_samples():
+    """Render one image per renderer with the lossless default profile"""
+    card_generator.download_avatar = _stub_avatar
+    layout = MapLayout()
+    players = [{'name': f'Player {i}', 'is_bot': i % 2 == 0} for i in range(8)]
+
+    return {
+        'map': create_map_image('Electrical', ['Reactor'], layout),
+        'vent_map': create_vent_map_image('Admin', layout),
+        'role_card': await card_generator.create_role_reveal_card('Player', 'Crewmate', 5, 'stub'),
+        'lobby_card': await card_generator.create_lobby_card(players),
+        'alive_card': await card_generator.create_alive_players_card(players),
+        'meeting_card': await card_generator.create_emergency_meeting_card('Player'),
+        'vote_result_card': await card_generator.create_vote_result_card('Player', 3, True),
+        'death_card': await card_generator.create_death_card('Player', 'stub'),
+    }
+
+
+def benchmark(repeat: int):
+    samples = asyncio.run(render_samples())
+    results = []
+
+    for renderer, buffer in samples.items():
+        img = Image.open(buffer)
+        img.load()
+        kind = 'map' if renderer.endswith('map') else 'card'
+
+        for profile in ENCODER_PROFILES:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                encoded = encode_image(img, kind, profile)
+                timings.append(time.perf_counter() - start)
+
+            results.append({
+                'renderer': renderer,
+                'profile': profile,
+                'encode_ms': round(min(timings) * 1000, 2),
+                'bytes': len(encoded.getvalue()),
+            })
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+
+    results = benchmark(args.repeat)
+
+    print(f"{'renderer':<18}{'profile':<16}{'encode ms':>10}{'KiB':>10}")
+    for row in results:
+        print(f"{row['renderer']:<18}{row['profile']:<16}{row['encode_ms']:>10.1f}{row['bytes'] / 1024:>10.1f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
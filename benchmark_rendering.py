@@ -0,0 +1,148 @@
+"""Benchmark every renderer: latency percentiles, allocations and encoded bytes.
+
+Avatar downloads are stubbed, so results only measure drawing and encoding.
+
+Usage: python benchmark_rendering.py [--iterations N] [--cold] [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+
+import PIL
+from PIL import Image
+
+from amongus import card_generator, map_renderer
+from amongus.encoding import profile_name
+from amongus.map_renderer import MapLayout, MapRenderer, VentMapRenderer
+from amongus.metrics import metrics_path
+
+
+async def _stub_avatar(url: str):
+    return Image.new('RGBA', (256, 256), (90, 140, 220, 255))
+
+
+def _players(count: int):
+    return [
+        {'name': f'Player {i}', 'is_bot': i % 3 == 0, 'color': card_generator.PLAYER_COLORS[i]}
+        for i in range(count)
+    ]
+
+
+def build_cases():
+    """name -> zero-argument coroutine function returning an encoded buffer"""
+    layout = MapLayout()
+    rooms = list(layout.rooms)
+
+    async def map_render():
+        return MapRenderer(layout).render('Electrical', ['Reactor'])
+
+    async def map_render_many():
+        buffers = MapRenderer(layout).render_many(rooms[:10], ['O2'])
+        return next(iter(buffers.values()))
+
+    async def vent_render():
+        return VentMapRenderer(layout).render('Admin')
+
+    return {
+        'MapRenderer.render': map_render,
+        'MapRenderer.render_many(10)': map_render_many,
+        'VentMapRenderer.render': vent_render,
+        'create_player_card': lambda: card_generator.create_player_card('Player', 'stub', '#C51111', 'Crewmate'),
+        'create_role_reveal_card': lambda: card_generator.create_role_reveal_card('Player', 'Impostor', 5, 'stub'),
+        'create_lobby_card': lambda: card_generator.create_lobby_card(_players(8)),
+        'create_alive_players_card': lambda: card_generator.create_alive_players_card(_players(6)),
+        'create_emergency_meeting_card': lambda: card_generator.create_emergency_meeting_card('Player'),
+        'create_vote_result_card': lambda: card_generator.create_vote_result_card('Player', 3, False),
+        'create_death_card': lambda: card_generator.create_death_card('Player', 'stub'),
+    }
+
+
+def _clear_caches():
+    card_generator.clear_caches()
+    map_renderer.clear_caches()
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_case(render, iterations: int, cold: bool):
+    # One untimed call to warm fonts and, unless measuring cold, the render caches
+    buffer = await render()
+
+    timings = []
+    for _ in range(iterations):
+        if cold:
+            _clear_caches()
+        start = time.perf_counter()
+        buffer = await render()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    # Allocations are measured separately so tracemalloc doesn't skew timings.
+    # tracemalloc only sees Python-level allocations, not Pillow's pixel buffers.
+    if cold:
+        _clear_caches()
+    tracemalloc.start()
+    await render()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'p50_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(_percentile(timings, 0.95), 2),
+        'p99_ms': round(_percentile(timings, 0.99), 2),
+        'max_ms': round(max(timings), 2),
+        'mean_ms': round(statistics.mean(timings), 2),
+        'peak_alloc_kib': round(peak / 1024, 1),
+        'encoded_bytes': len(buffer.getvalue()),
+    }
+
+
+async def run(iterations: int, cold: bool):
+    card_generator.download_avatar = _stub_avatar
+    results = {}
+    for name, render in build_cases().items():
+        results[name] = await run_case(render, iterations, cold)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--cold', action='store_true', help='Clear render caches before every call')
+    parser.add_argument('--output', help='Default: benchmark_results.json in METRICS_DIR')
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.iterations, args.cold))
+
+    print(f"{'renderer':<30}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'peak KiB':>10}{'bytes':>9}")
+    for name, row in results.items():
+        print(
+            f"{name:<30}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}"
+            f"{row['peak_alloc_kib']:>10.0f}{row['encoded_bytes']:>9}"
+        )
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'pillow': PIL.__version__,
+            'image_profile': {'map': profile_name('map'), 'card': profile_name('card')},
+            'iterations': args.iterations,
+            'cold': args.cold,
+        },
+        'results': results,
+    }
+    output = args.output or metrics_path('benchmark_results.json')
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,25 @@
 """Debug commands for testing (Owner only)"""
+import logging
+import os
 import discord
 from discord import app_commands, ui
 from discord.ext import commands
 from typing import Optional
+from amongus.attachments import attachment_cache
+from amongus.commandstats import INTERACTION_BUDGET_MS, command_stats
+from amongus.dm import dm_service
+from amongus.eventlog import event_logs
+from amongus.fonts import font_sources
+from amongus.logs import level_overrides, set_level
+from amongus.loopmonitor import loop_monitor
+from amongus.memory import describe_stat, live_instances, memory_inspector
+from amongus.outbound import outbound
+from amongus.profiling import ProfilerBusy, capture_profile
+from amongus.replay import replays
+from amongus.singleflight import renders
+from amongus.timers import timer_wheel
+
+log = logging.getLogger(__name__)
 
 BOT_OWNER_ID = 702136500334100604
 
@@ -95,7 +112,7 @@ class DebugCog(commands.Cog):
         self.forced_impostors = {}  # Format: {channel_id: user_id}
         
     async def cog_load(self):
-        print('DebugCog loaded')
+        log.info('DebugCog loaded')
     
     @app_commands.command(name='forceimpostor', description='[DEBUG] Force a player to always be impostor (Owner only)')
     @app_commands.describe(
@@ -187,6 +204,131 @@ class DebugCog(commands.Cog):
                 inline=False
             )
         
+        metrics = outbound.metrics
+        embed.add_field(
+            name="Outbound Messages",
+            value=(
+                f"Sent: {metrics['messages_sent']} (failed: {metrics['send_failures']})\n"
+                f"Lines: {metrics['lines_posted']} posted, {metrics['lines_coalesced']} coalesced, "
+                f"{metrics['lines_dropped']} dropped, {outbound.pending_lines()} pending\n"
+                f"Delayed: {metrics['sends_delayed']} ({metrics['delay_seconds']:.1f}s total), "
+                f"429s: {metrics['rate_limited']}"
+            ),
+            inline=False
+        )
+        
+        dm_metrics = dm_service.metrics
+        embed.add_field(
+            name="Direct Messages",
+            value=(
+                f"Delivered: {dm_metrics['delivered']}, failed: {dm_metrics['failed']}, "
+                f"DMs closed: {dm_metrics['forbidden']}\n"
+                f"Retries: {dm_metrics['retries']} ({dm_metrics['rate_limited']} rate limited, "
+                f"{dm_metrics['backoff_seconds']:.1f}s backoff)"
+            ),
+            inline=False
+        )
+        
+        cache_metrics = attachment_cache.metrics
+        embed.add_field(
+            name="Attachment Reuse",
+            value=(
+                f"Cached URLs: {len(attachment_cache)}\n"
+                f"Hits: {cache_metrics['hits']}, misses: {cache_metrics['misses']}, "
+                f"expired: {cache_metrics['expired']}, stale links re-uploaded: {cache_metrics['fallbacks']}"
+            ),
+            inline=False
+        )
+        
+        render_metrics = renders.metrics
+        coalesced_by_kind = ", ".join(
+            f"{kind}: {count}" for kind, count in sorted(renders.coalesced_by_kind.items())
+        )
+        embed.add_field(
+            name="Image Renders",
+            value=(
+                f"Requests: {render_metrics['requests']}, rendered: {render_metrics['executions']}, "
+                f"coalesced: {render_metrics['coalesced']}, in flight: {renders.in_flight()}"
+                + (f"\n{coalesced_by_kind}" if coalesced_by_kind else "")
+            ),
+            inline=False
+        )
+        
+        games = list(getattr(self.bot, 'amongus_games', {}).values())
+        if games:
+            lines = []
+            for game in games:
+                by_name = ", ".join(f"{name}: {count}" for name, count in sorted(game.tasks.live_by_name().items()))
+                lines.append(f"`{game.game_code}` ({game.phase}) {game.tasks.live_count()} live" + (f" — {by_name}" if by_name else ""))
+            embed.add_field(
+                name="Game Tasks",
+                value="\n".join(lines)[:1024],
+                inline=False
+            )
+        
+        command_summary = command_stats.summary()
+        if command_summary:
+            lines = []
+            for name, stats in list(command_summary.items())[:8]:
+                ack = f", ack p95 {stats['ack_p95_ms']:.0f}ms" if stats['ack_p95_ms'] is not None else ""
+                lines.append(
+                    f"`{name}` ×{stats['calls']} p95 {stats['p95_ms']:.0f}ms{ack}, "
+                    f"{stats['errors']} err, {stats['over_budget']} over {INTERACTION_BUDGET_MS // 1000}s — "
+                    f"render {stats['render_share']:.0%}, db {stats['db_share']:.0%}, http {stats['http_share']:.0%}"
+                )
+            embed.add_field(
+                name=f"Commands (last {command_stats.window / 60:.0f} min)",
+                value="\n".join(lines)[:1024],
+                inline=False
+            )
+        
+        loop_metrics = loop_monitor.metrics
+        if loop_metrics['probes']:
+            worst_cogs = sorted(loop_monitor.stalls_by_cog.items(), key=lambda item: -item[1]['seconds'])[:5]
+            value = (
+                f"Lag p50 ≤{loop_monitor.lag_percentile(0.5)}ms, p99 ≤{loop_monitor.lag_percentile(0.99)}ms, "
+                f"max {loop_metrics['max_lag_ms']:.0f}ms over {loop_metrics['probes']} probes\n"
+                f"Stalls over {loop_monitor.threshold * 1000:.0f}ms: {loop_metrics['stalls']}"
+            )
+            if worst_cogs:
+                value += "\n" + ", ".join(f"{cog}: {stats['count']} ({stats['seconds']:.1f}s)" for cog, stats in worst_cogs)
+            if loop_monitor.recent_stalls and loop_monitor.recent_stalls[-1]['where']:
+                last = loop_monitor.recent_stalls[-1]
+                value += f"\nLast: {last['lag_ms']:.0f}ms at `{last['where']}`"
+            embed.add_field(name="Event Loop", value=value[:1024], inline=False)
+        
+        timer_metrics = timer_wheel.metrics
+        embed.add_field(
+            name="Timer Wheel",
+            value=(
+                f"Pending: {timer_wheel.pending()}, fired: {timer_metrics['fired']}, "
+                f"cancelled: {timer_metrics['cancelled']}, ticks: {timer_metrics['ticks']}"
+            ),
+            inline=False
+        )
+        
+        log_metrics = event_logs.metrics
+        embed.add_field(
+            name="Event Logs",
+            value=(
+                f"Open: {event_logs.open_count()}, written: {log_metrics['bytes_written'] / 1024:.1f} KiB "
+                f"in {log_metrics['flushes']} flushes, errors: {log_metrics['write_errors']}\n"
+                f"Replays: {replays.metrics['rendered']} rendered ({replays.metrics['seconds']:.1f}s), "
+                f"{replays.pending()} pending, {replays.metrics['failed']} failed"
+            ),
+            inline=False
+        )
+        
+        fonts = font_sources()
+        if fonts:
+            embed.add_field(
+                name="Fonts",
+                value="\n".join(
+                    f"{name} → {os.path.basename(source)}" for name, source in sorted(fonts.items())
+                )[:1024],
+                inline=False
+            )
+        
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
     @app_commands.command(name='reloadcog', description='[DEBUG] Reload a specific cog (Owner only)')
@@ -216,7 +358,124 @@ class DebugCog(commands.Cog):
             view=view,
             ephemeral=True
         )
-    
+
+    @app_commands.command(name='profile', description='[DEBUG] Profile the bot for a number of seconds (Owner only)')
+    @app_commands.describe(seconds='How long to capture (1-120 seconds, default: 15)')
+    async def profile(self, interaction: discord.Interaction, seconds: app_commands.Range[int, 1, 120] = 15):
+        """Capture a cProfile of the event loop and reply with the hottest functions"""
+
+        # Check if user is bot owner
+        if interaction.user.id != BOT_OWNER_ID:
+            await interaction.response.send_message(
+                "❌ This command is only available to the bot owner!",
+                ephemeral=True
+            )
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        try:
+            path, rows = await capture_profile(seconds)
+        except ProfilerBusy as e:
+            await interaction.followup.send(f"❌ {e}", ephemeral=True)
+            return
+
+        lines = [f"{'cum s':>8} {'own s':>7} {'calls':>7}  function"]
+        for row in rows:
+            lines.append(f"{row.cumulative:>8.3f} {row.own:>7.3f} {row.calls:>7}  {row.where[:80]}")
+        table = "\n".join(lines)[:1800]
+
+        await interaction.followup.send(
+            f"📈 **Profiled {seconds}s** → `{path}`\n```\n{table}\n```",
+            ephemeral=True
+        )
+
+    @app_commands.command(name='memory', description='[DEBUG] Inspect heap growth and live game objects (Owner only)')
+    @app_commands.describe(action='What to do (default: diff since the last call)')
+    @app_commands.choices(
+        action=[
+            app_commands.Choice(name="Diff by line", value="diff"),
+            app_commands.Choice(name="Diff by module", value="diff_modules"),
+            app_commands.Choice(name="Dump snapshot to disk", value="dump"),
+            app_commands.Choice(name="Stop tracing", value="stop"),
+        ]
+    )
+    async def memory(self, interaction: discord.Interaction, action: str = "diff"):
+        """tracemalloc snapshots diffed between calls, plus live AmongUsGame/Player/Task/View counts"""
+
+        # Check if user is bot owner
+        if interaction.user.id != BOT_OWNER_ID:
+            await interaction.response.send_message(
+                "❌ This command is only available to the bot owner!",
+                ephemeral=True
+            )
+            return
+
+        if action == "stop":
+            memory_inspector.stop()
+            await interaction.response.send_message("🧠 Allocation tracing stopped.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        embed = discord.Embed(title="🧠 Memory", color=discord.Color.orange())
+        counts = await live_instances(getattr(self.bot, 'amongus_games', {}).values())
+        embed.add_field(
+            name="Live Objects",
+            value="\n".join(f"{name}: {count}" for name, count in counts.items()),
+            inline=False
+        )
+
+        if action == "dump":
+            path = await memory_inspector.dump()
+            embed.description = f"Snapshot written to `{path}`"
+        elif not memory_inspector.tracing:
+            memory_inspector.start()
+            embed.description = "Allocation tracing started. Run `/memory` again later to see what grew."
+        else:
+            diff = await memory_inspector.diff('filename' if action == "diff_modules" else 'lineno')
+            embed.description = (
+                f"Traced {diff['traced'] / 1048576:.1f} MiB (peak {diff['peak'] / 1048576:.1f} MiB), "
+                f"growth over the last {diff['elapsed'] / 60:.1f} min:"
+            )
+            lines = [describe_stat(stat) for stat in diff['top']]
+            embed.add_field(
+                name="Top Growth",
+                value=("```\n" + "\n".join(line[:110] for line in lines)[:990] + "\n```") if lines else "No growth",
+                inline=False
+            )
+
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+    @app_commands.command(name='loglevel', description='[DEBUG] Change a module\'s log level at runtime (Owner only)')
+    @app_commands.describe(
+        module='Logger name, e.g. cogs.commands.game_loops or amongus (empty: everything)',
+        level='New level'
+    )
+    @app_commands.choices(
+        level=[
+            app_commands.Choice(name=name, value=name)
+            for name in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+        ]
+    )
+    async def log_level(self, interaction: discord.Interaction, level: str, module: str = ""):
+        """Raise or lower verbosity for one module without restarting"""
+
+        # Check if user is bot owner
+        if interaction.user.id != BOT_OWNER_ID:
+            await interaction.response.send_message(
+                "❌ This command is only available to the bot owner!",
+                ephemeral=True
+            )
+            return
+
+        applied = set_level(module.strip(), level)
+        overrides = "\n".join(f"`{name}` → {value}" for name, value in sorted(level_overrides().items()))
+        await interaction.response.send_message(
+            f"📝 `{module.strip() or 'root'}` now logs at **{applied}**\n\n**Overrides:**\n{overrides}",
+            ephemeral=True
+        )
+
     def get_forced_impostor(self, channel_id: int) -> Optional[int]:
         """Get the forced impostor user ID for a channel, if any"""
         return self.forced_impostors.get(channel_id)
@@ -1,25 +1,17 @@
 """Body discovery notifications"""
+import logging
 import time
 import discord
 from discord import ui, app_commands
 from discord.ext import commands
-import random
 import asyncio
 from typing import Optional
 from .game_meeting import trigger_meeting
+from .game_utils import safe_dm_user
+from amongus.outbound import outbound
 from amongus.card_generator import create_emergency_meeting_card
 
-
-async def safe_dm_user(user: discord.User | discord.Member, **kwargs):
-    for attempt in range(7):
-        try:
-            await user.send(**kwargs)
-            return
-        except discord.errors.HTTPException:
-            if attempt < 6:
-                await asyncio.sleep(3)
-            else:
-                pass
+log = logging.getLogger(__name__)
 
 
 async def teleport_and_report_body(
@@ -29,7 +21,7 @@ async def teleport_and_report_body(
     victim,
     body_location: str
 ):
-    await asyncio.sleep(random.uniform(5, 10))
+    await asyncio.sleep(game.rng.uniform(5, 10))
     
     if game.phase != 'tasks':
         return
@@ -47,7 +39,7 @@ async def teleport_and_report_body(
     if not alive_non_impostors:
         return
     
-    reporter = random.choice(alive_non_impostors)
+    reporter = game.rng.choice(alive_non_impostors)
     
     old_location = reporter.location
     reporter.location = body_location
@@ -66,23 +58,26 @@ async def teleport_and_report_body(
         # Update global body report timestamp
         game.last_body_report_time = time.time()
         
-        await channel.send(
+        await outbound.send(
+            channel,
             f"🚨 **{reporter.name}** discovered **{victim.name}'s** body and called an emergency meeting!"
         )
         
         if nearby_players:
             players_list = ", ".join([f"**{p}**" for p in nearby_players])
-            await channel.send(
+            await outbound.send(
+                channel,
                 f"🗣️ **{reporter.name}** says: \"I saw {players_list} near the body!\""
             )
         else:
-            await channel.send(
+            await outbound.send(
+                channel,
                 f"🗣️ **{reporter.name}** says: \"I got here quickly and found the body!\""
             )
         
         await trigger_meeting(game, channel, f"{reporter.name} (found body)", bot)
-    except Exception as e:
-        print(f"Error in teleport_and_report_body: {e}")
+    except Exception:
+        log.exception("Error in teleport_and_report_body")
 
 
 async def schedule_teleport_and_report(
@@ -93,7 +88,7 @@ async def schedule_teleport_and_report(
     body_location: str,
     impostor_view
 ):
-    await asyncio.sleep(random.uniform(5, 10))
+    await asyncio.sleep(game.rng.uniform(5, 10))
     
     if impostor_view.responded:
         return
@@ -109,7 +104,7 @@ async def schedule_teleport_and_report(
     if not alive_non_impostors:
         return
     
-    reporter = random.choice(alive_non_impostors)
+    reporter = game.rng.choice(alive_non_impostors)
     
     old_location = reporter.location
     reporter.location = body_location
@@ -125,23 +120,26 @@ async def schedule_teleport_and_report(
         
         room.remove_body(victim.name)
         
-        await channel.send(
+        await outbound.send(
+            channel,
             f"🚨 **{reporter.name}** discovered **{victim.name}'s** body and called an emergency meeting!"
         )
         
         if nearby_players:
             players_list = ", ".join([f"**{p}**" for p in nearby_players])
-            await channel.send(
+            await outbound.send(
+                channel,
                 f"🗣️ **{reporter.name}** says: \"I saw {players_list} near the body!\""
             )
         else:
-            await channel.send(
+            await outbound.send(
+                channel,
                 f"🗣️ **{reporter.name}** says: \"I got here quickly and found the body!\""
             )
         
         await trigger_meeting(game, channel, f"{reporter.name} (found body)", bot)
-    except Exception as e:
-        print(f"Error in schedule_teleport_and_report: {e}")
+    except Exception:
+        log.exception("Error in schedule_teleport_and_report")
 
 
 async def schedule_impostor_self_report(
@@ -153,7 +151,7 @@ async def schedule_impostor_self_report(
     body_location: str
 ):
     """Impostor self-reports the body they just killed"""
-    await asyncio.sleep(random.uniform(5, 10))
+    await asyncio.sleep(game.rng.uniform(5, 10))
     
     if game.phase != 'tasks':
         return
@@ -177,7 +175,8 @@ async def schedule_impostor_self_report(
         # Update global body report timestamp
         game.last_body_report_time = time.time()
         
-        await channel.send(
+        await outbound.send(
+            channel,
             f"🚨 **{impostor.name}** discovered **{victim.name}'s** body and called an emergency meeting!"
         )
         
@@ -190,23 +189,25 @@ async def schedule_impostor_self_report(
         ]
         
         # Pick 2 random crewmates to accuse (or fewer if not enough players)
-        num_to_accuse = min(random.randint(2,3), len(alive_crewmates))
+        num_to_accuse = min(game.rng.randint(2,3), len(alive_crewmates))
         if num_to_accuse > 0:
-            accused_players = random.sample(alive_crewmates, num_to_accuse)
+            accused_players = game.rng.sample(alive_crewmates, num_to_accuse)
             accused_names = [p.name for p in accused_players]
             players_list = ", ".join([f"**{name}**" for name in accused_names])
             
-            await channel.send(
+            await outbound.send(
+                channel,
                 f"🗣️ **{impostor.name}** says: \"I saw {players_list} near the body!\""
             )
         else:
-            await channel.send(
+            await outbound.send(
+                channel,
                 f"🗣️ **{impostor.name}** says: \"The area seemed empty when I found the body.\""
             )
         
         await trigger_meeting(game, channel, f"{impostor.name} (found body)", bot)
-    except Exception as e:
-        print(f"Error in schedule_impostor_self_report: {e}")
+    except Exception:
+        log.exception("Error in schedule_impostor_self_report")
 
 
 class BodyDiscoveryView(ui.View):
@@ -265,17 +266,20 @@ class BodyDiscoveryView(ui.View):
         
         room.remove_body(self.victim.name)
         
-        await self.channel.send(
+        await outbound.send(
+            self.channel,
             f"👁️ **{self.discoverer_name}** discovered **{self.victim.name}'s** body and called a meeting!"
         )
         
         if nearby_players:
             players_list = ", ".join([f"**{p}**" for p in nearby_players])
-            await self.channel.send(
+            await outbound.send(
+                self.channel,
                 f"🗣️ **{self.discoverer_name}** says: \"I saw {players_list} near the body!\""
             )
         else:
-            await self.channel.send(
+            await outbound.send(
+                self.channel,
                 f"🗣️ **{self.discoverer_name}** says: \"The area seemed empty when I found the body.\""
             )
 
@@ -318,21 +322,21 @@ class BodyDiscoveryView(ui.View):
         
         nearby_players = []
         
-        num_nearby = min(random.randint(2, 4), len(alive_players))
-        potential_nearby = random.sample(alive_players, num_nearby)
+        num_nearby = min(self.game.rng.randint(2, 4), len(alive_players))
+        potential_nearby = self.game.rng.sample(alive_players, num_nearby)
         
         impostor_included = False
         for impostor in impostors:
-            if random.random() < 0.80:
+            if self.game.rng.random() < 0.80:
                 if impostor not in potential_nearby:
                     if potential_nearby:
-                        potential_nearby[random.randint(0, len(potential_nearby) - 1)] = impostor
+                        potential_nearby[self.game.rng.randint(0, len(potential_nearby) - 1)] = impostor
                 impostor_included = True
                 break
         
         nearby_players = [p.name for p in potential_nearby if p.user_id != self.victim.user_id]
         
-        random.shuffle(nearby_players)
+        self.game.rng.shuffle(nearby_players)
         
         embed = discord.Embed(
             title="🔍 Investigation Results",
@@ -408,21 +412,21 @@ async def notify_body_discovery(
                         view = BodyDiscoveryView(bot, game, channel, victim, discoverer.name, room_name)
                         await safe_dm_user(user, embed=embed, view=view)
             except Exception as e:
-                print(f"Error sending body discovery DM to player: {e}")
+                log.warning("Error sending body discovery DM to player: %s", e)
         return
 
     # For bot kills or when no specific discoverer, decide what happens
     # 50% chance: bot crewmate reports, 50% chance: left for discovery
-    report_chance = random.random()
+    report_chance = game.rng.random()
     
     if report_chance < 0.50: 
         # Bot crewmate reports the body
         alive_bots = [p for p in game.alive_players() if p.user_id != victim.user_id and p.is_bot]
         
         if alive_bots:
-            discoverer = random.choice(alive_bots)
+            discoverer = game.rng.choice(alive_bots)
             
-            await asyncio.sleep(random.uniform(5, 10))
+            await asyncio.sleep(game.rng.uniform(5, 10))
             
             if game.phase != 'tasks':
                 return
@@ -438,66 +442,45 @@ async def notify_body_discovery(
                 
                 room.remove_body(victim.name)
                 
-                await channel.send(
+                await outbound.send(
+                    channel,
                     f"👁️ **{discoverer.name}** discovered **{victim.name}'s** body and called a meeting!"
                 )
                 
                 if nearby_players:
                     players_list = ", ".join([f"**{p}**" for p in nearby_players])
-                    await channel.send(
+                    await outbound.send(
+                        channel,
                         f"🗣️ **{discoverer.name}** says: \"I saw {players_list} near the body!\""
                     )
                 else:
-                    await channel.send(
+                    await outbound.send(
+                        channel,
                         f"🗣️ **{discoverer.name}** says: \"The area seemed empty when I found the body.\""
                     )
                 
                 
                 await trigger_meeting(game, channel, f"{discoverer.name} (found body)", bot)
-            except Exception as e:
-                print(f"Error in bot body discovery: {e}")
+            except Exception:
+                log.exception("Error in bot body discovery")
     # else: 50% chance - Leave the body for players to discover (do nothing)
 
 
 def _get_nearby_players(game, victim, discoverer) -> list[str]:
     body_location = victim.location if victim else discoverer.location
-    body_room = game.get_room(body_location)
     
-    if not body_room:
+    # Everything within 2 rooms in all directions (precomputed by the map layout)
+    nearby_rooms = game.map_layout.get_neighborhood(body_location, 2)
+    if not nearby_rooms:
         return []
     
-    # Extend search to 2 rooms in all directions
-    nearby_rooms = [body_location]
-    visited = {body_location}
-    
-    # First layer: directly connected rooms
-    if body_room.connected_rooms:
-        for room in body_room.connected_rooms:
-            if room not in visited:
-                nearby_rooms.append(room)
-                visited.add(room)
-    
-    # Second layer: rooms connected to first layer rooms
-    first_layer_rooms = nearby_rooms[1:].copy()  # Skip the body location itself
-    for room_name in first_layer_rooms:
-        room_obj = game.get_room(room_name)
-        if room_obj and room_obj.connected_rooms:
-            for connected_room in room_obj.connected_rooms:
-                if connected_room not in visited:
-                    nearby_rooms.append(connected_room)
-                    visited.add(connected_room)
-    
-    alive_players = game.alive_players()
-    players_in_nearby_rooms = [
-        p for p in alive_players 
-        if p.location in nearby_rooms 
-        and p.user_id != (victim.user_id if victim else None)
-        and p.user_id != discoverer.user_id
+    excluded_ids = {victim.user_id if victim else None, discoverer.user_id}
+    nearby_players = [
+        p.name for p in game.alive_players()
+        if p.location in nearby_rooms and p.user_id not in excluded_ids
     ]
-    
-    nearby_players = [p.name for p in players_in_nearby_rooms]
-    random.shuffle(nearby_players)
-    nearby_players = nearby_players[:random.randint(2, 4)]
+    game.rng.shuffle(nearby_players)
+    nearby_players = nearby_players[:game.rng.randint(2, 4)]
     return nearby_players
 
 
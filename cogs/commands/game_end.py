@@ -1,8 +1,12 @@
 """End game command"""
+import logging
 import discord
 from discord import app_commands
 from discord.ext import commands
 from typing import Optional
+from amongus.outbound import outbound
+
+log = logging.getLogger(__name__)
 
 
 class GameEndCog(commands.Cog):
@@ -15,7 +19,7 @@ class GameEndCog(commands.Cog):
     async def cog_load(self):
         if hasattr(self.bot, 'game_manager'):
             self.game_manager = getattr(self.bot, 'game_manager')
-        print('GameEndCog loaded')
+        log.info('GameEndCog loaded')
     
     @app_commands.command(name='endgame', description='End the current game (host only)')
     async def endgame(self, interaction: discord.Interaction):
@@ -54,9 +58,9 @@ class GameEndCog(commands.Cog):
         if self.game_manager:
             try:
                 await self.game_manager.delete_game(ch_id)
-                print(f'✅ Deleted game from database for channel {ch_id}')
+                log.info('Deleted game from database for channel %s', ch_id)
             except Exception as e:
-                print(f'⚠️  Error deleting game from database: {e}')
+                log.warning('Error deleting game from database: %s', e)
         
         if ch_id in self.games:
             del self.games[ch_id]
@@ -66,6 +70,8 @@ class GameEndCog(commands.Cog):
             'Use `/create` to start a new lobby.',
             ephemeral=False
         )
+        
+        outbound.forget(ch_id)
 
 
 async def setup(bot: commands.Bot):
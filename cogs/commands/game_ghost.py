@@ -1,21 +1,13 @@
 """Ghost chat for dead players"""
+import logging
 import discord
 import asyncio
 from discord import app_commands
 from discord.ext import commands
 from typing import cast
+from .game_utils import safe_dm_user
 
-
-async def safe_dm_user(user: discord.User | discord.Member, **kwargs):
-    for attempt in range(7):
-        try:
-            await user.send(**kwargs)
-            return
-        except discord.errors.HTTPException:
-            if attempt < 6:
-                await asyncio.sleep(3)
-            else:
-                pass
+log = logging.getLogger(__name__)
 
 
 class GhostChatCog(commands.Cog):
@@ -26,7 +18,7 @@ class GhostChatCog(commands.Cog):
         self.games = getattr(bot, 'amongus_games', {})
         
     async def cog_load(self):
-        print('GhostChatCog loaded')
+        log.info('GhostChatCog loaded')
         
     @app_commands.command(name='ghostchat', description='Send a message to other dead players')
     @app_commands.describe(message='Your message to other ghosts')
@@ -1,7 +1,10 @@
+import logging
 import discord
 from discord import app_commands
 from discord.ext import commands
 
+log = logging.getLogger(__name__)
+
 
 class ImpostorsCog(commands.Cog):
 
@@ -10,7 +13,7 @@ class ImpostorsCog(commands.Cog):
         self.games = getattr(bot, 'amongus_games', {})
 
     async def cog_load(self):
-        print('ImpostorsCog loaded')
+        log.info('ImpostorsCog loaded')
 
     @app_commands.command(name='impostors', description='View your fellow impostors (Impostors only)')
     async def impostors(self, interaction: discord.Interaction):
@@ -1,22 +1,12 @@
+import logging
 import discord
 from discord import app_commands, ui
 from discord.ext import commands
-import asyncio
-import random
 from typing import cast
-from .game_utils import check_and_announce_winner
+from amongus.encoding import image_filename
+from .game_utils import check_and_announce_winner, safe_dm_user
 
-
-async def safe_dm_user(user: discord.User | discord.Member, **kwargs):
-    for attempt in range(7):
-        try:
-            await user.send(**kwargs)
-            return
-        except discord.errors.HTTPException:
-            if attempt < 6:
-                await asyncio.sleep(3)
-            else:
-                pass
+log = logging.getLogger(__name__)
 
 
 class WitnessView(ui.View):
@@ -119,14 +109,11 @@ class KillView(ui.View):
         alive_crewmates = [p for p in game.alive_crewmates() if not p.is_bot or True]
         
         if not from_vent:
-            current_room = game.get_room(killer.location)
-            connected_rooms = [killer.location]
-            if current_room and current_room.connected_rooms:
-                connected_rooms.extend(current_room.connected_rooms)
+            connected_rooms = game.map_layout.get_neighborhood(killer.location, 1) or {killer.location}
             alive_crewmates = [p for p in alive_crewmates if p.location in connected_rooms]
         
         if from_vent and len(alive_crewmates) > 3:
-            alive_crewmates = random.sample(alive_crewmates, random.randint(2, 3))
+            alive_crewmates = game.rng.sample(alive_crewmates, game.rng.randint(2, 3))
 
         for crewmate in alive_crewmates[:10]:
             button = ui.Button(
@@ -165,7 +152,7 @@ class KillView(ui.View):
                                 )
                                 await safe_dm_user(guardian_user, embed=embed)
                     except Exception as e:
-                        print(f"Error notifying guardian: {e}")
+                        log.warning("Error notifying guardian: %s", e)
                 
                 if not target.is_bot:
                     try:
@@ -180,15 +167,13 @@ class KillView(ui.View):
                                 )
                                 await safe_dm_user(protected_user, embed=embed)
                     except Exception as e:
-                        print(f"Error notifying protected player: {e}")
+                        log.warning("Error notifying protected player: %s", e)
                 
                 self.stop()
                 return
             
-            target.alive = False
+            self.game.kill_player(self.killer, target)
             self.killer.kill_cooldown = self.game.kill_cooldown
-
-            self.game.add_body_to_room(self.killer.location, target.name)
             
             # Update global kill timestamp
             import time
@@ -209,7 +194,7 @@ class KillView(ui.View):
                         f"💀 **Someone has been killed!** The crew is down to {len(self.game.alive_players())} players..."
                     )
                 except Exception as e:
-                    print(f"Error sending kill message: {e}")
+                    log.warning("Error sending kill message: %s", e)
 
                 if witnesses:
                     for witness in witnesses:
@@ -241,7 +226,7 @@ class KillView(ui.View):
                                 view = WitnessView(self.bot, self.game, interaction.channel, target, self.killer.name, self.killer.location)
                                 await safe_dm_user(witness_user, embed=embed, view=view)
                         except Exception as e:
-                            print(f"Error DMing witness: {e}")
+                            log.warning("Error DMing witness: %s", e)
 
                 if not target.is_bot and interaction.guild:
                     try:
@@ -250,18 +235,18 @@ class KillView(ui.View):
                         victim_user = interaction.guild.get_member(target.user_id)
                         if victim_user:
                             card_buffer = await create_death_card(target.name, target.avatar_url)
-                            file = discord.File(card_buffer, filename="death.png")
+                            file = discord.File(card_buffer, filename=image_filename(card_buffer, "death"))
                             
                             embed = discord.Embed(
                                 title="💀 You Have Been Killed!",
                                 description=f"You were eliminated by an impostor.\n\nYou can still help your team by completing tasks as a ghost!",
                                 color=discord.Color.dark_red()
                             )
-                            embed.set_image(url="attachment://death.png")
+                            embed.set_image(url=f"attachment://{file.filename}")
                             
                             await safe_dm_user(victim_user, embed=embed, file=file)
                     except Exception as e:
-                        print(f"Error DMing victim: {e}")
+                        log.warning("Error DMing victim: %s", e)
 
                 try:
                     killer_user = None
@@ -296,13 +281,13 @@ class KillView(ui.View):
                         
                         await safe_dm_user(killer_user, embed=embed, view=view)
                 except Exception as e:
-                    print(f"Error sending impostor body discovery: {e}")
+                    log.warning("Error sending impostor body discovery: %s", e)
 
                 try:
                     from .game_bodies import notify_body_discovery
                     
                     if self.from_vent:
-                        if random.random() < 0.20:
+                        if self.game.rng.random() < 0.20:
                             await notify_body_discovery(
                                 self.bot,
                                 self.game,
@@ -318,8 +303,8 @@ class KillView(ui.View):
                             target,
                             self.killer.name,
                         )
-                except Exception as e:
-                    print(f"Error in kill notification: {e}")
+                except Exception:
+                    log.exception("Error in kill notification")
 
             await interaction.edit_original_response(
                 content=f"🔪 You killed **{target.name}**!\nKill cooldown: {self.game.kill_cooldown}s",
@@ -337,19 +322,9 @@ class KillCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.games = getattr(bot, "amongus_games", {})
-        asyncio.create_task(self._cooldown_loop())
 
     async def cog_load(self):
-        print("KillCog loaded")
-
-    async def _cooldown_loop(self):
-        while True:
-            await asyncio.sleep(1)
-            for game in self.games.values():
-                if game.phase == "tasks":
-                    for player in game.players.values():
-                        if player.role == "Impostor" and player.kill_cooldown > 0:
-                            player.kill_cooldown -= 1
+        log.info("KillCog loaded")
 
     @app_commands.command(name="kill", description="Kill a nearby player (Impostors only)")
     async def kill(self, interaction: discord.Interaction):
@@ -408,7 +383,7 @@ class KillCog(commands.Cog):
 
         from_vent = player.in_vent
         if from_vent and interaction.channel and isinstance(interaction.channel, discord.TextChannel):
-            if random.random() < 0.05:
+            if game.rng.random() < 0.05:
                 try:
                     await interaction.channel.send(
                         f"👀 Someone noticed movement near the vents in **{player.location}**..."
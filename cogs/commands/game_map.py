@@ -1,7 +1,9 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
+from amongus.attachments import send_embed_image
 from amongus.map_renderer import create_map_image
+from amongus.singleflight import render_image_sync
 from .game_bodies import notify_body_discovery
 
 
@@ -119,14 +121,15 @@ class MapCog(commands.Cog):
         current_room = player.location
         room_obj = game.get_room(current_room)
         
-        sabotaged_rooms = []
-        if game.active_sabotage:
-            sabotaged_rooms = [game.active_sabotage]
+        # The render pool gets its own copies, built now, not the live game state
+        sabotaged_rooms = (game.active_sabotage,) if game.active_sabotage else ()
         
-        map_buffer = create_map_image(
-            player_room=current_room,
-            sabotaged_rooms=sabotaged_rooms,
-            map_layout=game.map_layout
+        map_buffer = await render_image_sync(
+            ("map", current_room, sabotaged_rooms),
+            create_map_image,
+            current_room,
+            sabotaged_rooms,
+            game.map_layout.snapshot()
         )
         
         embed = discord.Embed(
@@ -158,10 +161,7 @@ class MapCog(commands.Cog):
                     inline=False
                 )
         
-        file = discord.File(fp=map_buffer, filename="map.png")
-        embed.set_image(url="attachment://map.png")
-        
-        await interaction.followup.send(embed=embed, file=file, ephemeral=True)
+        await send_embed_image(interaction.followup.send, embed, map_buffer, "map", ephemeral=True)
 
     @app_commands.command(name='whereami', description='Show your current location and available commands')
     async def whereami(self, interaction: discord.Interaction):
@@ -1,18 +1,24 @@
 """Meeting and voting commands"""
 
+import logging
 import discord
 from discord import app_commands
 from discord.ext import commands
 import asyncio
-import random
+from functools import partial
 from amongus.core import AmongUsGame
+from amongus.attachments import send_embed_image
+from amongus.outbound import outbound
+from amongus.singleflight import render_image_sync
 from amongus.card_generator import (
-    create_emergency_meeting_card,
-    create_vote_result_card,
+    render_emergency_meeting_card,
+    render_vote_result_card,
 )
 from .game_utils import check_and_announce_winner
 from typing import cast, Optional
 
+log = logging.getLogger(__name__)
+
 
 def validate_player_in_game(
     interaction: discord.Interaction, games: dict, alive_required: bool = True
@@ -40,23 +46,9 @@ class MeetingCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.games = getattr(bot, "amongus_games", {})
-        
-        asyncio.create_task(self._meeting_cooldown_loop())
 
     async def cog_load(self):
-        print("MeetingCog loaded")
-    
-    async def _meeting_cooldown_loop(self):
-        """Reduce meeting cooldowns every second"""
-        try:
-            while True:
-                await asyncio.sleep(1)
-                for game in list(self.games.values()):  # Use list() to avoid dict change during iteration
-                    if game.phase == "tasks" and game.meeting_cooldown > 0:
-                        game.meeting_cooldown -= 1
-        except asyncio.CancelledError:
-            # Task cancelled, exit gracefully
-            pass
+        log.info("MeetingCog loaded")
 
     @app_commands.command(name="meeting", description="Call an emergency meeting")
     async def emergency_meeting(self, interaction: discord.Interaction):
@@ -199,7 +191,7 @@ class MeetingCog(commands.Cog):
 
 async def _bot_voting_behavior(game: AmongUsGame, channel: discord.TextChannel):
     """Make bots vote intelligently during meetings"""
-    await asyncio.sleep(random.uniform(5, 15))
+    await asyncio.sleep(game.rng.uniform(5, 15))
     
     if game.phase == "ended":
         return
@@ -219,18 +211,16 @@ async def _bot_voting_behavior(game: AmongUsGame, channel: discord.TextChannel):
                 break
     
     for bot in alive_bots:
-        await asyncio.sleep(random.uniform(2, 8))
+        rng = game.rng_for(bot)
+        await asyncio.sleep(rng.uniform(2, 8))
         
         if game.phase != "meeting" or game.phase == "ended":
             return
         
         # 10% chance to vote for the person who called the meeting (adds risk to self-reporting)
-        if meeting_caller and meeting_caller.user_id != bot.user_id and random.random() < 0.18:
+        if meeting_caller and meeting_caller.user_id != bot.user_id and rng.random() < 0.18:
             await game.cast_vote(bot.user_id, meeting_caller.user_id)
-            try:
-                await channel.send(f"🗳️ **{bot.name}** voted for **{meeting_caller.name}**.")
-            except:
-                pass
+            outbound.post(channel, f"🗳️ **{bot.name}** voted for **{meeting_caller.name}**.")
             continue  # Skip rest of voting logic for this bot
         
         if bot.role == "Impostor":
@@ -239,26 +229,17 @@ async def _bot_voting_behavior(game: AmongUsGame, channel: discord.TextChannel):
             nearby_names = game.nearby_players_last_meeting if hasattr(game, 'nearby_players_last_meeting') else []
             nearby_crewmates = [p for p in crewmates if p.name in nearby_names]
             
-            if nearby_crewmates and random.random() < 0.65:
-                target = random.choice(nearby_crewmates)
+            if nearby_crewmates and rng.random() < 0.65:
+                target = rng.choice(nearby_crewmates)
                 await game.cast_vote(bot.user_id, target.user_id)
-                try:
-                    await channel.send(f"🗳️ **{bot.name}** voted for **{target.name}**.")
-                except:
-                    pass
-            elif random.random() < 0.4:
+                outbound.post(channel, f"🗳️ **{bot.name}** voted for **{target.name}**.")
+            elif rng.random() < 0.4:
                 await game.cast_vote(bot.user_id, -1)
-                try:
-                    await channel.send(f"🤷 **{bot.name}** voted to skip.")
-                except:
-                    pass
+                outbound.post(channel, f"🤷 **{bot.name}** voted to skip.")
             elif crewmates:
-                target = random.choice(crewmates)
+                target = rng.choice(crewmates)
                 await game.cast_vote(bot.user_id, target.user_id)
-                try:
-                    await channel.send(f"🗳️ **{bot.name}** voted for **{target.name}**.")
-                except:
-                    pass
+                outbound.post(channel, f"🗳️ **{bot.name}** voted for **{target.name}**.")
         else:
             other_players = [p for p in alive_players if p.user_id != bot.user_id]
             
@@ -266,27 +247,18 @@ async def _bot_voting_behavior(game: AmongUsGame, channel: discord.TextChannel):
             nearby_targets = [p for p in other_players if p.name in nearby_names]
             far_targets = [p for p in other_players if p.name not in nearby_names]
             
-            if nearby_targets and random.random() < 0.75:
+            if nearby_targets and rng.random() < 0.75:
                 weights = [2.7 if p in nearby_targets else 0.5 for p in other_players]
-                target = random.choices(other_players, weights=weights, k=1)[0]
+                target = rng.choices(other_players, weights=weights, k=1)[0]
                 await game.cast_vote(bot.user_id, target.user_id)
-                try:
-                    await channel.send(f"🗳️ **{bot.name}** voted for **{target.name}**.")
-                except:
-                    pass
-            elif random.random() < 0.35:
+                outbound.post(channel, f"🗳️ **{bot.name}** voted for **{target.name}**.")
+            elif rng.random() < 0.35:
                 await game.cast_vote(bot.user_id, -1)
-                try:
-                    await channel.send(f"🤷 **{bot.name}** voted to skip.")
-                except:
-                    pass
+                outbound.post(channel, f"🤷 **{bot.name}** voted to skip.")
             elif other_players:
-                target = random.choice(other_players)
+                target = rng.choice(other_players)
                 await game.cast_vote(bot.user_id, target.user_id)
-                try:
-                    await channel.send(f"🗳️ **{bot.name}** voted for **{target.name}**.")
-                except:
-                    pass
+                outbound.post(channel, f"🗳️ **{bot.name}** voted for **{target.name}**.")
 
 
 async def trigger_meeting(
@@ -303,8 +275,11 @@ async def trigger_meeting(
     game.meeting_caller_name = caller_name
 
     # Create meeting card
-    card_buffer = await create_emergency_meeting_card(caller_name)
-    file = discord.File(card_buffer, filename="meeting.png")
+    card_buffer = await render_image_sync(
+        ("meeting_card", caller_name),
+        render_emergency_meeting_card,
+        caller_name
+    )
 
     embed = discord.Embed(
         title="⚠️ EMERGENCY MEETING ⚠️",
@@ -318,59 +293,46 @@ async def trigger_meeting(
         ),
         color=discord.Color.red(),
     )
-    embed.set_image(url="attachment://meeting.png")
 
-    await channel.send(embed=embed, file=file)
+    await send_embed_image(partial(outbound.send, channel), embed, card_buffer, "meeting")
 
     # Bots vote with AI behavior
-    asyncio.create_task(_bot_voting_behavior(game, channel))
+    game.tasks.spawn(_bot_voting_behavior(game, channel))
 
-    # Wait for votes - check every 2 seconds if everyone voted, or 300s timeout
-    elapsed = 0
+    # Wait until everyone has voted or the 5 minute deadline passes
     max_time = 300  # 5 minutes
-    check_interval = 2
+    all_voted = await game.wait_for_votes(max_time)
     
-    while elapsed < max_time:
-        await asyncio.sleep(check_interval)
-        elapsed += check_interval
-        
-        # Check if game ended (interrupted by win condition)
-        if game.phase == "ended":
-            return  # Meeting cancelled, game ended
-        
-        # Check if everyone has voted
-        alive_players = game.alive_players()
-        votes_cast = len(game.votes)
-        
-        if votes_cast >= len(alive_players):
-            # Everyone has voted, end early
-            await channel.send(f"✅ All players have voted! Ending meeting early...")
-            break
-    
-    # Check again if game ended before tallying
+    # Meeting cancelled if the game ended (interrupted by win condition)
     if game.phase == "ended":
         return
     
-    if elapsed >= max_time:
-        await channel.send("⏰ Time's up! Tallying votes...")
+    if all_voted:
+        await outbound.send(channel, f"✅ All players have voted! Ending meeting early...")
+    else:
+        await outbound.send(channel, "⏰ Time's up! Tallying votes...")
 
     # Tally votes
     voted_player_id = await game.tally_votes()
 
     if voted_player_id is None or voted_player_id not in game.players:
-        await channel.send("🤷 **No one was ejected.** (Tie or skipped)")
+        await outbound.send(channel, "🤷 **No one was ejected.** (Tie or skipped)")
     else:
         voted_player = game.players[voted_player_id]
-        vote_count = sum(1 for v in game.votes.values() if v == voted_player_id)
+        vote_count = game.vote_counts.get(voted_player_id, 0)
 
         # Create ejection card
-        card_buffer = await create_vote_result_card(
-            voted_player.name, vote_count, voted_player.role == "Impostor"
+        was_impostor = voted_player.role == "Impostor"
+        card_buffer = await render_image_sync(
+            ("vote_result_card", voted_player.name, vote_count, was_impostor),
+            render_vote_result_card,
+            voted_player.name,
+            vote_count,
+            was_impostor
         )
-        file = discord.File(card_buffer, filename="ejection.png")
 
         # Eject player
-        voted_player.alive = False
+        game.eject_player(voted_player, vote_count)
 
         embed = discord.Embed(
             title="🚀 Ejection",
@@ -380,9 +342,8 @@ async def trigger_meeting(
                 else discord.Color.blue()
             ),
         )
-        embed.set_image(url="attachment://ejection.png")
 
-        await channel.send(embed=embed, file=file)
+        await send_embed_image(partial(outbound.send, channel), embed, card_buffer, "ejection")
 
     if not await check_and_announce_winner(game, channel, "meeting", bot):
         game.phase = "tasks"
@@ -394,7 +355,7 @@ async def trigger_meeting(
                 player.kill_cooldown = 40
                 player.sabotage_cooldown = 40
         
-        await channel.send("🔧 Back to tasks!")
+        await outbound.send(channel, "🔧 Back to tasks!")
 
 
 async def setup(bot: commands.Bot):
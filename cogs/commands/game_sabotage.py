@@ -1,13 +1,20 @@
 """Sabotage system for impostors"""
 
+import logging
 import discord
 from discord import app_commands, ui
 from discord.ext import commands
-import asyncio
 import random
 from typing import cast, Optional, Literal
+from amongus.outbound import outbound
+from amongus.timers import TimerHandle, timer_wheel
 from .game_utils import check_and_announce_winner
 
+log = logging.getLogger(__name__)
+
+# Seconds before an unfixed sabotage takes effect (or auto-resolves, for doors/comms)
+SABOTAGE_DURATIONS = {"o2": 60, "reactor": 45, "electrical": 90, "doors": 10, "communications": 45}
+
 
 class SabotageView(ui.View):
     """Interactive sabotage UI for impostors"""
@@ -37,16 +44,14 @@ class SabotageView(ui.View):
         await interaction.response.send_message(
             "⚡ Electrical sabotaged!", ephemeral=True
         )
-        await self.channel.send(
+        await outbound.send(
+            self.channel,
             "🚨 **SABOTAGE!** ⚡ **ELECTRICAL FAILURE**\n"
             "Crewmates must fix the lights! Use `/fixsabotage electrical`"
         )
 
         self.game.active_sabotage = "electrical"
-        task = asyncio.create_task(self._sabotage_timer())
-        if hasattr(self.game, 'background_tasks'):
-            self.game.background_tasks.add(task)
-            task.add_done_callback(lambda t: self.game.background_tasks.discard(t) if hasattr(self.game, 'background_tasks') else None)
+        self._start_sabotage_timer()
 
     @ui.button(label="🔴 O2", style=discord.ButtonStyle.danger, emoji="💨")
     async def oxygen(self, interaction: discord.Interaction, button: ui.Button):
@@ -64,16 +69,14 @@ class SabotageView(ui.View):
             self.game.players[uid].sabotage_cooldown = self.game.kill_cooldown
 
         await interaction.response.send_message("💨 O2 sabotaged!", ephemeral=True)
-        await self.channel.send(
+        await outbound.send(
+            self.channel,
             "🚨 **SABOTAGE!** 🔴 **OXYGEN DEPLETION**\n"
             "Crewmates have 60 seconds to fix O2! Use `/fixsabotage o2`"
         )
 
         self.game.active_sabotage = "o2"
-        task = asyncio.create_task(self._sabotage_timer())
-        if hasattr(self.game, 'background_tasks'):
-            self.game.background_tasks.add(task)
-            task.add_done_callback(lambda t: self.game.background_tasks.discard(t) if hasattr(self.game, 'background_tasks') else None)
+        self._start_sabotage_timer()
 
     @ui.button(label="🚪 Doors", style=discord.ButtonStyle.secondary, emoji="🔒")
     async def doors(self, interaction: discord.Interaction, button: ui.Button):
@@ -91,16 +94,14 @@ class SabotageView(ui.View):
             self.game.players[uid].sabotage_cooldown = self.game.kill_cooldown
 
         await interaction.response.send_message("🔒 Doors locked!", ephemeral=True)
-        await self.channel.send(
+        await outbound.send(
+            self.channel,
             "🚨 **SABOTAGE!** 🚪 **DOORS LOCKED**\n"
             "Movement and fast travel are restricted for 10 seconds!"
         )
 
         self.game.active_sabotage = "doors"
-        task = asyncio.create_task(self._sabotage_timer())
-        if hasattr(self.game, 'background_tasks'):
-            self.game.background_tasks.add(task)
-            task.add_done_callback(lambda t: self.game.background_tasks.discard(t) if hasattr(self.game, 'background_tasks') else None)
+        self._start_sabotage_timer()
 
     @ui.button(label="📡 Communications", style=discord.ButtonStyle.danger, emoji="📶")
     async def communications(self, interaction: discord.Interaction, button: ui.Button):
@@ -118,17 +119,15 @@ class SabotageView(ui.View):
             self.game.players[uid].sabotage_cooldown = self.game.kill_cooldown
 
         await interaction.response.send_message("📡 Communications sabotaged!", ephemeral=True)
-        await self.channel.send(
+        await outbound.send(
+            self.channel,
             "🚨 **SABOTAGE!** 📡 **COMMUNICATIONS OFFLINE**\n"
             "⚠️ Task lists and locations are hidden!\n"
             "Crewmates must fix communications! Use `/fixsabotage communications`"
         )
 
         self.game.active_sabotage = "communications"
-        task = asyncio.create_task(self._sabotage_timer())
-        if hasattr(self.game, 'background_tasks'):
-            self.game.background_tasks.add(task)
-            task.add_done_callback(lambda t: self.game.background_tasks.discard(t) if hasattr(self.game, 'background_tasks') else None)
+        self._start_sabotage_timer()
 
     @ui.button(label="☢️ Reactor", style=discord.ButtonStyle.danger, emoji="⚛️")
     async def reactor(self, interaction: discord.Interaction, button: ui.Button):
@@ -146,66 +145,58 @@ class SabotageView(ui.View):
             self.game.players[uid].sabotage_cooldown = self.game.kill_cooldown
 
         await interaction.response.send_message("☢️ Reactor sabotaged!", ephemeral=True)
-        await self.channel.send(
+        await outbound.send(
+            self.channel,
             "🚨 **SABOTAGE!** ☢️ **REACTOR MELTDOWN**\n"
             "Crewmates have 45 seconds to stabilize the reactor! Use `/fixsabotage reactor`"
         )
 
         self.game.active_sabotage = "reactor"
-        task = asyncio.create_task(self._sabotage_timer())
-        if hasattr(self.game, 'background_tasks'):
-            self.game.background_tasks.add(task)
-            task.add_done_callback(lambda t: self.game.background_tasks.discard(t) if hasattr(self.game, 'background_tasks') else None)
-
-    async def _sabotage_timer(self):
-        """Handle sabotage timer and auto-fix"""
-        try:
-            if self.game.active_sabotage == "o2":
-                await asyncio.sleep(60)
-                if self.game.active_sabotage == "o2" and self.game.phase != "ended":
-
-                    self.game.active_sabotage = None
-                    await check_and_announce_winner(
-                        self.game,
-                        self.channel,
-                        "sabotageO2 ran out! Crewmates failed to fix the sabotage in time!",
-                        self.bot
-                    )
-            elif self.game.active_sabotage == "reactor":
-                await asyncio.sleep(45)
-                if self.game.active_sabotage == "reactor" and self.game.phase != "ended":
-
-                    self.game.active_sabotage = None
-                    await check_and_announce_winner(
-                        self.game,
-                        self.channel,
-                        "sabotageReactor meltdown! Crewmates failed to stabilize in time!",
-                        self.bot
-                    )
-            elif self.game.active_sabotage == "electrical":
-                await asyncio.sleep(90)
-                if self.game.active_sabotage == "electrical" and self.game.phase != "ended":
-
-                    self.game.active_sabotage = None
-                    await check_and_announce_winner(
-                        self.game,
-                        self.channel,
-                        "sabotageElectrical failure caused critical systems to fail!",
-                        self.bot
-                    )
-            elif self.game.active_sabotage == "doors":
-                await asyncio.sleep(10)
-                if self.game.active_sabotage == "doors" and self.game.phase != "ended":
-                    await self.channel.send("🔓 Doors automatically unlocked!")
-                    self.game.active_sabotage = None
-            elif self.game.active_sabotage == "communications":
-                await asyncio.sleep(45)
-                if self.game.active_sabotage == "communications" and self.game.phase != "ended":
-                    await self.channel.send("📡 Communications automatically restored!")
-                    self.game.active_sabotage = None
-        except asyncio.CancelledError:
-
-            pass
+        self._start_sabotage_timer()
+
+    def _start_sabotage_timer(self):
+        """Schedule the active sabotage's deadline on the shared timer wheel"""
+        sabotage = self.game.active_sabotage
+        self.game.sabotage_deadline = timer_wheel.call_later(
+            SABOTAGE_DURATIONS[sabotage],
+            lambda: self.game.tasks.spawn(self._sabotage_expired(sabotage)),
+        )
+
+    async def _sabotage_expired(self, sabotage: str):
+        """Handle sabotage timeout and auto-fix"""
+        if self.game.active_sabotage != sabotage or self.game.phase == "ended":
+            return
+
+        if sabotage == "o2":
+            self.game.active_sabotage = None
+            await check_and_announce_winner(
+                self.game,
+                self.channel,
+                "sabotageO2 ran out! Crewmates failed to fix the sabotage in time!",
+                self.bot
+            )
+        elif sabotage == "reactor":
+            self.game.active_sabotage = None
+            await check_and_announce_winner(
+                self.game,
+                self.channel,
+                "sabotageReactor meltdown! Crewmates failed to stabilize in time!",
+                self.bot
+            )
+        elif sabotage == "electrical":
+            self.game.active_sabotage = None
+            await check_and_announce_winner(
+                self.game,
+                self.channel,
+                "sabotageElectrical failure caused critical systems to fail!",
+                self.bot
+            )
+        elif sabotage == "doors":
+            await outbound.send(self.channel, "🔓 Doors automatically unlocked!")
+            self.game.active_sabotage = None
+        elif sabotage == "communications":
+            await outbound.send(self.channel, "📡 Communications automatically restored!")
+            self.game.active_sabotage = None
 
 
 class FixSabotageView(ui.View):
@@ -223,27 +214,24 @@ class FixSabotageView(ui.View):
 
         base_time = 20.0
         self.fix_time = base_time / player.sabotage_fix_speed
-        self.time_remaining = self.fix_time
-        self.timer_task = None
+        self.deadline: Optional[TimerHandle] = None
+
+    @property
+    def time_remaining(self) -> float:
+        if self.deadline is None:
+            return self.fix_time
+        return self.deadline.remaining()
 
     async def start_timer(self, interaction: discord.Interaction):
         """Start the countdown timer"""
         self.started = True
-        self.timer_task = asyncio.create_task(self._countdown())
+        self.deadline = timer_wheel.call_later(self.fix_time, self._time_up)
     
-    async def _countdown(self):
-        """Countdown timer that updates the message"""
-        try:
-            while self.time_remaining > 0 and not self.failed:
-                await asyncio.sleep(1)
-                self.time_remaining -= 1
-                
-            if self.time_remaining <= 0 and not self.failed:
-
-                self.failed = True
-                self.stop()
-        except asyncio.CancelledError:
-            pass
+    def _time_up(self):
+        """Fix deadline passed before both parts were done"""
+        if not self.failed:
+            self.failed = True
+            self.stop()
 
     def _get_progress_bar(self) -> str:
         """Generate a progress bar for the timer"""
@@ -271,8 +259,8 @@ class FixSabotageView(ui.View):
 
         if self.progress >= 2:
 
-            if self.timer_task:
-                self.timer_task.cancel()
+            if self.deadline:
+                self.deadline.cancel()
             
             await interaction.response.edit_message(
                 content="✅ Sabotage fixed!", view=None
@@ -284,7 +272,8 @@ class FixSabotageView(ui.View):
             if self.player.role == 'Engineer':
                 bonus_msg = " ⚙️ *Engineer speed bonus applied!*"
             
-            await self.channel.send(
+            await outbound.send(
+                self.channel,
                 f"✅ **{interaction.user.display_name}** fixed the {self.sabotage_type} sabotage!{bonus_msg}"
             )
         else:
@@ -309,8 +298,8 @@ class FixSabotageView(ui.View):
 
         if self.progress >= 2:
 
-            if self.timer_task:
-                self.timer_task.cancel()
+            if self.deadline:
+                self.deadline.cancel()
             
             await interaction.response.edit_message(
                 content="✅ Sabotage fixed!", view=None
@@ -323,7 +312,8 @@ class FixSabotageView(ui.View):
             if self.player.role == 'Engineer':
                 bonus_msg = " ⚙️ *Engineer speed bonus applied!*"
             
-            await self.channel.send(
+            await outbound.send(
+                self.channel,
                 f"✅ **{interaction.user.display_name}** fixed the {self.sabotage_type} sabotage!{bonus_msg}"
             )
         else:
@@ -341,20 +331,9 @@ class SabotageCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.games = getattr(bot, "amongus_games", {})
-        
-        asyncio.create_task(self._sabotage_cooldown_loop())
 
     async def cog_load(self):
-        print("SabotageCog loaded")
-
-    async def _sabotage_cooldown_loop(self):
-        while True:
-            await asyncio.sleep(1)
-            for game in self.games.values():
-                if game.phase == "tasks":
-                    for player in game.players.values():
-                        if player.role == "Impostor" and player.sabotage_cooldown > 0:
-                            player.sabotage_cooldown -= 1
+        log.info("SabotageCog loaded")
 
     @app_commands.command(
         name="sabotage", description="Sabotage systems (Impostors only)"
@@ -1,16 +1,11 @@
+import logging
 import discord
 from discord import app_commands, ui
 from discord.ext import commands
-import asyncio
 from typing import cast
+from .game_utils import safe_dm_user
 
-
-async def safe_dm_user(user: discord.User | discord.Member, **kwargs):
-    try:
-        await user.send(**kwargs)
-        return True
-    except (discord.Forbidden, discord.HTTPException):
-        return False
+log = logging.getLogger(__name__)
 
 
 class ShieldView(ui.View):
@@ -75,7 +70,7 @@ class ShieldView(ui.View):
                                 embed.set_footer(text="The shield will break after blocking one attack.")
                                 await safe_dm_user(target_user, embed=embed)
                     except Exception as e:
-                        print(f"Error notifying shielded player: {e}")
+                        log.warning("Error notifying shielded player: %s", e)
             
             self.stop()
 
@@ -86,19 +81,9 @@ class ShieldCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.games = getattr(bot, "amongus_games", {})
-        asyncio.create_task(self._cooldown_loop())
 
     async def cog_load(self):
-        print("ShieldCog loaded")
-
-    async def _cooldown_loop(self):
-        while True:
-            await asyncio.sleep(1)
-            for game in self.games.values():
-                if game.phase == "tasks":
-                    for player in game.players.values():
-                        if player.role == "Guardian Angel" and player.shield_cooldown > 0:
-                            player.shield_cooldown -= 1
+        log.info("ShieldCog loaded")
 
     @app_commands.command(name="shield", description="Cast a protective shield on a player anywhere on the map (Guardian Angels only)")
     async def shield(self, interaction: discord.Interaction):
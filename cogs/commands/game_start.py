@@ -1,26 +1,16 @@
 """Game start and initialization commands"""
 
+import logging
 import discord
 from discord import app_commands
 from discord.ext import commands
 import asyncio
-import random
 from amongus.core import AmongUsGame
+from amongus.dm import dm_service
 from typing import cast
 from .game_utils import start_game_loops
 
-
-
-async def safe_dm_user(user: discord.User | discord.Member, **kwargs):
-    for attempt in range(7):
-        try:
-            await user.send(**kwargs)
-            return
-        except discord.errors.HTTPException:
-            if attempt < 6:
-                await asyncio.sleep(3)
-            else:
-                pass
+log = logging.getLogger(__name__)
 
 
 class GameStartCog(commands.Cog):
@@ -59,21 +49,22 @@ class GameStartCog(commands.Cog):
 
         await game.add_dummies_if_needed()
         
-        import random
         all_rooms = list(game.map_layout.rooms.keys())
         available_rooms = all_rooms.copy()
         
         for player in game.players.values():
             if not player.is_bot:
                 if available_rooms:
-                    spawn_room = random.choice(available_rooms)
+                    spawn_room = game.rng.choice(available_rooms)
                     available_rooms.remove(spawn_room)
                 else:
-                    spawn_room = random.choice(all_rooms)
+                    spawn_room = game.rng.choice(all_rooms)
                 
                 player.location = spawn_room
 
         game.phase = "tasks"
+        game.open_event_log()
+        log.info("Game %s started with seed %d", game.game_code, game.seed)
         
         import time
         game.game_start_time = time.time()
@@ -88,6 +79,7 @@ class GameStartCog(commands.Cog):
         guardian_angel_count = sum(1 for p in game.players.values() if p.role == 'Guardian Angel')
         impostor_count = sum(1 for p in game.players.values() if p.role == 'Impostor')
 
+        impostor_dms = []
         for impostor in game.players.values():
             if impostor.role == "Impostor" and not impostor.is_bot:
                 other_impostors = [
@@ -114,7 +106,7 @@ class GameStartCog(commands.Cog):
 
                     user = interaction.guild.get_member(impostor.user_id) if interaction.guild else None
                     if user:
-                        await safe_dm_user(user, embed=embed)
+                        impostor_dms.append((user, {"embed": embed}))
                 else:
                     embed = discord.Embed(
                         title="🔪 Solo Impostor",
@@ -124,7 +116,9 @@ class GameStartCog(commands.Cog):
 
                     user = interaction.guild.get_member(impostor.user_id) if interaction.guild else None
                     if user:
-                        await safe_dm_user(user, embed=embed)
+                        impostor_dms.append((user, {"embed": embed}))
+
+        await dm_service.fan_out(impostor_dms)
 
         role_summary = f"🎮 **Game Started!**\n" \
                       f"Players: {len(game.players)}\n" \
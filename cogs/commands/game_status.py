@@ -1,7 +1,11 @@
 """Game status and progress tracking"""
+import logging
 import discord
 from discord import app_commands
 from discord.ext import commands
+from amongus.encoding import image_filename
+
+log = logging.getLogger(__name__)
 
 
 class GameStatusCog(commands.Cog):
@@ -12,7 +16,7 @@ class GameStatusCog(commands.Cog):
         self.games = getattr(bot, 'amongus_games', {})
         
     async def cog_load(self):
-        print('GameStatusCog loaded')
+        log.info('GameStatusCog loaded')
         
     @app_commands.command(name='gamestatus', description='View overall game progress and stats')
     async def gamestatus(self, interaction: discord.Interaction):
@@ -152,7 +156,7 @@ class GameStatusCog(commands.Cog):
         players_data = [p.to_dict() for p in alive_players]
         card_buffer = await create_alive_players_card(players_data, game.game_code)
         
-        file = discord.File(card_buffer, filename="alive_players.png")
+        file = discord.File(card_buffer, filename=image_filename(card_buffer, "alive_players"))
         
         # Create embed
         embed = discord.Embed(
@@ -168,7 +172,7 @@ class GameStatusCog(commands.Cog):
             inline=True
         )
         
-        embed.set_image(url="attachment://alive_players.png")
+        embed.set_image(url=f"attachment://{file.filename}")
         
         await interaction.followup.send(embed=embed, file=file)
 
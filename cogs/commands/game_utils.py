@@ -1,5 +1,6 @@
 """Utility functions for game logic"""
 
+import logging
 import discord
 import asyncio
 import random
@@ -7,18 +8,16 @@ from collections import deque
 from typing import List, Optional
 from amongus.core import AmongUsGame
 from amongus.map_renderer import MapLayout
+from amongus.dm import dm_service
+from amongus.outbound import outbound
+from amongus.replay import replays
 
+log = logging.getLogger(__name__)
 
-async def safe_dm_user(user: discord.User | discord.Member, **kwargs):
-    for attempt in range(7):
-        try:
-            await user.send(**kwargs)
-            return
-        except discord.errors.HTTPException:
-            if attempt < 6:
-                await asyncio.sleep(3)
-            else:
-                pass
+
+async def safe_dm_user(user: discord.User | discord.Member, **kwargs) -> bool:
+    """DM a user through the shared delivery service; returns whether it arrived"""
+    return await dm_service.send(user, **kwargs)
 
 
 def find_shortest_path(map_layout: MapLayout, start: str, end: str) -> Optional[List[str]]:
@@ -50,7 +49,7 @@ def find_shortest_path(map_layout: MapLayout, start: str, end: str) -> Optional[
     return None
 
 
-def find_path_with_mistakes(map_layout: MapLayout, start: str, end: str) -> Optional[List[str]]:
+def find_path_with_mistakes(map_layout: MapLayout, start: str, end: str, rng: random.Random) -> Optional[List[str]]:
     """
     Find path from start to end with realistic human-like mistakes:
     - 10% chance of taking one wrong turn with backtrack
@@ -65,11 +64,11 @@ def find_path_with_mistakes(map_layout: MapLayout, start: str, end: str) -> Opti
         return optimal_path
     
     # 5-8% chance of major detour (chaotic wandering)
-    detour_chance = random.uniform(0.05, 0.08)
-    if random.random() < detour_chance:
+    detour_chance = rng.uniform(0.05, 0.08)
+    if rng.random() < detour_chance:
         # Take a random detour for 2-4 extra rooms
-        detour_length = random.randint(2, 4)
-        detour_index = random.randint(1, len(optimal_path) - 2)
+        detour_length = rng.randint(2, 4)
+        detour_index = rng.randint(1, len(optimal_path) - 2)
         detour_location = optimal_path[detour_index]
         
         # Build a wandering path
@@ -84,10 +83,10 @@ def find_path_with_mistakes(map_layout: MapLayout, start: str, end: str) -> Opti
             
             # Prefer unvisited neighbors but allow revisiting for chaos
             unvisited = [r for r in room.connected_rooms if r not in visited_in_detour]
-            if unvisited and random.random() < 0.7:
-                next_room = random.choice(unvisited)
+            if unvisited and rng.random() < 0.7:
+                next_room = rng.choice(unvisited)
             else:
-                next_room = random.choice(room.connected_rooms)
+                next_room = rng.choice(room.connected_rooms)
             
             wandering_path.append(next_room)
             visited_in_detour.add(next_room)
@@ -100,9 +99,9 @@ def find_path_with_mistakes(map_layout: MapLayout, start: str, end: str) -> Opti
             return wandering_path
     
     # 10% chance to make a simple wrong turn with backtrack
-    if random.random() < 0.10:
+    if rng.random() < 0.10:
         # Choose a random point in the path to make a mistake (not start or end)
-        mistake_index = random.randint(1, len(optimal_path) - 2)
+        mistake_index = rng.randint(1, len(optimal_path) - 2)
         mistake_location = optimal_path[mistake_index]
         
         # Get the room at the mistake point
@@ -117,19 +116,19 @@ def find_path_with_mistakes(map_layout: MapLayout, start: str, end: str) -> Opti
         
         if wrong_options:
             # Pick a random wrong room
-            wrong_room = random.choice(wrong_options)
+            wrong_room = rng.choice(wrong_options)
             
             # 30% chance to wander a bit more before backtracking
             path_with_mistake = optimal_path[:mistake_index + 1].copy()
             path_with_mistake.append(wrong_room)
             
-            if random.random() < 0.30:
+            if rng.random() < 0.30:
                 # Wander 1-2 more rooms before realizing mistake
                 current = wrong_room
-                for _ in range(random.randint(1, 2)):
+                for _ in range(rng.randint(1, 2)):
                     room = map_layout.get_room(current)
                     if room and room.connected_rooms:
-                        next_wander = random.choice([r for r in room.connected_rooms if r != mistake_location])
+                        next_wander = rng.choice([r for r in room.connected_rooms if r != mistake_location])
                         path_with_mistake.append(next_wander)
                         current = next_wander
             
@@ -141,8 +140,8 @@ def find_path_with_mistakes(map_layout: MapLayout, start: str, end: str) -> Opti
             return path_with_mistake
     
     # 5% chance of random U-turn in middle of hallway (go back 1 room then forward again)
-    if random.random() < 0.05 and len(optimal_path) >= 4:
-        uturn_index = random.randint(2, len(optimal_path) - 2)
+    if rng.random() < 0.05 and len(optimal_path) >= 4:
+        uturn_index = rng.randint(2, len(optimal_path) - 2)
         path_with_uturn = optimal_path[:uturn_index + 1].copy()
         path_with_uturn.append(optimal_path[uturn_index - 1])  # Go back
         path_with_uturn.append(optimal_path[uturn_index])      # Go forward again
@@ -158,30 +157,63 @@ async def start_game_loops(
     """Start all game loops - individual loops for each bot player"""
     from .game_loops import bot_crewmate_behavior, bot_impostor_behavior
     
-    task = asyncio.create_task(debug_body_logger(game, channel))
-    if hasattr(game, 'background_tasks'):
-        game.background_tasks.add(task)
-        task.add_done_callback(lambda t: game.background_tasks.discard(t) if hasattr(game, 'background_tasks') else None)
+    game.tasks.spawn(debug_body_logger(game, channel))
+    game.tasks.spawn(cooldown_ticker(game))
     
     for player in game.players.values():
         if player.is_bot:
             if player.role == "Impostor":
-                task = asyncio.create_task(bot_impostor_behavior(bot, game, channel, player))
+                game.tasks.spawn(bot_impostor_behavior(bot, game, channel, player))
             else:
-                task = asyncio.create_task(bot_crewmate_behavior(bot, game, channel, player))
-            
-            if hasattr(game, 'background_tasks'):
-                game.background_tasks.add(task)
-                task.add_done_callback(lambda t: game.background_tasks.discard(t) if hasattr(game, 'background_tasks') else None)
+                game.tasks.spawn(bot_crewmate_behavior(bot, game, channel, player))
+
+
+def release_channel(game: AmongUsGame, channel: discord.abc.Messageable, games: dict):
+    """Post an ended game's replay, if it was recorded, then drop the channel's outbound queue.
+
+    The replay can take a while; if a new game has taken the channel by then,
+    the queue is its now and is left for that game to release.
+    """
+    channel_id = game.channel_id
+    
+    def release():
+        if games.get(channel_id) is None:
+            outbound.forget(channel_id)
+    
+    if game.events is not None:
+        replays.submit(game.events.path, channel, release)
+    else:
+        release()
+
+
+async def cooldown_ticker(game: AmongUsGame):
+    """Count down kill, sabotage, shield and meeting cooldowns once a second during tasks"""
+    # Parks through meetings instead of waking every second
+    while await game.wait_for_phase("tasks") == "tasks":
+        await asyncio.sleep(1)
+        if game.phase != "tasks":
+            continue
+        
+        if game.meeting_cooldown > 0:
+            game.meeting_cooldown -= 1
+        
+        for player in game.players.values():
+            if player.role == "Impostor":
+                if player.kill_cooldown > 0:
+                    player.kill_cooldown -= 1
+                if player.sabotage_cooldown > 0:
+                    player.sabotage_cooldown -= 1
+            elif player.role == "Guardian Angel" and player.shield_cooldown > 0:
+                player.shield_cooldown -= 1
 
 
 async def debug_body_logger(game: AmongUsGame, channel: discord.TextChannel):
-    """Debug loop to print all bodies and their locations every 10 seconds"""
+    """Debug loop to log all bodies and their locations every 10 seconds"""
     try:
         while game.phase != "ended":
             await asyncio.sleep(10)
             
-            if game.phase != "tasks":
+            if game.phase != "tasks" or not log.isEnabledFor(logging.DEBUG):
                 continue
             
             body_info = []
@@ -191,14 +223,14 @@ async def debug_body_logger(game: AmongUsGame, channel: discord.TextChannel):
                         body_info.append(f"{body} in {room_name}")
             
             if body_info:
-                print(f"[DEBUG] Bodies: {', '.join(body_info)}")
+                log.debug("Bodies: %s", ', '.join(body_info))
             else:
-                print("[DEBUG] No bodies on the map")
+                log.debug("No bodies on the map")
                 
     except asyncio.CancelledError:
         pass
-    except Exception as e:
-        print(f"Error in debug body logger: {e}")
+    except Exception:
+        log.exception("Error in debug body logger")
 
 
 async def panic_to_sabotage(game, player, sabotage_type: str, is_impostor: bool = False):
@@ -235,13 +267,14 @@ async def panic_to_sabotage(game, player, sabotage_type: str, is_impostor: bool
                 return player.location
             
             player.location = next_room
-            await asyncio.sleep(random.uniform(2, 4))  # Move faster than normal (panic)
+            # Move faster than normal (panic), stopping as soon as the sabotage is fixed
+            await game.wait_for_sabotage_change(sabotage_type, timeout=game.rng_for(player).uniform(2, 4))
         
         # Return final location if we reached the sabotage location
         return player.location
             
-    except Exception as e:
-        print(f"Error in panic for {player.name}: {e}")
+    except Exception:
+        log.exception("Error in panic for %s", player.name)
         return None
 
 
@@ -260,7 +293,8 @@ async def rush_away_from_location(game, player, from_location: str):
             return
         
         # Pick a random destination to rush to
-        target_location = random.choice(possible_destinations)
+        rng = game.rng_for(player)
+        target_location = rng.choice(possible_destinations)
         
         # Find path away from sabotage location
         path = find_shortest_path(game.map_layout, from_location, target_location)
@@ -274,10 +308,10 @@ async def rush_away_from_location(game, player, from_location: str):
                 break
             
             player.location = next_room
-            await asyncio.sleep(random.uniform(1, 2))  # Super fast movement
+            await asyncio.sleep(rng.uniform(1, 2))  # Super fast movement
             
-    except Exception as e:
-        print(f"Error in rush away for {player.name}: {e}")
+    except Exception:
+        log.exception("Error in rush away for %s", player.name)
 
 
 async def cleanup_game(game, bot=None):
@@ -305,18 +339,18 @@ async def cleanup_game(game, bot=None):
 
             if channel_id in bot.amongus_games:
                 del bot.amongus_games[channel_id]
-                print(f'✅ Removed game from cache for channel {channel_id}')
+                log.info('Removed game from cache for channel %s', channel_id)
 
         if game_manager:
             await game_manager.delete_game(channel_id)
-            print(f'✅ Deleted game via game_manager for channel {channel_id}')
+            log.info('Deleted game via game_manager for channel %s', channel_id)
 
         elif hasattr(game, 'db') and game.db:
             await game.db.delete_game(channel_id)
-            print(f'✅ Deleted game from database for channel {channel_id}')
+            log.info('Deleted game from database for channel %s', channel_id)
             
-    except Exception as e:
-        print(f'⚠️  Error cleaning up game: {e}')
+    except Exception:
+        log.exception('Error cleaning up game')
 
 
 async def check_and_announce_winner(
@@ -353,7 +387,7 @@ async def check_and_announce_winner(
                 message += "Impostors have taken over the ship!"
             message += "\n\n🛑 Game has ended. Use `/create` to start a new lobby."
 
-        await channel.send(message)
+        await outbound.send(channel, message)
         
         channel_id = game.channel_id
         
@@ -361,14 +395,16 @@ async def check_and_announce_winner(
             game_manager = bot.game_manager
             try:
                 await game_manager.delete_game(channel_id)
-                print(f'✅ Deleted game from database for channel {channel_id}')
+                log.info('Deleted game from database for channel %s', channel_id)
             except Exception as e:
-                print(f'⚠️  Error deleting game from database: {e}')
+                log.warning('Error deleting game from database: %s', e)
         
         if bot and hasattr(bot, 'amongus_games'):
             if channel_id in bot.amongus_games:
                 del bot.amongus_games[channel_id]
-                print(f'✅ Removed game from cache for channel {channel_id}')
+                log.info('Removed game from cache for channel %s', channel_id)
+        
+        release_channel(game, channel, getattr(bot, 'amongus_games', {}))
         
         return True
 
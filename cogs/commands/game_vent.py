@@ -1,10 +1,14 @@
 """Vent system for impostors"""
+import logging
 import discord
 from discord import app_commands, ui
 from discord.ext import commands
-import random
 from typing import cast
+from amongus.attachments import send_embed_image
 from amongus.map_renderer import create_vent_map_image
+from amongus.singleflight import render_image_sync
+
+log = logging.getLogger(__name__)
 
 
 VENT_LOCATIONS = [
@@ -24,14 +28,8 @@ class VentView(ui.View):
         self.bot = bot
         self.player = player
         
-        # Get valid vent connections from the map layout's vent network
-        # Import here to avoid circular import
-        from amongus.map_renderer import VentMapRenderer
-        temp_renderer = VentMapRenderer(game.map_layout)
-        valid_destinations = temp_renderer.vent_connections.get(current_location, [])
-        
-        # Only show destinations that actually have vents
-        destinations = [dest for dest in valid_destinations if game.get_room(dest) and game.get_room(dest).can_vent]
+        # Only destinations on the map's vent network that actually have vents
+        destinations = game.map_layout.get_vent_destinations(current_location)
         
         for dest in destinations:
             button = ui.Button(label=f"➡️ {dest}", style=discord.ButtonStyle.secondary)
@@ -72,7 +70,7 @@ class VentView(ui.View):
             player.in_vent = False
             
             # Very low chance (5%) of visual indicator when exiting vent
-            if random.random() < 0.05 and isinstance(interaction.channel, discord.TextChannel):
+            if self.game.rng.random() < 0.05 and isinstance(interaction.channel, discord.TextChannel):
                 try:
                     await interaction.channel.send(
                         f"👀 Someone exited the vents in **{self.current_location}**..."
@@ -100,7 +98,7 @@ class VentView(ui.View):
         
         # Limit to 2-3 random targets (low range from vent)
         if len(alive_crewmates) > 3:
-            targets = random.sample(alive_crewmates, random.randint(2, 3))
+            targets = self.game.rng.sample(alive_crewmates, self.game.rng.randint(2, 3))
         else:
             targets = alive_crewmates
         
@@ -132,7 +130,7 @@ class VentCog(commands.Cog):
         self.games = getattr(bot, 'amongus_games', {})
         
     async def cog_load(self):
-        print('VentCog loaded')
+        log.info('VentCog loaded')
         
     @app_commands.command(name='vent', description='Enter a vent (Impostors and Engineers only)')
     async def vent(self, interaction: discord.Interaction):
@@ -180,7 +178,7 @@ class VentCog(commands.Cog):
         player.in_vent = True
         
         # Very low chance (5%) of visual indicator when entering vent
-        if random.random() < 0.05 and isinstance(interaction.channel, discord.TextChannel):
+        if game.rng.random() < 0.05 and isinstance(interaction.channel, discord.TextChannel):
             try:
                 await interaction.channel.send(
                     f"👀 Someone noticed movement near the vents in **{player.location}**..."
@@ -226,9 +224,11 @@ class VentCog(commands.Cog):
         if player.can_vent and current_room and current_room.can_vent:
             player_vent = player.location
         
-        vent_map_buffer = create_vent_map_image(
-            player_vent=player_vent,
-            map_layout=game.map_layout
+        vent_map_buffer = await render_image_sync(
+            ("vent_map", player_vent),
+            create_vent_map_image,
+            player_vent,
+            game.map_layout.snapshot()
         )
         
         # Create embed with vent information
@@ -289,10 +289,7 @@ class VentCog(commands.Cog):
                 inline=False
             )
         
-        file = discord.File(vent_map_buffer, filename="vent_map.png")
-        embed.set_image(url="attachment://vent_map.png")
-        
-        await interaction.followup.send(file=file, embed=embed, ephemeral=True)
+        await send_embed_image(interaction.followup.send, embed, vent_map_buffer, "vent_map", ephemeral=True)
 
 
 async def setup(bot: commands.Bot):
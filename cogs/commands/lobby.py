@@ -1,5 +1,6 @@
 """Lobby management commands"""
 
+import logging
 import discord
 from discord import app_commands
 from discord.ext import commands
@@ -8,8 +9,11 @@ from amongus.card_generator import (
     create_lobby_card,
     create_role_reveal_card
 )
+from amongus.encoding import image_filename
 from typing import Optional, cast
 
+log = logging.getLogger(__name__)
+
 
 class LobbyCog(commands.Cog):
     """Commands for creating and managing lobbies"""
@@ -38,7 +42,7 @@ class LobbyCog(commands.Cog):
             # Update cache reference
             setattr(self.bot, 'amongus_games', self.game_manager._cache)
             
-        print("LobbyCog loaded")
+        log.info("LobbyCog loaded")
 
     @app_commands.command(
         name="create", description="Create an Among Us lobby in this channel"
@@ -92,12 +96,8 @@ class LobbyCog(commands.Cog):
             )
             return
 
-        import string
-        import random
-        game_code = ''.join(random.choices(string.ascii_uppercase, k=6))
-        
         game = await self.game_manager.create_game(
-            interaction.guild.id, ch_id, game_code, max_players, impostors, scientists, engineers, guardian_angels
+            interaction.guild.id, ch_id, None, max_players, impostors, scientists, engineers, guardian_angels
         )
 
         crewmate_count = max_players - total_special_roles
@@ -148,7 +148,6 @@ class LobbyCog(commands.Cog):
             return
 
         try:
-            import random
             avatar_url = interaction.user.display_avatar.url
             await game.add_player(uid, interaction.user.display_name, avatar_url)
 
@@ -185,10 +184,10 @@ class LobbyCog(commands.Cog):
             if not available_roles:
                 available_roles = ['Crewmate']
             
-            assigned_role = random.choice(available_roles)
+            assigned_role = game.rng.choice(available_roles)
 
             player.assign_role(assigned_role)
-            player.assign_tasks()
+            player.assign_tasks(rng=game.rng)
 
             if assigned_role == 'Impostor':
                 if uid not in game.impostors:
@@ -269,8 +268,8 @@ class LobbyCog(commands.Cog):
                 avatar_url=avatar_url
             )
             
-            role_card_file = discord.File(role_card_buffer, filename="role_card.png")
-            private_embed.set_image(url="attachment://role_card.png")
+            role_card_file = discord.File(role_card_buffer, filename=image_filename(role_card_buffer, "role_card"))
+            private_embed.set_image(url=f"attachment://{role_card_file.filename}")
 
             await interaction.followup.send(
                 embed=private_embed,
@@ -356,7 +355,7 @@ class LobbyCog(commands.Cog):
         players_data = [p.to_dict() for p in game.players.values()]
         card_buffer = await create_lobby_card(players_data, game.game_code)
 
-        file = discord.File(card_buffer, filename="lobby.png")
+        file = discord.File(card_buffer, filename=image_filename(card_buffer, "lobby"))
 
         # Create embed
         embed = discord.Embed(
@@ -367,7 +366,7 @@ class LobbyCog(commands.Cog):
         embed.add_field(
             name="Players", value=f"{len(game.players)}/{game.max_players}", inline=True
         )
-        embed.set_image(url="attachment://lobby.png")
+        embed.set_image(url=f"attachment://{file.filename}")
 
         await interaction.followup.send(embed=embed, file=file)
 
@@ -1,13 +1,16 @@
 """Task-related commands for crewmates"""
 
+import logging
 import discord
 from discord import app_commands
 from discord.ext import commands
+from amongus.outbound import outbound
 from amongus.tasks import get_task_view
 from .game_utils import check_and_announce_winner
 from typing import Optional
 import asyncio
-import random
+
+log = logging.getLogger(__name__)
 
 
 class TasksCog(commands.Cog):
@@ -18,7 +21,7 @@ class TasksCog(commands.Cog):
         self.games = getattr(bot, "amongus_games", {})  # Shared games dict
 
     async def cog_load(self):
-        print("TasksCog loaded")
+        log.info("TasksCog loaded")
 
     @app_commands.command(name="tasks", description="View your task list")
     async def view_tasks(self, interaction: discord.Interaction):
@@ -240,7 +243,7 @@ class TasksCog(commands.Cog):
                 return
             
             # Randomly select one of the available tasks
-            task_index = random.choice(available_tasks_indices)
+            task_index = game.rng.choice(available_tasks_indices)
             task_number = task_index + 1
             
             # Add a message indicating auto-selection
@@ -280,13 +283,15 @@ class TasksCog(commands.Cog):
                 interaction.channel, discord.TextChannel
             ):
                 if player.role == "Impostor":
-                    await interaction.channel.send(
+                    outbound.post(
+                        interaction.channel,
                         f"✅ **{player.name}** completed: {task.task_info['emoji']} {task.task_info['name']}! "
                         f"({player.task_progress})"
                     )
                 else:
                     ghost_prefix = "👻 " if not player.alive else ""
-                    await interaction.channel.send(
+                    outbound.post(
+                        interaction.channel,
                         f"✅ {ghost_prefix}**{player.name}** completed: {task.task_info['emoji']} {task.task_info['name']}! "
                         f"({player.task_progress})"
                     )
@@ -1,13 +1,16 @@
+import logging
 import discord
 from discord.ext import commands
 
+log = logging.getLogger(__name__)
+
 
 class ListenerCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
     async def cog_load(self):
-        print("ListenerCog loaded")
+        log.info("ListenerCog loaded")
 
     @commands.Cog.listener()
     async def on_member_remove(self, member: discord.Member):
@@ -1,13 +1,21 @@
+import logging
 import os
 import discord
 import asyncio
 from discord.ext import commands
 from dotenv import load_dotenv
 from typing import Optional
+from amongus.commandstats import InstrumentedCommandTree, command_stats
 from amongus.database import GameDatabase
+from amongus.eventlog import event_logs
 from amongus.game_manager import GameManager
+from amongus.logs import setup_logging
+from amongus.loopmonitor import loop_monitor
 
 load_dotenv()
+setup_logging()
+log = logging.getLogger('main')
+
 TOKEN = os.getenv('DC3')
 APPLICATION_ID = os.getenv('AP3')
 DEV_GUILD_ID = os.getenv('DEV_GUILD_ID')
@@ -44,117 +52,128 @@ class MyBot(commands.Bot):
         self.amongus_games = {}
 
     async def setup_hook(self) -> None:
-        print('🔄 Starting setup...')
+        log.info('Starting setup...')
+        loop_monitor.start()
+        command_stats.start_export()
+        event_logs.start()
         
-        print('🗄️  Initializing database...')
+        log.info('Initializing database...')
         self.db = GameDatabase("amongus.db")
         await self.db.initialize()
         
         self.game_manager = GameManager(self.db)
         self.amongus_games = self.game_manager._cache
         
-        print('✅ Database and game manager ready!')
+        log.info('Database and game manager ready')
         
-        print('🧹 Clearing all existing commands...')
+        log.info('Clearing all existing commands...')
         try:
             self.tree.clear_commands(guild=None)
             await self.tree.sync()
-            print('✅ Cleared global commands')
+            log.info('Cleared global commands')
             
             if DEV_GUILD_IDS:
                 for guild_id in DEV_GUILD_IDS:
                     guild = discord.Object(id=int(guild_id))
                     self.tree.clear_commands(guild=guild)
                     await self.tree.sync(guild=guild)
-                    print(f'✅ Cleared guild commands for {guild_id}')
+                    log.info('Cleared guild commands for %s', guild_id)
         except Exception as e:
-            print(f'⚠️  Error clearing commands: {e}')
+            log.warning('Error clearing commands: %s', e)
 
-        print('\n📦 Loading cogs...')
+        log.info('Loading cogs...')
         for cog in COG_PATHS:
             try:
                 await self.load_extension(cog)
-                print(f'✅ Loaded {cog}')
+                log.info('Loaded %s', cog)
             except Exception as e:
-                print(f'❌ Failed to load {cog}: {e}')
+                log.error('Failed to load %s: %s', cog, e)
 
-        print(f'\n📋 Commands in tree: {len(self.tree.get_commands())}')
-        for cmd in self.tree.get_commands():
-            print(f'  - {cmd.name}')
+        tree_commands = self.tree.get_commands()
+        log.info('Commands in tree (%d): %s', len(tree_commands), ', '.join(cmd.name for cmd in tree_commands))
 
         if DEV_GUILD_IDS:
-            print(f'\n🏢 DEV MODE: Syncing commands to {len(DEV_GUILD_IDS)} guild(s)...')
+            log.info('DEV MODE: Syncing commands to %d guild(s)...', len(DEV_GUILD_IDS))
             for guild_id in DEV_GUILD_IDS:
                 try:
                     guild = discord.Object(id=int(guild_id))
                     self.tree.clear_commands(guild=guild)
                     self.tree.copy_global_to(guild=guild)
                     synced_guild = await self.tree.sync(guild=guild)
-                    print(f'✅ Synced {len(synced_guild)} commands to guild {guild_id} (instant)')
+                    log.info('Synced %d commands to guild %s (instant)', len(synced_guild), guild_id)
                     
                     if len(synced_guild) == 0:
-                        print(f'⚠️  WARNING: Synced 0 commands to guild {guild_id}!')
-                        print('   This usually means the bot lacks "applications.commands" scope.')
-                        print(f'   Re-invite your bot using this URL:')
-                        print(f'   https://discord.com/api/oauth2/authorize?client_id={self.application_id}&permissions=8&scope=bot%20applications.commands')
+                        log.warning(
+                            'Synced 0 commands to guild %s! This usually means the bot lacks "applications.commands" scope. '
+                            'Re-invite your bot using this URL: '
+                            'https://discord.com/api/oauth2/authorize?client_id=%s&permissions=8&scope=bot%%20applications.commands',
+                            guild_id, self.application_id
+                        )
                     else:
-                        print(f'✅ Guild sync successful for {guild_id}!')
-                        for cmd in synced_guild:
-                            print(f'  - /{cmd.name}')
+                        log.info('Guild sync successful for %s: %s', guild_id, ', '.join(f'/{cmd.name}' for cmd in synced_guild))
                 except Exception as e:
-                    print(f'❌ Failed to sync to guild {guild_id}: {e}')
-                    import traceback
-                    traceback.print_exc()
+                    log.exception('Failed to sync to guild %s', guild_id)
         else:
-            print('\n🌍 PRODUCTION MODE: Syncing commands globally...')
+            log.info('PRODUCTION MODE: Syncing commands globally...')
             try:
                 synced = await self.tree.sync()
-                print(f'✅ Synced {len(synced)} commands globally (may take up to 1 hour to appear)')
-                for cmd in synced:
-                    print(f'  - /{cmd.name}')
+                log.info(
+                    'Synced %d commands globally (may take up to 1 hour to appear): %s',
+                    len(synced), ', '.join(f'/{cmd.name}' for cmd in synced)
+                )
             except Exception as e:
-                print(f'❌ Failed to sync globally: {e}')
-                import traceback
-                traceback.print_exc()
+                log.exception('Failed to sync globally')
                 return
         
-        print('\n🎉 Setup complete!')
+        log.info('Setup complete')
         if DEV_GUILD_IDS:
-            print(f'📝 Note: Commands synced to {len(DEV_GUILD_IDS)} dev guild(s) ONLY (not global)')
+            log.info('Note: Commands synced to %d dev guild(s) ONLY (not global)', len(DEV_GUILD_IDS))
+
+    def dispatch(self, event_name: str, /, *args, **kwargs) -> None:
+        # Record command timing now rather than from a listener task, which would run a loop turn later
+        if event_name == 'app_command_completion' and isinstance(self.tree, InstrumentedCommandTree):
+            self.tree.command_completed(*args)
+        super().dispatch(event_name, *args, **kwargs)
+
+    async def close(self) -> None:
+        await event_logs.flush()
+        await super().close()
 
 application_id = None
 if APPLICATION_ID:
     try:
         application_id = int(APPLICATION_ID)
     except Exception:
-        print('Invalid APPLICATION_ID in env; ignoring')
+        log.warning('Invalid APPLICATION_ID in env; ignoring')
 
-bot = MyBot(command_prefix='/', intents=intents, application_id=application_id)
+bot = MyBot(command_prefix='/', intents=intents, application_id=application_id, tree_cls=InstrumentedCommandTree)
 
 @bot.event
 async def on_ready():
     if bot.user:
-        print(f'Logged in as {bot.user} (ID: {bot.user.id})')
+        log.info('Logged in as %s (ID: %s)', bot.user, bot.user.id)
     else:
-        print('Logged in, but bot.user is None')
-    print('------')
+        log.warning('Logged in, but bot.user is None')
 
 async def shutdown():
-    print('\n🛑 Shutting down...')
+    log.info('Shutting down...')
     if bot.db:
         await bot.db.close()
-    print('✅ Cleanup complete')
+    log.info('Cleanup complete')
 
 if __name__ == '__main__':
     if TOKEN is None:
         raise ValueError('DISCORD_TOKEN environment variable not set')
     try:
-        bot.run(TOKEN)
+        # Logging is already routed through our queue handler
+        bot.run(TOKEN, log_handler=None)
     except KeyboardInterrupt:
         import asyncio
         asyncio.run(shutdown())
     except discord.errors.PrivilegedIntentsRequired:
-        print('\nPrivileged intents required but not enabled for this application.')
-        print('Go to https://discord.com/developers/applications, open your application,')
-        print('navigate to "Bot" and enable the "Server Members Intent" and/or "Presence Intent" as needed.')
+        log.error(
+            'Privileged intents required but not enabled for this application. '
+            'Go to https://discord.com/developers/applications, open your application, '
+            'navigate to "Bot" and enable the "Server Members Intent" and/or "Presence Intent" as needed.'
+        )
         raise
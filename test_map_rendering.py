@@ -1,4 +1,10 @@
-from amongus.map_renderer import MapLayout, MapRenderer, create_map_image
+import asyncio
+import os
+import tempfile
+
+from amongus.core import AmongUsGame
+from amongus.eventlog import EventKind, GameEventLog, game_state, read_events, restore
+from amongus.map_renderer import MapLayout, MapRenderer, create_map_image, create_map_images
 
 def test_basic_map():
     print("Testing basic map rendering...")
@@ -114,6 +120,117 @@ def test_room_metadata():
             print(f"    Task count: {len(room.task_list)}")
             print(f"    Connected rooms: {len(room.connected_rooms)}")
 
+def test_room_neighborhoods():
+    print("\nTesting precomputed room neighborhoods...")
+    layout = MapLayout()
+    
+    for room_name, room in layout.rooms.items():
+        one_hop = {room_name, *room.connected_rooms}
+        two_hop = set(one_hop)
+        for neighbor in room.connected_rooms:
+            neighbor_room = layout.get_room(neighbor)
+            if neighbor_room:
+                two_hop.update(neighbor_room.connected_rooms)
+        
+        assert layout.get_neighborhood(room_name, 0) == {room_name}
+        assert layout.get_neighborhood(room_name, 1) == one_hop
+        assert layout.get_neighborhood(room_name, 2) == two_hop
+    
+    assert layout.get_neighborhood("Nowhere") == frozenset()
+    print(f"  Electrical 2-hop: {', '.join(sorted(layout.get_neighborhood('Electrical')))}")
+
+def test_batch_map_rendering():
+    print("\nTesting batch map rendering...")
+    layout = MapLayout()
+    player_rooms = ["Admin", "Electrical", "Admin", None, "Electrical"]
+    
+    batch = create_map_images(player_rooms, sabotaged_rooms=["Reactor"], map_layout=layout)
+    
+    assert list(batch) == ["Admin", "Electrical", None]
+    for room, buffer in batch.items():
+        single = create_map_image(player_room=room, sabotaged_rooms=["Reactor"], map_layout=layout)
+        assert buffer.getvalue() == single.getvalue()
+    print(f"✓ Rendered {len(player_rooms)} players as {len(batch)} distinct maps")
+
+def _record_to(game, path):
+    events = GameEventLog(path)
+    events.snapshot(game)
+    game.events = events
+    for player in game.players.values():
+        player.events = events
+    return events
+
+def _flush_to(events, path):
+    with open(path, "ab") as f:
+        f.write(events.take())
+
+async def _play_two_meetings(path):
+    game = AmongUsGame(1, 42, max_players=6, seed=7)
+    game.game_code = "TESTAA"
+    for user_id in range(1, 4):
+        await game.add_player(user_id, f"P{user_id}")
+    await game.assign_roles(1)
+    game.phase = "tasks"
+    events = _record_to(game, path)
+    
+    players = list(game.players.values())
+    impostor = next(p for p in players if p.role == "Impostor")
+    crew = [p for p in players if p is not impostor]
+    for room in ["Admin", "Storage", "Electrical"]:
+        for player in players:
+            player.location = room
+    crew[0].complete_task(0)
+    game.kill_player(impostor, crew[1])
+    
+    # First meeting: everyone left votes, but nobody is ejected
+    game.phase = "meeting"
+    await game.clear_votes()
+    await game.cast_vote(impostor.user_id, crew[0].user_id)
+    await game.cast_vote(crew[0].user_id, impostor.user_id)
+    game.phase = "tasks"
+    
+    # Second meeting has only just started, so no votes are in yet
+    game.phase = "meeting"
+    await game.clear_votes()
+    _flush_to(events, path)
+    return game, events
+
+def test_event_log_round_trip():
+    print("\nTesting event log round trip...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "42-TESTAA.evlog")
+        game, events = asyncio.run(_play_two_meetings(path))
+        
+        kinds = [event.kind for event in read_events(path)]
+        assert kinds[0] is EventKind.SNAPSHOT
+        assert {EventKind.MOVE, EventKind.KILL, EventKind.TASK, EventKind.VOTE, EventKind.CLEAR_VOTES} <= set(kinds)
+        
+        expected = game_state(game)
+        restored = restore(path)
+        for key in ("phase", "sabotage", "players", "bodies"):
+            assert restored[key] == expected[key]
+        assert game.votes == {}
+        assert restored["votes"] == {}, "votes from the previous meeting came back"
+    print(f"✓ {len(kinds)} records restore to the live state")
+
+def test_event_log_torn_segment():
+    print("\nTesting event log recovery past a torn write...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "42-TESTAA.evlog")
+        game, events = asyncio.run(_play_two_meetings(path))
+        
+        # A move cut off mid-record by a crash, then the game reloaded into a new segment
+        with open(path, "ab") as f:
+            f.write(bytes([EventKind.MOVE, 0xFF]))
+        events = _record_to(game, path)
+        next(iter(game.players.values())).location = "Cafeteria"
+        _flush_to(events, path)
+        
+        last = list(read_events(path))[-1]
+        assert last.kind is EventKind.MOVE and last.fields["room"] == "Cafeteria"
+        assert restore(path)["players"] == game_state(game)["players"]
+    print("✓ Damaged segment skipped, later segment restored")
+
 if __name__ == "__main__":
     print("=" * 60)
     print("Among Us Map Renderer Test Suite")
@@ -126,6 +243,10 @@ if __name__ == "__main__":
     test_full_scenario()
     test_room_connections()
     test_room_metadata()
+    test_room_neighborhoods()
+    test_batch_map_rendering()
+    test_event_log_round_trip()
+    test_event_log_torn_segment()
     
     print("\n" + "=" * 60)
     print("All tests completed!")